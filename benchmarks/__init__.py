@@ -0,0 +1 @@
+"""Micro-benchmarks et scénarios de charge des deux services (voir README, section Benchmarks)."""
@@ -0,0 +1,191 @@
+"""Outils partagés : chargement des services, mesures, rapport et baselines."""
+
+import importlib
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# Tolérance par défaut avant de signaler une régression (p95 plus lent ou débit plus faible)
+DEFAULT_TOLERANCE = 0.25
+
+
+def _is_service_module(name: str) -> bool:
+    return name in ("app", "main") or name.startswith("app.")
+
+
+def load_service(directory: str) -> Dict[str, object]:
+    """Importe `main` et le paquet `app` d'un service, sans occuper ces noms dans sys.modules.
+
+    Les deux services nomment leur paquet `app` : chaque service est importé isolément et
+    ses modules sont retournés par nom (ex. modules["app.services.loan_service"]).
+    """
+    shadowed = {name: module for name, module in sys.modules.items() if _is_service_module(name)}
+    for name in shadowed:
+        del sys.modules[name]
+    path = os.path.join(ROOT, directory)
+    sys.path.insert(0, path)
+    try:
+        importlib.import_module("main")
+        modules = {name: module for name, module in sys.modules.items() if _is_service_module(name)}
+    finally:
+        sys.path.remove(path)
+        for name in [name for name in sys.modules if _is_service_module(name)]:
+            del sys.modules[name]
+        sys.modules.update(shadowed)
+    return modules
+
+
+def isolated_database() -> str:
+    """Base SQLite jetable pour le simulateur ; à appeler avant load_service("loan-simulator")"""
+    directory = tempfile.mkdtemp(prefix="loan-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+    return directory
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Percentile au rang le plus proche d'une liste déjà triée"""
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> dict:
+    """Débit (opérations/s) et percentiles de latence (ms) d'une série de mesures en secondes"""
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "throughput": round(len(ordered) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 4)
+    }
+
+
+def best_of(rounds: List[dict]) -> dict:
+    """Meilleur passage (débit le plus élevé) : écarte le bruit de la machine, comme timeit"""
+    return max(rounds, key=lambda result: result["throughput"])
+
+
+def _format_latency(ms: float) -> str:
+    return f"{ms * 1000:.1f} µs" if ms < 1 else f"{ms:.2f} ms"
+
+
+def report(results: Dict[str, dict], baseline: Optional[dict] = None) -> None:
+    header = f"{'benchmark':<34} {'ops/s':>12} {'p50':>11} {'p95':>11} {'p99':>11} {'errors':>7}"
+    if baseline:
+        header += f" {'Δ p95':>8} {'Δ ops/s':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        line = (
+            f"{name:<34} {result['throughput']:>12,.1f} {_format_latency(result['p50_ms']):>11} "
+            f"{_format_latency(result['p95_ms']):>11} {_format_latency(result['p99_ms']):>11} {result['errors']:>7}"
+        )
+        reference = (baseline or {}).get("results", {}).get(name)
+        if reference:
+            line += f" {_delta(result['p95_ms'], reference['p95_ms']):>8} {_delta(result['throughput'], reference['throughput']):>8}"
+        print(line)
+
+
+def _delta(value: float, reference: float) -> str:
+    if not reference:
+        return "n/a"
+    return f"{(value - reference) / reference:+.0%}"
+
+
+def baseline_path(suite: str) -> str:
+    return os.path.join(BASELINES_DIR, f"{suite}.json")
+
+
+def load_baseline(suite: str) -> Optional[dict]:
+    try:
+        with open(baseline_path(suite), encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(suite: str, results: Dict[str, dict], settings: dict) -> str:
+    os.makedirs(BASELINES_DIR, exist_ok=True)
+    path = baseline_path(suite)
+    document = {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count()
+        },
+        "settings": settings,
+        "results": results
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2, ensure_ascii=False)
+        file.write("\n")
+    return path
+
+
+def regressions(results: Dict[str, dict], baseline: dict, tolerance: float) -> List[str]:
+    """Benchmarks dont le p95 ou le débit s'est dégradé au-delà de la tolérance"""
+    found = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        if result["errors"] > reference.get("errors", 0):
+            found.append(f"{name}: {result['errors']} erreur(s) (baseline : {reference.get('errors', 0)})")
+        if reference["p95_ms"] and result["p95_ms"] > reference["p95_ms"] * (1 + tolerance):
+            found.append(f"{name}: p95 {_format_latency(result['p95_ms'])} "
+                         f"(baseline : {_format_latency(reference['p95_ms'])})")
+        if reference["throughput"] and result["throughput"] < reference["throughput"] * (1 - tolerance):
+            found.append(f"{name}: {result['throughput']:,.1f} ops/s (baseline : {reference['throughput']:,.1f})")
+    return found
+
+
+def finish(suite: str, results: Dict[str, dict], settings: dict, save: bool, compare: bool, tolerance: float) -> int:
+    """Affiche le rapport, enregistre ou compare la baseline ; retourne le code de sortie"""
+    baseline = load_baseline(suite)
+    report(results, baseline if compare else None)
+    if save:
+        print(f"\nBaseline enregistrée : {os.path.relpath(save_baseline(suite, results, settings), ROOT)}")
+        return 0
+    if compare:
+        if baseline is None:
+            print(f"\nAucune baseline pour '{suite}' : lancer d'abord avec --save-baseline")
+            return 1
+        found = regressions(results, baseline, tolerance)
+        if found:
+            print(f"\nRégressions (tolérance {tolerance:.0%}) :")
+            for line in found:
+                print(f"  - {line}")
+            return 1
+        print(f"\nAucune régression par rapport à la baseline (tolérance {tolerance:.0%})")
+    return 0
+
+
+def add_baseline_arguments(parser) -> None:
+    parser.add_argument("--rounds", type=int, default=3, help="Passages par benchmark ; le meilleur est retenu")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistre les résultats comme nouvelle baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare à la baseline et échoue en cas de régression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Dégradation tolérée avant de signaler une régression (0.25 = 25 %%)")
+
+
+def only(names: Iterable[str], selected: Optional[List[str]]) -> List[str]:
+    names = list(names)
+    if not selected:
+        return names
+    unknown = sorted(set(selected) - set(names))
+    if unknown:
+        raise SystemExit(f"Benchmark(s) inconnu(s) : {', '.join(unknown)} (disponibles : {', '.join(names)})")
+    return [name for name in names if name in selected]
@@ -0,0 +1,100 @@
+"""Stand-in de l'API Interest Rate : réponses fixes et latence configurable, sans moteur de taux.
+
+Isole le simulateur de prêt de la performance réelle de l'API de taux. Utilisable en
+processus (load.py --rate-api fake) ou comme serveur :
+
+    python -m benchmarks.fake_rate_api --port 8081 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+
+from fastapi import FastAPI, Request, Response
+
+AGE_CATEGORIES = [
+    {"code": "YOUNG_ADULT", "name": "YOUNG_ADULT", "description": "Jeune adulte", "age_range": "18-30 ans", "rate_modifier": 0.2},
+    {"code": "ADULT", "name": "ADULT", "description": "Adulte", "age_range": "31-45 ans", "rate_modifier": 0.0},
+    {"code": "MIDDLE_AGED", "name": "MIDDLE_AGED", "description": "Âge moyen", "age_range": "46-60 ans", "rate_modifier": -0.1},
+    {"code": "SENIOR", "name": "SENIOR", "description": "Senior", "age_range": "61+ ans", "rate_modifier": 0.3}
+]
+PROFESSIONAL_CATEGORIES = [
+    {"code": "EMPLOYEE", "name": "Salarié CDI", "description": "Employé en contrat à durée indéterminée", "rate_modifier": 0.0},
+    {"code": "EXECUTIVE", "name": "Cadre", "description": "Cadre dirigeant ou ingénieur", "rate_modifier": -0.2},
+    {"code": "CIVIL_SERVANT", "name": "Fonctionnaire", "description": "Agent de la fonction publique", "rate_modifier": -0.3},
+    {"code": "FREELANCER", "name": "Indépendant", "description": "Travailleur indépendant ou freelance", "rate_modifier": 0.4},
+    {"code": "RETIRED", "name": "Retraité", "description": "Personne à la retraite", "rate_modifier": 0.1},
+    {"code": "STUDENT", "name": "Étudiant", "description": "Étudiant ou apprenti", "rate_modifier": 0.5},
+    {"code": "UNEMPLOYED", "name": "Sans emploi", "description": "Personne sans activité professionnelle", "rate_modifier": 0.8}
+]
+CONFIG = {
+    "version": "benchmark-stand-in",
+    "base_rate": 1.5,
+    "income_bands": [{"below": 2000.0, "rate_modifier": 0.3}, {"below": 4000.0, "rate_modifier": 0.0},
+                     {"below": 8000.0, "rate_modifier": -0.1}, {"rate_modifier": -0.2}],
+    "modifiers": []
+}
+ETAG = '"benchmark-stand-in"'
+
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0) -> FastAPI:
+    """Application de substitution ; chaque réponse attend latency_ms (± jitter_ms)"""
+    app = FastAPI(title="Interest Rate API (stand-in)")
+
+    async def wait() -> None:
+        delay = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    @app.post("/api/interest-rate/calculate")
+    async def calculate(payload: dict):
+        await wait()
+        return {
+            "annual_interest_rate": 1.5,
+            "age_category": payload.get("age_category"),
+            "professional_category": payload.get("professional_category"),
+            "monthly_net_income": payload.get("monthly_net_income"),
+            "base_rate": 1.5,
+            "age_modifier": 0.0,
+            "professional_modifier": 0.0,
+            "income_modifier": 0.0,
+            "additional_modifier": 0.0
+        }
+
+    def categories(request: Request, content: list):
+        if request.headers.get("if-none-match") == ETAG:
+            return Response(status_code=304, headers={"ETag": ETAG})
+        return Response(content=_json(content), media_type="application/json", headers={"ETag": ETAG})
+
+    @app.get("/api/interest-rate/categories/age")
+    async def age_categories(request: Request):
+        await wait()
+        return categories(request, AGE_CATEGORIES)
+
+    @app.get("/api/interest-rate/categories/professional")
+    async def professional_categories(request: Request):
+        await wait()
+        return categories(request, PROFESSIONAL_CATEGORIES)
+
+    @app.get("/api/interest-rate/config")
+    async def config():
+        await wait()
+        return CONFIG
+
+    return app
+
+
+def _json(content) -> bytes:
+    return json.dumps(content, ensure_ascii=False).encode("utf-8")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stand-in de l'API Interest Rate pour les tests de charge")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms, args.jitter_ms), host="0.0.0.0", port=args.port, log_level="warning")
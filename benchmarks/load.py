@@ -0,0 +1,191 @@
+"""Scénarios de charge de bout en bout sur l'API du simulateur de prêt.
+
+Par défaut, le simulateur tourne dans ce processus (ASGI, sans réseau) avec le stand-in de
+l'API Interest Rate (benchmarks/fake_rate_api.py) : les mesures ne dépendent que du simulateur.
+
+    python -m benchmarks.load                              # simulateur + stand-in, en processus
+    python -m benchmarks.load --rate-api real              # vraie API Interest Rate, en processus
+    python -m benchmarks.load --rate-api embedded          # moteur de taux embarqué
+    python -m benchmarks.load --rate-url http://host:8081  # API Interest Rate déployée
+    python -m benchmarks.load --loan-url http://host:8080  # simulateur déployé (aucun chargement local)
+    python -m benchmarks.load --compare                    # échoue si régression par rapport à la baseline
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from contextlib import AsyncExitStack
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks import fake_rate_api
+from benchmarks.common import (
+    ROOT, add_baseline_arguments, best_of, finish, isolated_database, load_service, only, summarize
+)
+from benchmarks.micro import client_profile
+
+# (méthode, chemin, arguments httpx) d'une requête, construite à partir de son numéro
+RequestFactory = Callable[[int], Tuple[str, str, dict]]
+
+
+def scenarios(rng: random.Random) -> Dict[str, RequestFactory]:
+    def loan_request(employee: bool) -> dict:
+        request = {"amount": rng.randrange(50000, 500000, 1000), "durationYears": rng.randint(5, 30)}
+        if employee:
+            profile = client_profile(rng)
+            request.update({
+                "firstName": profile["first_name"], "lastName": profile["last_name"],
+                "ageCategory": profile["age_category"], "professionalCategory": profile["professional_category"],
+                "monthlyNetIncome": profile["monthly_net_income"]
+            })
+        else:
+            request["annualInterestRate"] = round(rng.uniform(0.5, 4.5), 2)
+        return request
+
+    def simulation() -> dict:
+        request = loan_request(employee=True)
+        request["annualInterestRate"] = 1.8
+        return {
+            "loanRequest": request,
+            "loanResponse": {"loanAmount": request["amount"], "monthlyPayment": 992.9, "totalInterest": 38296.0,
+                             "totalCost": request["amount"] + 38296.0, "annualInterestRate": 1.8}
+        }
+
+    category_paths = ["/api/age-categories", "/api/professional-categories"]
+    return {
+        "calculate-loan[client]": lambda i: ("POST", "/api/calculate-loan", {"json": loan_request(employee=False)}),
+        "calculate-loan[employee]": lambda i: ("POST", "/api/calculate-loan", {"json": loan_request(employee=True)}),
+        "save-simulation": lambda i: ("POST", "/api/save-simulation", {"json": simulation()}),
+        "simulation-history": lambda i: ("GET", "/api/simulation-history", {"params": {"limit": 50}}),
+        "categories": lambda i: ("GET", category_paths[i % 2], {})
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request: RequestFactory, total: int, concurrency: int) -> dict:
+    # Préchauffage non mesuré (connexions, caches, compilation des requêtes SQL)
+    for i in range(min(total, concurrency * 2)):
+        method, url, kwargs = make_request(i)
+        await client.request(method, url, **kwargs)
+
+    latencies: List[float] = []
+    errors = 0
+    next_index = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in next_index:
+            method, url, kwargs = make_request(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+            # En processus, une requête servie sans attente d'E/S ne rend pas la main à la boucle :
+            # on la rend explicitement pour que les clients simulés avancent chacun à leur tour
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+async def seed_history(client: httpx.AsyncClient, rows: int, make_simulation: RequestFactory) -> None:
+    for start in range(0, rows, 500):
+        batch = [make_simulation(i)[2]["json"] for i in range(start, min(rows, start + 500))]
+        response = await client.post("/api/save-simulations", json=batch)
+        response.raise_for_status()
+
+
+def asgi_rate_transport(loan, app):
+    """Transport HTTP du simulateur dont les requêtes sont servies en processus par `app`"""
+    http_transport = loan["app.services.rate_transport"].HttpRateTransport
+
+    class AsgiRateTransport(http_transport):
+        def _create_client(self) -> httpx.AsyncClient:
+            return httpx.AsyncClient(base_url=self.base_url, transport=httpx.ASGITransport(app=app), timeout=self.timeout)
+
+    config = loan["app.config"].settings.interest_rate_client
+    return AsgiRateTransport(config, "http://interest-rate-api")
+
+
+async def open_loan_client(stack: AsyncExitStack, args) -> httpx.AsyncClient:
+    if args.loan_url:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        return await stack.enter_async_context(httpx.AsyncClient(base_url=args.loan_url, limits=limits, timeout=30))
+
+    isolated_database()
+    if args.rate_url:
+        os.environ["INTEREST_RATE_API_URL"] = args.rate_url
+    if args.rate_api == "embedded":
+        os.environ["INTEREST_RATE_TRANSPORT"] = "embedded"
+    loan = load_service("loan-simulator")
+
+    if not args.rate_url and args.rate_api in ("fake", "real"):
+        if args.rate_api == "fake":
+            rate_app = fake_rate_api.create_app(args.rate_latency_ms, args.rate_jitter_ms)
+        else:
+            rate_app = load_service("interest-rate-api")["main"].app
+        loan["app.services.interest_rate_client"].interest_rate_client.transport = asgi_rate_transport(loan, rate_app)
+
+    loan_app = loan["main"].app
+    await stack.enter_async_context(loan_app.router.lifespan_context(loan_app))
+    return await stack.enter_async_context(
+        httpx.AsyncClient(base_url="http://loan-simulator", transport=httpx.ASGITransport(app=loan_app), timeout=30)
+    )
+
+
+async def run(args) -> Dict[str, dict]:
+    rng = random.Random(42)
+    available = scenarios(rng)
+    names = only(available, args.names)
+
+    results = {}
+    async with AsyncExitStack() as stack:
+        client = await open_loan_client(stack, args)
+        if "simulation-history" in names and not args.loan_url:
+            await seed_history(client, args.history_rows, available["save-simulation"])
+        for name in names:
+            results[name] = best_of([
+                await run_scenario(client, available[name], args.requests, args.concurrency) for _ in range(args.rounds)
+            ])
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scénarios de charge du simulateur de prêt")
+    parser.add_argument("names", nargs="*", help="Scénarios à lancer (tous par défaut)")
+    parser.add_argument("--requests", type=int, default=2000, help="Requêtes mesurées par scénario")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requêtes simultanées")
+    parser.add_argument("--loan-url", help="Cible un simulateur déjà démarré au lieu de le charger en processus")
+    parser.add_argument("--rate-api", choices=["fake", "real", "embedded"], default="fake",
+                        help="API Interest Rate utilisée par le simulateur en processus")
+    parser.add_argument("--rate-url", help="URL d'une API Interest Rate déployée (remplace --rate-api)")
+    parser.add_argument("--rate-latency-ms", type=float, default=0.0, help="Latence ajoutée par le stand-in")
+    parser.add_argument("--rate-jitter-ms", type=float, default=0.0, help="Variation aléatoire de cette latence")
+    parser.add_argument("--history-rows", type=int, default=5000, help="Simulations insérées avant le scénario d'historique")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    results = asyncio.run(run(args))
+    settings = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "target": args.loan_url or "in-process",
+        "rate_api": args.rate_url or args.rate_api,
+        "rate_latency_ms": args.rate_latency_ms,
+        "history_rows": args.history_rows,
+        "rounds": args.rounds
+    }
+    return finish("load", results, settings, args.save_baseline, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Micro-benchmarks des chemins chauds, appelés directement sans serveur HTTP.
+
+    python -m benchmarks.micro                    # rapport
+    python -m benchmarks.micro --compare          # échoue si régression par rapport à la baseline
+    python -m benchmarks.micro --save-baseline    # enregistre benchmarks/baselines/micro.json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from benchmarks.common import (
+    ROOT, add_baseline_arguments, best_of, finish, isolated_database, load_service, only, summarize
+)
+
+AGE_CATEGORIES = ["YOUNG_ADULT", "ADULT", "MIDDLE_AGED", "SENIOR"]
+PROFESSIONAL_CATEGORIES = ["EMPLOYEE", "EXECUTIVE", "CIVIL_SERVANT", "FREELANCER", "RETIRED", "STUDENT", "UNEMPLOYED"]
+
+
+async def measure(call: Callable[[], Awaitable[object]], iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        await call()
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def client_profile(rng: random.Random) -> dict:
+    return {
+        "first_name": "Camille",
+        "last_name": f"Martin{rng.randint(1, 500)}",
+        "age_category": rng.choice(AGE_CATEGORIES),
+        "professional_category": rng.choice(PROFESSIONAL_CATEGORIES),
+        "monthly_net_income": float(rng.randrange(1200, 12000, 50))
+    }
+
+
+async def seed_history(loan, rows: int, rng: random.Random) -> None:
+    models = loan["app.models"]
+    database = loan["app.database"]
+    simulation_service = loan["app.services.simulation_service"].simulation_service
+
+    await database.create_tables()
+    async with database.AsyncSessionLocal() as db:
+        for start in range(0, rows, 1000):
+            batch = []
+            for _ in range(min(1000, rows - start)):
+                profile = client_profile(rng)
+                batch.append(models.SaveSimulationRequest(
+                    loan_request=models.LoanRequest(amount=200000, duration_years=20, annual_interest_rate=1.8, **profile),
+                    loan_response=models.LoanResponse(
+                        loan_amount=200000, monthly_payment=992.9, total_interest=38296.0, total_cost=238296.0,
+                        annual_interest_rate=1.8
+                    )
+                ))
+            await simulation_service.save_simulations(batch, db)
+
+
+async def run(selected: List[str], iterations: int, history_rows: int, rounds: int) -> Dict[str, dict]:
+    rng = random.Random(42)
+    isolated_database()
+    # Taux du mode employé résolus par le moteur embarqué : aucun appel réseau dans la mesure
+    os.environ["INTEREST_RATE_TRANSPORT"] = "embedded"
+    loan = load_service("loan-simulator")
+    rate_api = load_service("interest-rate-api")
+
+    loan_models = loan["app.models"]
+    loan_service = loan["app.services.loan_service"].loan_service
+    interest_rate_client = loan["app.services.interest_rate_client"].interest_rate_client
+    simulation_service = loan["app.services.simulation_service"].simulation_service
+    database = loan["app.database"]
+    rate_models = rate_api["app.models"]
+    interest_rate_service = rate_api["app.services.interest_rate_service"].interest_rate_service
+
+    client_requests = [
+        loan_models.LoanRequest(amount=rng.randrange(50000, 500000, 1000), duration_years=rng.randint(5, 30),
+                                annual_interest_rate=round(rng.uniform(0.5, 4.5), 2))
+        for _ in range(256)
+    ]
+    employee_requests = [
+        loan_models.LoanRequest(amount=rng.randrange(50000, 500000, 1000), duration_years=rng.randint(5, 30),
+                                **client_profile(rng))
+        for _ in range(256)
+    ]
+    rate_requests = [
+        rate_models.InterestRateRequest(
+            age_category=profile["age_category"], professional_category=profile["professional_category"],
+            monthly_net_income=profile["monthly_net_income"]
+        )
+        for profile in (client_profile(rng) for _ in range(256))
+    ]
+
+    def cycle(items: list) -> Callable[[], object]:
+        index = [0]
+
+        def next_item():
+            index[0] = (index[0] + 1) % len(items)
+            return items[index[0]]
+        return next_item
+
+    next_client, next_employee, next_rate = cycle(client_requests), cycle(employee_requests), cycle(rate_requests)
+
+    async def calculate_interest_rate():
+        return interest_rate_service.calculate_interest_rate(next_rate())
+
+    def history(limit: int, fields=None):
+        async def call():
+            async with database.ReadSessionLocal() as db:
+                return await simulation_service.get_simulation_history(db, limit=limit, fields=fields)
+        return call
+
+    benchmarks = {
+        "calculate_loan[client]": lambda: loan_service.calculate_loan(next_client()),
+        "calculate_loan[employee]": lambda: loan_service.calculate_loan(next_employee()),
+        "calculate_interest_rate": calculate_interest_rate,
+        "simulation_history[50]": history(50),
+        "simulation_history[500]": history(500),
+        "simulation_history[500,3 fields]": history(500, ["id", "clientName", "monthlyPayment"])
+    }
+    # Les lectures d'historique sont plus coûteuses : moins d'itérations
+    iteration_counts = {name: iterations if not name.startswith("simulation_history") else max(1, iterations // 50)
+                        for name in benchmarks}
+
+    results = {}
+    await interest_rate_client.start()
+    try:
+        names = only(benchmarks, selected)
+        if any(name.startswith("simulation_history") for name in names):
+            await seed_history(loan, history_rows, rng)
+        for name in names:
+            count = iteration_counts[name]
+            results[name] = best_of([
+                await measure(benchmarks[name], count, warmup=max(1, count // 10)) for _ in range(rounds)
+            ])
+    finally:
+        await interest_rate_client.close()
+        await database.dispose_engines()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks du simulateur de prêt et de l'API Interest Rate")
+    parser.add_argument("names", nargs="*", help="Benchmarks à lancer (tous par défaut)")
+    parser.add_argument("--iterations", type=int, default=10000, help="Appels mesurés par benchmark")
+    parser.add_argument("--history-rows", type=int, default=5000, help="Simulations insérées avant les lectures d'historique")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    results = asyncio.run(run(args.names, args.iterations, args.history_rows, args.rounds))
+    settings = {"iterations": args.iterations, "history_rows": args.history_rows, "rounds": args.rounds}
+    return finish("micro", results, settings, args.save_baseline, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Modules partagés par le simulateur de prêt et l'API Interest Rate (santé, profilage, cache HTTP)."""
@@ -0,0 +1,53 @@
+"""Sondes de vivacité et de disponibilité du processus (/health/live, /health/ready)."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Tuple
+
+UP = "UP"
+DOWN = "DOWN"
+
+
+class HealthState:
+    """Disponibilité du processus : prêt une fois le démarrage terminé, plus prêt dès le début de l'arrêt.
+
+    Pendant le drainage (SIGTERM via serve.py), le processus continue de servir les requêtes mais
+    se déclare indisponible pour que le répartiteur de charge cesse de lui en envoyer.
+    Les vérifications enregistrées (base de données...) sont exécutées à chaque sonde de disponibilité.
+    """
+
+    def __init__(self, check_timeout: float = 2.0):
+        self.check_timeout = check_timeout
+        self.started = False
+        self.draining = False
+        self._checks: Dict[str, Callable[[], Awaitable[None]]] = {}
+
+    def add_check(self, name: str, check: Callable[[], Awaitable[None]]) -> None:
+        self._checks[name] = check
+
+    def mark_started(self) -> None:
+        self.started = True
+        self.draining = False
+
+    def start_draining(self) -> None:
+        self.draining = True
+
+    async def readiness(self) -> Tuple[bool, Dict[str, str]]:
+        if self.draining:
+            return False, {"lifecycle": "DRAINING"}
+        if not self.started:
+            return False, {"lifecycle": "STARTING"}
+
+        checks = {"lifecycle": UP}
+        results = await asyncio.gather(*(self._run(check) for check in self._checks.values()))
+        checks.update(zip(self._checks, results))
+        return all(result == UP for result in checks.values()), checks
+
+    async def _run(self, check: Callable[[], Awaitable[None]]) -> str:
+        try:
+            await asyncio.wait_for(check(), timeout=self.check_timeout)
+            return UP
+        except Exception:
+            return DOWN
+
+
+health = HealthState()
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+class CachedPayload:
+    """Corps JSON sérialisé une seule fois et servi avec ETag, Last-Modified et Cache-Control."""
+
+    def __init__(self, content: Any, cache_control: str, last_modified: Optional[float] = None):
+        # Même sérialisation que JSONResponse pour rester identique aux réponses non mises en cache
+        self.body = json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.last_modified = int(last_modified if last_modified is not None else time.time())
+        self.cache_control = cache_control
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            "Cache-Control": self.cache_control
+        }
+
+    def is_not_modified(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-None-Match prime sur If-Modified-Since (RFC 9110, section 13.2.2)
+            candidates = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in candidates or any(tag.removeprefix("W/") == self.etag for tag in candidates)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= self.last_modified
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def response(self, request: Request) -> Response:
+        if self.is_not_modified(request):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+
+class PayloadCache:
+    """Conserve un CachedPayload par clé, reconstruit uniquement quand la version change."""
+
+    def __init__(self, cache_control: str):
+        self.cache_control = cache_control
+        self.hits = 0
+        self.misses = 0
+        self._payloads: Dict[Hashable, Tuple[Hashable, CachedPayload]] = {}
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> CachedPayload:
+        cached = self._payloads.get(key)
+        if cached is None or cached[0] != version:
+            self.misses += 1
+            cached = (version, CachedPayload(build(), self.cache_control))
+            self._payloads[key] = cached
+        else:
+            self.hits += 1
+        return cached[1]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._payloads),
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,171 @@
+"""Métriques Prometheus communes aux deux services : requêtes HTTP, boucle d'événements et compteurs de composants.
+
+Avec plusieurs workers (serve.py), PROMETHEUS_MULTIPROC_DIR active le mode multiprocessus de prometheus_client :
+chaque worker écrit ses compteurs, jauges et histogrammes dans ce répertoire, et /metrics renvoie leur agrégat
+quel que soit le worker qui répond. Les compteurs de composants (caches, file d'écriture…) sont lus dans la
+mémoire du worker qui répond : ils portent alors un label worker.
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from starlette.routing import Mount
+
+# Appels internes (SQL, moteur de taux, boucle) : résolution plus fine que les buckets HTTP par défaut
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def multiprocess_dir() -> Optional[str]:
+    """Répertoire partagé par les workers d'un service, ou None pour un processus unique"""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+class StatsCollector:
+    """Expose à chaque collecte les compteurs d'un composant (méthode stats()) : caches, file d'écriture…"""
+
+    def __init__(self, prefix: str, description: str, stats: Callable[[], dict], counters: Iterable[str] = ()):
+        self.prefix = prefix
+        self.description = description
+        self.stats = stats
+        self.counters = set(counters)
+
+    def collect(self):
+        # Plusieurs workers : valeurs du seul worker qui répond, identifié par son PID
+        worker = [str(os.getpid())] if multiprocess_dir() else []
+        worker_label = ["worker"] if worker else []
+        for key, value in self.stats().items():
+            name = f"{self.prefix}_{key}"
+            documentation = f"{self.description} : {key}"
+            if isinstance(value, str):
+                # Valeur textuelle (ex. état du disjoncteur) : jauge à 1 portant la valeur en label
+                metric = GaugeMetricFamily(name, documentation, labels=[key, *worker_label])
+                metric.add_metric([value, *worker], 1)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                family = CounterMetricFamily if key in self.counters else GaugeMetricFamily
+                metric = family(name, documentation, labels=worker_label)
+                metric.add_metric(worker, value)
+            else:
+                continue
+            yield metric
+
+
+class ServiceMetrics:
+    """Registre Prometheus d'un service, avec les métriques HTTP et de boucle d'événements"""
+
+    def __init__(self):
+        # Registre propre au service : deux services chargés dans un même processus ne se gênent pas
+        self.registry = CollectorRegistry()
+        self._components: List[StatsCollector] = []
+
+        self.http_requests = Counter(
+            "http_requests_total", "Requêtes HTTP traitées", ["method", "route", "status"], registry=self.registry
+        )
+        self.http_request_duration = Histogram(
+            "http_request_duration_seconds", "Durée de traitement des requêtes HTTP", ["method", "route", "status"],
+            buckets=FAST_BUCKETS, registry=self.registry
+        )
+        self.http_requests_in_progress = Gauge(
+            "http_requests_in_progress", "Requêtes HTTP en cours de traitement", ["method"],
+            multiprocess_mode="livesum", registry=self.registry
+        )
+        self.event_loop_lag = Histogram(
+            "event_loop_lag_seconds", "Retard de la boucle d'événements sur un réveil programmé",
+            buckets=FAST_BUCKETS, registry=self.registry
+        )
+
+    def watch(self, prefix: str, description: str, stats: Callable[[], dict], counters: Iterable[str] = ()) -> None:
+        collector = StatsCollector(prefix, description, stats, counters)
+        self._components.append(collector)
+        self.registry.register(collector)
+
+    def render(self) -> bytes:
+        path = multiprocess_dir()
+        if path is None:
+            return generate_latest(self.registry)
+        # Agrégat des fichiers écrits par tous les workers, plus les composants du worker qui répond
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry, path)
+        for collector in self._components:
+            registry.register(collector)
+        return generate_latest(registry)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : nombre, durée et requêtes en cours par route (modèle de chemin) et statut"""
+
+    def __init__(self, app, metrics: ServiceMetrics):
+        self.app = app
+        self.metrics = metrics
+        self._route_templates: Optional[Dict[object, str]] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = self.metrics.http_requests_in_progress.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = self._route_template(scope)
+            status = str(status_code)
+            self.metrics.http_requests.labels(method, route, status).inc()
+            self.metrics.http_request_duration.labels(method, route, status).observe(time.perf_counter() - started)
+
+    def _route_template(self, scope) -> str:
+        # Le routeur indique l'endpoint retenu dans le scope ; le modèle de chemin évite un label par ID
+        if self._route_templates is None:
+            self._route_templates = {}
+            for route in scope["app"].routes:
+                if isinstance(route, Mount):
+                    self._route_templates[route.app] = f"{route.path}/{{path}}"
+                elif hasattr(route, "endpoint"):
+                    self._route_templates[route.endpoint] = route.path
+        return self._route_templates.get(scope.get("endpoint"), "unmatched")
+
+
+class EventLoopMonitor:
+    """Mesure à intervalle régulier le retard de réveil de la boucle : un retard élevé signale
+    du code bloquant (calcul, E/S synchrone) qui ralentit toutes les requêtes en cours."""
+
+    def __init__(self, lag: Histogram, interval: float = 0.5):
+        self.lag = lag
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag.observe(max(0.0, loop.time() - scheduled))
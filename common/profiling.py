@@ -0,0 +1,112 @@
+"""Profilage à la demande d'une requête : en-tête ou paramètre autorisé, ou échantillon aléatoire du trafic."""
+
+import asyncio
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import re
+import uuid
+from datetime import datetime
+from urllib.parse import parse_qs
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pyinstrument est optionnel : seul cProfile est alors disponible
+    SamplingProfiler = None
+    SpeedscopeRenderer = None
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAMETER = "profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """Middleware ASGI : profile la requête (réponse en flux comprise) et écrit le profil dans `output_dir`.
+
+    Déclenchement par l'en-tête X-Profile ou le paramètre ?profile= portant le jeton configuré, ou
+    tiré au sort selon `sample_rate`. L'identifiant du profil est renvoyé dans l'en-tête X-Profile-Id.
+    Un seul profil à la fois : une requête qui arrive pendant un profilage est servie normalement.
+    cProfile (déterministe) observe tout le thread, requêtes concurrentes comprises ; pyinstrument
+    (échantillonnage) ne suit que la tâche de la requête profilée.
+    """
+
+    def __init__(self, app, config):
+        self.app = app
+        self.config = config
+        self.profiler = config.profiler
+        if self.profiler == "pyinstrument" and SamplingProfiler is None:
+            raise ValueError("Le profileur pyinstrument nécessite le paquet pyinstrument (pip install pyinstrument)")
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:16]
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())]
+            await send(message)
+
+        self._active = True
+        profiler = self._start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            if self.profiler == "pyinstrument":
+                profiler.stop()
+            else:
+                profiler.disable()
+            self._active = False
+            # Écriture hors de la boucle : le rendu d'un profil peut prendre quelques dizaines de millisecondes
+            await asyncio.to_thread(self._write, profiler, profile_id, scope)
+
+    def _requested(self, scope) -> bool:
+        token = self.config.token.encode()
+        if token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER and hmac.compare_digest(value, token):
+                    return True
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            if any(hmac.compare_digest(value.encode("latin-1"), token) for value in query.get(PROFILE_QUERY_PARAMETER, [])):
+                return True
+        return self.config.sample_rate > 0 and random.random() < self.config.sample_rate
+
+    def _start(self):
+        if self.profiler == "pyinstrument":
+            profiler = SamplingProfiler(interval=self.config.interval_ms / 1000, async_mode="enabled")
+            profiler.start()
+            return profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _write(self, profiler, profile_id: str, scope) -> None:
+        os.makedirs(self.config.output_dir, exist_ok=True)
+        route = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        name = f"{datetime.now():%Y%m%d-%H%M%S}-{scope['method']}-{route[:60]}-{profile_id}"
+        if self.profiler == "pyinstrument":
+            # Format speedscope : flame graph interactif sur https://www.speedscope.app
+            path = os.path.join(self.config.output_dir, f"{name}.speedscope.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(profiler.output(renderer=SpeedscopeRenderer()))
+        else:
+            # Format pstats : flame graph avec snakeviz, flameprof ou gprof2dot
+            pstats.Stats(profiler).dump_stats(os.path.join(self.config.output_dir, f"{name}.prof"))
+        self._prune()
+
+    def _prune(self) -> None:
+        if self.config.max_files <= 0:
+            return
+        paths = [os.path.join(self.config.output_dir, name) for name in os.listdir(self.config.output_dir)]
+        profiles = sorted((path for path in paths if os.path.isfile(path)), key=os.path.getmtime)
+        for path in profiles[:-self.config.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -1,20 +1,36 @@
+import os
+from typing import Literal
 from pydantic import BaseModel
-from typing import Dict
 
+# Fichier de règles livré avec l'API (racine du service)
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rate_rules.json")
 
-class IncomeThresholds(BaseModel):
-    low: float = 2000.0
-    medium: float = 4000.0
-    high: float = 8000.0
-    low_modifier: float = 0.3
-    medium_modifier: float = 0.0
-    high_modifier: float = -0.1
-    very_high_modifier: float = -0.2
+
+class ProfilingConfig(BaseModel):
+    # Jeton attendu dans l'en-tête X-Profile ou le paramètre ?profile= (vide = déclenchement manuel désactivé)
+    token: str = os.getenv("PROFILING_TOKEN", "")
+    # Part des requêtes profilées au hasard (0.01 = 1 %)
+    sample_rate: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    # cprofile (déterministe, fichiers .prof) ou pyinstrument (échantillonnage, paquet optionnel, fichiers speedscope)
+    profiler: Literal["cprofile", "pyinstrument"] = os.getenv("PROFILER", "cprofile")
+    interval_ms: float = float(os.getenv("PROFILING_INTERVAL_MS", "1"))
+    output_dir: str = os.getenv("PROFILING_OUTPUT_DIR", "profiles")
+    # Au-delà, les profils les plus anciens sont supprimés (0 = aucune limite)
+    max_files: int = int(os.getenv("PROFILING_MAX_FILES", "200"))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token) or self.sample_rate > 0
 
 
 class InterestRateConfig(BaseModel):
-    base_rate: float = 1.5
-    income_thresholds: IncomeThresholds = IncomeThresholds()
+    # Grille de taux : fichier JSON, ou YAML (.yaml/.yml) si PyYAML est installé
+    rules_file: str = os.getenv("RATE_RULES_FILE", DEFAULT_RULES_FILE)
+    # Intervalle de détection des modifications du fichier (0 = rechargement manuel uniquement)
+    rules_reload_interval: float = float(os.getenv("RATE_RULES_RELOAD_INTERVAL", "5"))
+    # Jeton attendu dans l'en-tête X-Admin-Token par POST /interest-rate/config/reload (vide = route désactivée)
+    admin_token: str = os.getenv("RATE_RULES_ADMIN_TOKEN", "")
+    profiling: ProfilingConfig = ProfilingConfig()
 
 
-settings = InterestRateConfig()
\ No newline at end of file
+settings = InterestRateConfig()
@@ -0,0 +1,10 @@
+"""Métriques Prometheus de l'API Interest Rate : métriques communes de common.metrics (requêtes HTTP,
+caches, grille active, boucle d'événements)."""
+
+from common.metrics import EventLoopMonitor, ServiceMetrics
+
+service_metrics = ServiceMetrics()
+registry = service_metrics.registry
+render = service_metrics.render
+watch = service_metrics.watch
+event_loop_monitor = EventLoopMonitor(service_metrics.event_loop_lag)
@@ -1,6 +1,7 @@
 from enum import Enum
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime
+from typing import Dict, List, Optional
 
 
 class AgeCategory(str, Enum):
@@ -9,15 +10,6 @@ class AgeCategory(str, Enum):
     MIDDLE_AGED = "MIDDLE_AGED"
     SENIOR = "SENIOR"
 
-    def get_info(self):
-        info_map = {
-            "YOUNG_ADULT": {"age_range": "18-30 ans", "description": "Jeune adulte", "rate_modifier": 0.2},
-            "ADULT": {"age_range": "31-45 ans", "description": "Adulte", "rate_modifier": 0.0},
-            "MIDDLE_AGED": {"age_range": "46-60 ans", "description": "Âge moyen", "rate_modifier": -0.1},
-            "SENIOR": {"age_range": "61+ ans", "description": "Senior", "rate_modifier": 0.3}
-        }
-        return info_map[self.value]
-
 
 class ProfessionalCategory(str, Enum):
     EMPLOYEE = "EMPLOYEE"
@@ -28,18 +20,6 @@ class ProfessionalCategory(str, Enum):
     STUDENT = "STUDENT"
     UNEMPLOYED = "UNEMPLOYED"
 
-    def get_info(self):
-        info_map = {
-            "EMPLOYEE": {"name": "Salarié CDI", "description": "Employé en contrat à durée indéterminée", "rate_modifier": 0.0},
-            "EXECUTIVE": {"name": "Cadre", "description": "Cadre dirigeant ou ingénieur", "rate_modifier": -0.2},
-            "CIVIL_SERVANT": {"name": "Fonctionnaire", "description": "Agent de la fonction publique", "rate_modifier": -0.3},
-            "FREELANCER": {"name": "Indépendant", "description": "Travailleur indépendant ou freelance", "rate_modifier": 0.4},
-            "RETIRED": {"name": "Retraité", "description": "Personne à la retraite", "rate_modifier": 0.1},
-            "STUDENT": {"name": "Étudiant", "description": "Étudiant ou apprenti", "rate_modifier": 0.5},
-            "UNEMPLOYED": {"name": "Sans emploi", "description": "Personne sans activité professionnelle", "rate_modifier": 0.8}
-        }
-        return info_map[self.value]
-
 
 class CategoryInfo(BaseModel):
     name: str
@@ -70,6 +50,7 @@ class InterestRateResponse(BaseModel):
     age_modifier: float = Field(..., description="Modificateur appliqué pour l'âge")
     professional_modifier: float = Field(..., description="Modificateur appliqué pour la catégorie professionnelle")
     income_modifier: float = Field(..., description="Modificateur appliqué pour le revenu")
+    additional_modifier: float = Field(0.0, description="Somme des modificateurs additionnels des règles applicables")
     age_category: AgeCategory = Field(..., description="Catégorie d'âge utilisée")
     professional_category: ProfessionalCategory = Field(..., description="Catégorie professionnelle utilisée")
     monthly_net_income: float = Field(..., description="Revenu mensuel net considéré")
@@ -82,8 +63,106 @@ class InterestRateResponse(BaseModel):
                 "age_modifier": 0.2,
                 "professional_modifier": 0.0,
                 "income_modifier": 0.0,
+                "additional_modifier": 0.0,
                 "age_category": "ADULT",
                 "professional_category": "EMPLOYEE",
                 "monthly_net_income": 3500.0
             }
-        }
\ No newline at end of file
+        }
+
+
+class AgeCategoryRule(BaseModel):
+    age_range: str = Field(..., description="Tranche d'âge affichée")
+    description: str = Field(..., description="Libellé de la catégorie")
+    rate_modifier: float = Field(..., description="Modificateur de taux en points")
+
+
+class ProfessionalCategoryRule(BaseModel):
+    name: str = Field(..., description="Nom affiché")
+    description: str = Field(..., description="Description de la catégorie")
+    rate_modifier: float = Field(..., description="Modificateur de taux en points")
+
+
+class IncomeBand(BaseModel):
+    below: Optional[float] = Field(None, description="Borne supérieure exclusive du revenu ; absente pour la dernière tranche")
+    rate_modifier: float = Field(..., description="Modificateur de taux en points")
+
+
+class ModifierRule(BaseModel):
+    name: str = Field(..., description="Nom de la règle")
+    age_categories: Optional[List[AgeCategory]] = Field(None, description="Catégories d'âge concernées (toutes si absent)")
+    professional_categories: Optional[List[ProfessionalCategory]] = Field(
+        None, description="Catégories professionnelles concernées (toutes si absent)"
+    )
+    min_income: Optional[float] = Field(None, description="Revenu mensuel minimal (inclus)")
+    max_income: Optional[float] = Field(None, description="Revenu mensuel maximal (exclu)")
+    rate_modifier: float = Field(..., description="Modificateur de taux en points, ajouté aux profils concernés")
+
+    @model_validator(mode="after")
+    def check_income_range(self):
+        if self.min_income is not None and self.max_income is not None and self.min_income >= self.max_income:
+            raise ValueError(f"Règle {self.name} : min_income doit être inférieur à max_income")
+        return self
+
+
+class RateRules(BaseModel):
+    base_rate: float = Field(..., description="Taux de base en pourcentage")
+    age_categories: Dict[AgeCategory, AgeCategoryRule]
+    professional_categories: Dict[ProfessionalCategory, ProfessionalCategoryRule]
+    income_bands: List[IncomeBand] = Field(..., min_length=1, description="Tranches de revenu, par borne croissante")
+    modifiers: List[ModifierRule] = Field([], description="Modificateurs additionnels combinant plusieurs critères")
+
+    @model_validator(mode="after")
+    def check_rules(self):
+        missing = [category.value for category in AgeCategory if category not in self.age_categories] + \
+            [category.value for category in ProfessionalCategory if category not in self.professional_categories]
+        if missing:
+            raise ValueError(f"Catégories sans règle : {', '.join(missing)}")
+
+        bounds = [band.below for band in self.income_bands]
+        if bounds[-1] is not None or None in bounds[:-1]:
+            raise ValueError("Seule la dernière tranche de revenu doit être sans borne supérieure")
+        if any(low >= high for low, high in zip(bounds[:-2], bounds[1:-1])):
+            raise ValueError("Les bornes des tranches de revenu doivent être strictement croissantes")
+        return self
+
+
+class IncomeThresholds(BaseModel):
+    """Tranches de revenu au format historique de GET /interest-rate/config (quatre tranches fixes)"""
+    low: float
+    medium: float
+    high: float
+    low_modifier: float
+    medium_modifier: float
+    high_modifier: float
+    very_high_modifier: float
+
+
+class ActiveRateConfig(RateRules):
+    income_thresholds: Optional[IncomeThresholds] = Field(
+        None, description="Ancien format des tranches de revenu, conservé pour les clients existants ; "
+                          "absent si la grille n'a pas exactement quatre tranches"
+    )
+    version: str = Field(..., description="Version de la grille (empreinte du contenu des règles)")
+    source: str = Field(..., description="Fichier de règles chargé")
+    loaded_at: datetime = Field(..., description="Date de chargement de la grille")
+
+    @classmethod
+    def from_rules(cls, rules: RateRules, version: str, source: str) -> "ActiveRateConfig":
+        bands = rules.income_bands
+        income_thresholds = None
+        if len(bands) == 4:
+            income_thresholds = IncomeThresholds(
+                low=bands[0].below, medium=bands[1].below, high=bands[2].below,
+                low_modifier=bands[0].rate_modifier, medium_modifier=bands[1].rate_modifier,
+                high_modifier=bands[2].rate_modifier, very_high_modifier=bands[3].rate_modifier
+            )
+        return cls(
+            **rules.model_dump(), income_thresholds=income_thresholds, version=version, source=source,
+            loaded_at=datetime.utcnow()
+        )
+
+
+class HealthStatus(BaseModel):
+    status: str = Field(..., description="UP ou DOWN")
+    checks: Dict[str, str] = Field(default_factory=dict, description="État de chaque vérification (lifecycle...)")
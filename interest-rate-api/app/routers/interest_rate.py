@@ -1,12 +1,18 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import hmac
 
-from app.models import InterestRateRequest, InterestRateResponse, CategoryInfo
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import JSONResponse
+from typing import List, Optional
+
+from app.models import InterestRateRequest, InterestRateResponse, CategoryInfo, ActiveRateConfig
 from app.services.interest_rate_service import interest_rate_service
-from app.config import InterestRateConfig
+from common.http_cache import PayloadCache
 
 router = APIRouter()
 
+# Les catégories ne changent qu'avec la configuration : elles sont sérialisées une fois par version
+category_payloads = PayloadCache(cache_control="public, max-age=300")
+
 
 @router.post(
     "/interest-rate/calculate",
@@ -27,17 +33,41 @@ async def calculate_interest_rate(request: InterestRateRequest):
         raise HTTPException(status_code=500, detail="Erreur interne du serveur")
 
 
+@router.post(
+    "/interest-rate/calculate-batch",
+    response_model=List[InterestRateResponse],
+    summary="Calculer un lot de taux d'intérêt",
+    description="Calcule en un seul appel les taux d'intérêt d'une liste de demandes, avec le détail des modificateurs pour chacune. Les résultats sont retournés dans l'ordre des demandes.",
+    responses={
+        200: {"description": "Taux d'intérêt calculés avec succès"},
+        400: {"description": "Données d'entrée invalides"},
+        500: {"description": "Erreur interne du serveur"}
+    }
+)
+async def calculate_interest_rates(requests: List[InterestRateRequest]):
+    try:
+        responses = interest_rate_service.calculate_interest_rates(requests)
+        # Les lignes sont déjà au format de InterestRateResponse : on évite une revalidation par ligne
+        return JSONResponse(content=responses)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+
 @router.get(
     "/interest-rate/categories/age",
     response_model=List[CategoryInfo],
     summary="Obtenir les catégories d'âge",
     description="Retourne la liste de toutes les catégories d'âge disponibles avec leurs modificateurs",
     responses={
-        200: {"description": "Liste des catégories d'âge récupérée avec succès"}
+        200: {"description": "Liste des catégories d'âge récupérée avec succès"},
+        304: {"description": "Liste inchangée depuis la version détenue par le client"}
     }
 )
-async def get_age_categories():
-    return interest_rate_service.get_age_categories()
+async def get_age_categories(request: Request):
+    payload = category_payloads.get(
+        "age", interest_rate_service.config_version, interest_rate_service.get_age_categories
+    )
+    return payload.response(request)
 
 
 @router.get(
@@ -46,21 +76,49 @@ async def get_age_categories():
     summary="Obtenir les catégories professionnelles",
     description="Retourne la liste de toutes les catégories socio-professionnelles avec leurs modificateurs",
     responses={
-        200: {"description": "Liste des catégories professionnelles récupérée avec succès"}
+        200: {"description": "Liste des catégories professionnelles récupérée avec succès"},
+        304: {"description": "Liste inchangée depuis la version détenue par le client"}
     }
 )
-async def get_professional_categories():
-    return interest_rate_service.get_professional_categories()
+async def get_professional_categories(request: Request):
+    payload = category_payloads.get(
+        "professional", interest_rate_service.config_version, interest_rate_service.get_professional_categories
+    )
+    return payload.response(request)
 
 
 @router.get(
     "/interest-rate/config",
-    response_model=InterestRateConfig,
+    response_model=ActiveRateConfig,
     summary="Obtenir la configuration actuelle",
-    description="Retourne la configuration actuelle des taux et seuils utilisés pour les calculs",
+    description="Retourne la grille de taux active (taux de base, catégories, tranches de revenu, modificateurs additionnels) avec sa version. Le champ income_thresholds reprend l'ancien format des tranches pour les clients existants.",
     responses={
         200: {"description": "Configuration récupérée avec succès"}
     }
 )
 async def get_current_config():
-    return interest_rate_service.get_current_config()
\ No newline at end of file
+    return interest_rate_service.get_current_config()
+
+
+@router.post(
+    "/interest-rate/config/reload",
+    response_model=ActiveRateConfig,
+    summary="Recharger la grille de taux",
+    description="Relit immédiatement le fichier de règles et active la nouvelle grille, sans redémarrage. Réservé aux administrateurs : l'en-tête X-Admin-Token doit porter le jeton RATE_RULES_ADMIN_TOKEN. Le fichier est aussi surveillé automatiquement (RATE_RULES_RELOAD_INTERVAL).",
+    responses={
+        200: {"description": "Grille rechargée ; la version change si les règles ont été modifiées"},
+        400: {"description": "Fichier de règles invalide, la grille précédente reste active"},
+        403: {"description": "Jeton d'administration absent ou invalide, ou rechargement manuel désactivé"}
+    }
+)
+async def reload_config(x_admin_token: Optional[str] = Header(None)):
+    token = interest_rate_service.config.admin_token
+    if not token:
+        raise HTTPException(status_code=403, detail="Rechargement manuel désactivé (RATE_RULES_ADMIN_TOKEN non défini)")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide")
+    try:
+        interest_rate_service.reload(force=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return interest_rate_service.get_current_config()
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app import metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    summary="Métriques Prometheus",
+    description="Expose au format texte Prometheus les compteurs et histogrammes de latence des requêtes HTTP, des caches, de la grille de taux active et de la boucle d'événements",
+    responses={
+        200: {"description": "Métriques au format d'exposition Prometheus", "content": {CONTENT_TYPE_LATEST: {}}}
+    }
+)
+async def get_metrics():
+    # Type de contenu complet (version du format incluse) : media_type y ajouterait un second charset
+    return Response(content=metrics.render(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -0,0 +1,7 @@
+"""Services de calcul des taux.
+
+Le simulateur de prêt peut charger ce paquet dans son propre processus (INTEREST_RATE_TRANSPORT=embedded),
+sous un autre nom que `app` : les modules de services et ceux qu'ils importent (models, config) ne doivent
+utiliser que des imports relatifs (`from ..models import ...`), jamais `from app...`. Le test
+loan-simulator/tests/test_rate_transport.py le vérifie.
+"""
@@ -1,68 +1,138 @@
-from typing import List
-from app.models import InterestRateRequest, InterestRateResponse, CategoryInfo, AgeCategory, ProfessionalCategory
-from app.config import settings
+import asyncio
+import hashlib
+import json
+import os
+from datetime import timezone
+from typing import List, Optional, Tuple
+from ..models import (
+    InterestRateRequest, InterestRateResponse, CategoryInfo, AgeCategory, ProfessionalCategory,
+    RateRules, ActiveRateConfig
+)
+from ..config import InterestRateConfig, settings
+from .rate_rules import load_rules
+from .rate_table import RateTable
+
+
+class CompiledRates:
+    """Grille compilée depuis un fichier de règles, remplacée d'un bloc à chaque rechargement"""
+
+    def __init__(self, rules: RateRules, source: str, file_stamp: Optional[Tuple[int, int]]):
+        self.rules = rules
+        self.table = RateTable(rules)
+        # Empreinte du contenu normalisé : indépendante de l'ordre des clés et de la mise en forme du fichier
+        self.version = hashlib.sha256(
+            json.dumps(rules.model_dump(mode="json"), sort_keys=True).encode()
+        ).hexdigest()[:16]
+        self.config = ActiveRateConfig.from_rules(rules, self.version, source)
+        self.file_stamp = file_stamp
+        self.age_categories = [
+            CategoryInfo(
+                name=category.value,
+                description=rules.age_categories[category].description,
+                age_range=rules.age_categories[category].age_range,
+                rate_modifier=rules.age_categories[category].rate_modifier,
+                code=category.value  # Enum value for API calls
+            )
+            for category in AgeCategory
+        ]
+        self.professional_categories = [
+            CategoryInfo(
+                name=rules.professional_categories[category].name,
+                description=rules.professional_categories[category].description,
+                rate_modifier=rules.professional_categories[category].rate_modifier,
+                code=category.value  # Enum value for API calls
+            )
+            for category in ProfessionalCategory
+        ]
 
 
 class InterestRateCalculationService:
 
+    def __init__(self, config: InterestRateConfig = settings):
+        self.config = config
+        self._compiled = self._compile()
+        self._watch_task: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    @property
+    def config_version(self) -> str:
+        return self._compiled.version
+
+    def _compile(self) -> CompiledRates:
+        """Charge et compile le fichier de règles ; lève ValueError si le fichier est invalide"""
+        path = self.config.rules_file
+        file_stamp = self._file_stamp(path)
+        return CompiledRates(load_rules(path), path, file_stamp)
+
+    def reload(self, force: bool = False) -> bool:
+        """Recharge les règles si le fichier a changé ; retourne True si une nouvelle grille est active.
+
+        La grille n'est remplacée qu'une fois entièrement compilée : les calculs en cours
+        utilisent l'ancienne ou la nouvelle, jamais un mélange. En cas d'erreur, l'ancienne
+        grille reste active.
+        """
+        if not force and self._file_stamp(self.config.rules_file) == self._compiled.file_stamp:
+            return False
+        compiled = self._compile()
+        changed = compiled.version != self._compiled.version
+        self._compiled = compiled
+        if changed:
+            self.reloads += 1
+        return changed
+
+    def start(self) -> None:
+        """Démarre la surveillance du fichier de règles (appelé au démarrage de l'application)"""
+        if self._watch_task is None and self.config.rules_reload_interval > 0:
+            self._watch_task = asyncio.create_task(self._watch_rules())
+
+    async def close(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch_rules(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.rules_reload_interval)
+            try:
+                self.reload()
+            except ValueError:
+                # Fichier en cours d'écriture ou invalide : on garde la grille active
+                pass
+
     def calculate_interest_rate(self, request: InterestRateRequest) -> InterestRateResponse:
-        base_rate = settings.base_rate
-        age_modifier = request.age_category.get_info()["rate_modifier"]
-        professional_modifier = request.professional_category.get_info()["rate_modifier"]
-        income_modifier = self._calculate_income_modifier(request.monthly_net_income)
-
-        final_rate = base_rate + age_modifier + professional_modifier + income_modifier
-
-        return InterestRateResponse(
-            annual_interest_rate=round(final_rate, 2),
-            base_rate=base_rate,
-            age_modifier=age_modifier,
-            professional_modifier=professional_modifier,
-            income_modifier=income_modifier,
-            age_category=request.age_category,
-            professional_category=request.professional_category,
-            monthly_net_income=request.monthly_net_income
-        )
+        return self._compiled.table.quote(request)
+
+    def calculate_interest_rates(self, requests: List[InterestRateRequest]) -> List[dict]:
+        return self._compiled.table.quote_batch(requests)
 
     def get_age_categories(self) -> List[CategoryInfo]:
-        categories = []
-        for category in AgeCategory:
-            info = category.get_info()
-            categories.append(CategoryInfo(
-                name=category.value,
-                description=info["description"],
-                age_range=info["age_range"],
-                rate_modifier=info["rate_modifier"],
-                code=category.value  # Enum value for API calls
-            ))
-        return categories
+        return self._compiled.age_categories
 
     def get_professional_categories(self) -> List[CategoryInfo]:
-        categories = []
-        for category in ProfessionalCategory:
-            info = category.get_info()
-            categories.append(CategoryInfo(
-                name=info["name"],
-                description=info["description"],
-                rate_modifier=info["rate_modifier"],
-                code=category.value  # Enum value for API calls
-            ))
-        return categories
+        return self._compiled.professional_categories
 
-    def get_current_config(self):
-        return settings
+    def get_current_config(self) -> ActiveRateConfig:
+        return self._compiled.config
 
-    def _calculate_income_modifier(self, monthly_income: float) -> float:
-        thresholds = settings.income_thresholds
+    def stats(self) -> dict:
+        """Version de la grille active, date de chargement et nombre de rechargements"""
+        return {
+            "version": self._compiled.version,
+            "loaded_at_seconds": self._compiled.config.loaded_at.replace(tzinfo=timezone.utc).timestamp(),
+            "reloads": self.reloads
+        }
 
-        if monthly_income < thresholds.low:
-            return thresholds.low_modifier
-        elif monthly_income < thresholds.medium:
-            return thresholds.medium_modifier
-        elif monthly_income < thresholds.high:
-            return thresholds.high_modifier
-        else:
-            return thresholds.very_high_modifier
+    @staticmethod
+    def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
 
 
-interest_rate_service = InterestRateCalculationService()
\ No newline at end of file
+interest_rate_service = InterestRateCalculationService()
@@ -0,0 +1,38 @@
+import json
+import os
+
+from pydantic import ValidationError
+
+from ..models import RateRules
+
+try:
+    import yaml
+except ImportError:  # PyYAML est optionnel : seuls les fichiers JSON sont alors acceptés
+    yaml = None
+
+
+def load_rules(path: str) -> RateRules:
+    """Lit et valide un fichier de règles de taux (JSON, ou YAML si PyYAML est installé)"""
+    try:
+        with open(path, encoding="utf-8") as rules_file:
+            content = rules_file.read()
+    except OSError as e:
+        raise ValueError(f"Fichier de règles illisible ({path}) : {e}")
+
+    try:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            if yaml is None:
+                raise ValueError("Les règles au format YAML nécessitent le paquet PyYAML (pip install pyyaml)")
+            data = yaml.safe_load(content)
+        else:
+            data = json.loads(content)
+    except (json.JSONDecodeError, getattr(yaml, "YAMLError", json.JSONDecodeError)) as e:
+        raise ValueError(f"Fichier de règles invalide ({path}) : {e}")
+
+    try:
+        return RateRules.model_validate(data)
+    except ValidationError as e:
+        details = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'racine'} : {error['msg']}" for error in e.errors()
+        )
+        raise ValueError(f"Règles de taux invalides ({path}) : {details}")
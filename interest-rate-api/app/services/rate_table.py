@@ -0,0 +1,119 @@
+from bisect import bisect_right
+from typing import List
+
+import numpy as np
+
+from ..models import (
+    InterestRateRequest, InterestRateResponse, AgeCategory, ProfessionalCategory, RateRules
+)
+
+
+class RateTable:
+    """Grille de taux compilée : âge × catégorie professionnelle × segment de revenu.
+
+    Les segments de revenu sont délimités par les bornes des tranches et par celles
+    des modificateurs additionnels. Tous les modificateurs sont additionnés une seule
+    fois à la compilation ; un devis se résume ensuite à deux accès par index et une
+    recherche dichotomique sur les bornes de revenu.
+    """
+
+    def __init__(self, rules: RateRules):
+        self.base_rate = rules.base_rate
+        self.age_categories = list(AgeCategory)
+        self.professional_categories = list(ProfessionalCategory)
+        self.age_index = {category: index for index, category in enumerate(self.age_categories)}
+        self.professional_index = {category: index for index, category in enumerate(self.professional_categories)}
+
+        self.age_modifiers = np.array(
+            [rules.age_categories[category].rate_modifier for category in self.age_categories]
+        )
+        self.professional_modifiers = np.array(
+            [rules.professional_categories[category].rate_modifier for category in self.professional_categories]
+        )
+
+        # Les bornes sont exclusives : un revenu égal à une borne passe dans le segment supérieur
+        band_bounds = [band.below for band in rules.income_bands[:-1]]
+        self.income_thresholds = sorted(set(band_bounds).union(
+            bound for rule in rules.modifiers for bound in (rule.min_income, rule.max_income) if bound is not None
+        ))
+        # Revenu plancher de chaque segment, qui suffit à situer tout le segment
+        segment_floors = [-np.inf] + self.income_thresholds
+        band_modifiers = [band.rate_modifier for band in rules.income_bands]
+        self.income_modifiers = np.array([band_modifiers[bisect_right(band_bounds, floor)] for floor in segment_floors])
+
+        self.additional_modifiers = np.zeros(
+            (len(self.age_categories), len(self.professional_categories), len(segment_floors))
+        )
+        for rule in rules.modifiers:
+            ages = [self.age_index[category] for category in rule.age_categories or self.age_categories]
+            professionals = [
+                self.professional_index[category]
+                for category in rule.professional_categories or self.professional_categories
+            ]
+            segments = [
+                index for index, floor in enumerate(segment_floors)
+                if (rule.min_income is None or floor >= rule.min_income)
+                and (rule.max_income is None or floor < rule.max_income)
+            ]
+            self.additional_modifiers[np.ix_(ages, professionals, segments)] += rule.rate_modifier
+
+        self.rates = (
+            self.base_rate
+            + self.age_modifiers[:, None, None]
+            + self.professional_modifiers[None, :, None]
+            + self.income_modifiers[None, None, :]
+            + self.additional_modifiers
+        )
+
+    def income_band(self, monthly_income: float) -> int:
+        return bisect_right(self.income_thresholds, monthly_income)
+
+    def quote(self, request: InterestRateRequest) -> InterestRateResponse:
+        age = self.age_index[request.age_category]
+        professional = self.professional_index[request.professional_category]
+        band = self.income_band(request.monthly_net_income)
+
+        return InterestRateResponse(
+            annual_interest_rate=round(float(self.rates[age, professional, band]), 2),
+            base_rate=self.base_rate,
+            age_modifier=float(self.age_modifiers[age]),
+            professional_modifier=float(self.professional_modifiers[professional]),
+            income_modifier=float(self.income_modifiers[band]),
+            additional_modifier=float(self.additional_modifiers[age, professional, band]),
+            age_category=request.age_category,
+            professional_category=request.professional_category,
+            monthly_net_income=request.monthly_net_income
+        )
+
+    def quote_batch(self, requests: List[InterestRateRequest]) -> List[dict]:
+        ages = np.fromiter((self.age_index[r.age_category] for r in requests), dtype=np.intp, count=len(requests))
+        professionals = np.fromiter(
+            (self.professional_index[r.professional_category] for r in requests), dtype=np.intp, count=len(requests)
+        )
+        incomes = np.fromiter((r.monthly_net_income for r in requests), dtype=np.float64, count=len(requests))
+        bands = np.searchsorted(self.income_thresholds, incomes, side="right")
+
+        rates = self.rates[ages, professionals, bands].tolist()
+        age_modifiers = self.age_modifiers[ages].tolist()
+        professional_modifiers = self.professional_modifiers[professionals].tolist()
+        income_modifiers = self.income_modifiers[bands].tolist()
+        additional_modifiers = self.additional_modifiers[ages, professionals, bands].tolist()
+
+        # Les entrées ont déjà été validées par FastAPI : on produit directement les dictionnaires
+        # de réponse plutôt que de reconstruire un modèle Pydantic par ligne
+        return [
+            {
+                "annual_interest_rate": round(rate, 2),
+                "base_rate": self.base_rate,
+                "age_modifier": age_modifier,
+                "professional_modifier": professional_modifier,
+                "income_modifier": income_modifier,
+                "additional_modifier": additional_modifier,
+                "age_category": request.age_category.value,
+                "professional_category": request.professional_category.value,
+                "monthly_net_income": request.monthly_net_income
+            }
+            for request, rate, age_modifier, professional_modifier, income_modifier, additional_modifier in zip(
+                requests, rates, age_modifiers, professional_modifiers, income_modifiers, additional_modifiers
+            )
+        ]
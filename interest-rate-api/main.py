@@ -3,13 +3,31 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 
-from app.routers import interest_rate
+from app import metrics
 from app.config import settings
+from common.health import health
+from common.metrics import MetricsMiddleware
+from common.profiling import ProfilingMiddleware
+from app.routers import interest_rate, health as health_router, metrics as metrics_router
+from app.services.interest_rate_service import interest_rate_service
+
+# Cache and active rule counters read on every /metrics scrape
+metrics.watch("category_payload_cache", "Cache des catégories sérialisées", interest_rate.category_payloads.stats,
+              counters=["hits", "misses"])
+metrics.watch("rate_rules", "Grille de taux active", interest_rate_service.stats, counters=["reloads"])
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Watch the rate rules file and hot-reload it when it changes
+    interest_rate_service.start()
+    # Sample event loop lag for /metrics
+    metrics.event_loop_monitor.start()
+    health.mark_started()
     yield
+    health.start_draining()
+    await metrics.event_loop_monitor.stop()
+    await interest_rate_service.close()
 
 
 app = FastAPI(
@@ -21,6 +39,12 @@ app = FastAPI(
     openapi_url="/api-docs/openapi.json"
 )
 
+app.add_middleware(MetricsMiddleware, metrics=metrics.service_metrics)
+
+# Opt-in request profiling (PROFILING_TOKEN and/or PROFILING_SAMPLE_RATE)
+if settings.profiling.enabled:
+    app.add_middleware(ProfilingMiddleware, config=settings.profiling)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -30,6 +54,8 @@ app.add_middleware(
 )
 
 app.include_router(interest_rate.router, prefix="/api", tags=["Interest Rate"])
+app.include_router(metrics_router.router, tags=["Monitoring"])
+app.include_router(health_router.router, tags=["Monitoring"])
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8081, reload=True)
\ No newline at end of file
@@ -0,0 +1,33 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Répertoire du service (paquet app) puis racine du dépôt (paquet common partagé)
+sys.path[:0] = [_SERVICE_DIR, os.path.dirname(_SERVICE_DIR)]
+
+from app.config import DEFAULT_RULES_FILE  # noqa: E402
+
+
+@pytest.fixture
+def run():
+    """Exécute une coroutine dans une boucle neuve"""
+    return asyncio.run
+
+
+@pytest.fixture
+def default_rules():
+    """Contenu du fichier de règles livré avec l'API"""
+    with open(DEFAULT_RULES_FILE, encoding="utf-8") as rules_file:
+        return json.load(rules_file)
+
+
+@pytest.fixture
+def rules_file(tmp_path, default_rules):
+    """Copie modifiable du fichier de règles livré"""
+    path = tmp_path / "rate_rules.json"
+    path.write_text(json.dumps(default_rules), encoding="utf-8")
+    return path
@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import InterestRateConfig
+from app.models import AgeCategory, InterestRateRequest, ProfessionalCategory
+from app.routers import interest_rate
+from app.services.interest_rate_service import InterestRateCalculationService, interest_rate_service
+from app.services.rate_rules import load_rules
+
+
+def write_rules(path, rules):
+    path.write_text(json.dumps(rules), encoding="utf-8")
+
+
+def quote(service, income=3500.0):
+    request = InterestRateRequest(
+        age_category=AgeCategory.ADULT, professional_category=ProfessionalCategory.EMPLOYEE, monthly_net_income=income
+    )
+    return service.calculate_interest_rate(request).annual_interest_rate
+
+
+def test_json_and_yaml_rules_are_equivalent(tmp_path, rules_file, default_rules):
+    yaml = pytest.importorskip("yaml")
+    yaml_file = tmp_path / "rate_rules.yaml"
+    yaml_file.write_text(yaml.safe_dump(default_rules), encoding="utf-8")
+
+    assert load_rules(str(yaml_file)) == load_rules(str(rules_file))
+
+
+@pytest.mark.parametrize("change, message", [
+    (lambda rules: rules["age_categories"].pop("SENIOR"), "Catégories sans règle : SENIOR"),
+    (lambda rules: rules["income_bands"].pop(), "Seule la dernière tranche"),
+    (lambda rules: rules["income_bands"][1].update(below=1000.0), "strictement croissantes"),
+    (lambda rules: rules["modifiers"].append({"name": "vide", "min_income": 5000, "max_income": 5000, "rate_modifier": 1}),
+     "Règle vide : min_income doit être inférieur à max_income"),
+    (lambda rules: rules.update(base_rate="élevé"), "base_rate"),
+])
+def test_invalid_rules_are_rejected(rules_file, default_rules, change, message):
+    change(default_rules)
+    write_rules(rules_file, default_rules)
+
+    with pytest.raises(ValueError, match=message):
+        load_rules(str(rules_file))
+
+
+def test_unreadable_or_malformed_files_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="illisible"):
+        load_rules(str(tmp_path / "absent.json"))
+    malformed = tmp_path / "rate_rules.json"
+    malformed.write_text('{"base_rate": [1.5', encoding="utf-8")
+    with pytest.raises(ValueError, match="invalide"):
+        load_rules(str(malformed))
+
+
+def test_version_depends_on_content_only(tmp_path, rules_file, default_rules):
+    service = InterestRateCalculationService(InterestRateConfig(rules_file=str(rules_file)))
+    # Même contenu, autre ordre des clés et autre mise en forme : même version
+    reordered = tmp_path / "reordered.json"
+    reordered.write_text(json.dumps(dict(reversed(list(default_rules.items()))), indent=4), encoding="utf-8")
+    assert InterestRateCalculationService(InterestRateConfig(rules_file=str(reordered))).config_version == \
+        service.config_version
+
+    default_rules["base_rate"] = 2.0
+    write_rules(rules_file, default_rules)
+    assert service.reload(force=True)
+    assert service.get_current_config().version == service.config_version
+    assert service.stats()["reloads"] == 1
+    # Contenu inchangé : la version et le compteur de rechargements ne bougent pas
+    assert not service.reload(force=True)
+    assert service.stats()["reloads"] == 1
+
+
+def test_rules_file_change_is_picked_up_while_running(run, rules_file, default_rules):
+    service = InterestRateCalculationService(InterestRateConfig(rules_file=str(rules_file), rules_reload_interval=0.01))
+    before = quote(service)
+
+    async def scenario():
+        service.start()
+        default_rules["base_rate"] += 1.0
+        write_rules(rules_file, default_rules)
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if quote(service) != before:
+                break
+        await service.close()
+
+    run(scenario())
+    assert quote(service) == round(before + 1.0, 2)
+
+
+def test_invalid_file_keeps_the_active_grid(run, rules_file, default_rules):
+    service = InterestRateCalculationService(InterestRateConfig(rules_file=str(rules_file), rules_reload_interval=0.01))
+    version = service.config_version
+
+    async def scenario():
+        service.start()
+        rules_file.write_text("{", encoding="utf-8")
+        await asyncio.sleep(0.1)
+        await service.close()
+
+    run(scenario())
+    with pytest.raises(ValueError):
+        service.reload()
+    assert service.config_version == version
+    assert quote(service) == 1.5
+
+
+def test_config_keeps_the_original_fields(run):
+    config = run(interest_rate.get_current_config()).model_dump()
+
+    assert config["base_rate"] == 1.5
+    assert config["income_thresholds"] == {
+        "low": 2000.0, "medium": 4000.0, "high": 8000.0,
+        "low_modifier": 0.3, "medium_modifier": 0.0, "high_modifier": -0.1, "very_high_modifier": -0.2
+    }
+    assert config["version"] == interest_rate_service.config_version
+
+
+def test_config_without_four_bands_has_no_original_thresholds(rules_file, default_rules):
+    default_rules["income_bands"].insert(0, {"below": 1000.0, "rate_modifier": 0.5})
+    write_rules(rules_file, default_rules)
+    service = InterestRateCalculationService(InterestRateConfig(rules_file=str(rules_file)))
+
+    assert service.get_current_config().income_thresholds is None
+
+
+@pytest.mark.parametrize("configured, sent", [("", None), ("", "secret"), ("secret", None), ("secret", "autre")])
+def test_reload_requires_the_admin_token(run, monkeypatch, configured, sent):
+    monkeypatch.setattr(interest_rate_service.config, "admin_token", configured)
+
+    with pytest.raises(HTTPException) as error:
+        run(interest_rate.reload_config(x_admin_token=sent))
+    assert error.value.status_code == 403
+
+
+def test_reload_with_the_admin_token(run, monkeypatch):
+    monkeypatch.setattr(interest_rate_service.config, "admin_token", "secret")
+
+    config = run(interest_rate.reload_config(x_admin_token="secret"))
+    assert config.version == interest_rate_service.config_version
@@ -0,0 +1,96 @@
+import json
+from itertools import product
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import InterestRateConfig
+from app.models import AgeCategory, InterestRateRequest, ProfessionalCategory
+from app.services.interest_rate_service import InterestRateCalculationService, interest_rate_service
+from main import app
+
+# Grille d'origine, codée en dur avant le fichier de règles
+BASE_RATE = 1.5
+AGE_MODIFIERS = {"YOUNG_ADULT": 0.2, "ADULT": 0.0, "MIDDLE_AGED": -0.1, "SENIOR": 0.3}
+PROFESSIONAL_MODIFIERS = {
+    "EMPLOYEE": 0.0, "EXECUTIVE": -0.2, "CIVIL_SERVANT": -0.3, "FREELANCER": 0.4,
+    "RETIRED": 0.1, "STUDENT": 0.5, "UNEMPLOYED": 0.8
+}
+# Revenus de part et d'autre de chaque seuil, et sur le seuil lui-même (tranche supérieure)
+INCOMES = [1.0, 1999.99, 2000.0, 2000.01, 3999.99, 4000.0, 6000.0, 7999.99, 8000.0, 8000.01, 50000.0]
+
+
+def baseline_income_modifier(income: float) -> float:
+    if income < 2000.0:
+        return 0.3
+    elif income < 4000.0:
+        return 0.0
+    elif income < 8000.0:
+        return -0.1
+    return -0.2
+
+
+@pytest.mark.parametrize("age", list(AgeCategory))
+@pytest.mark.parametrize("professional", list(ProfessionalCategory))
+def test_default_rules_match_the_original_grid(age, professional):
+    for income in INCOMES:
+        response = interest_rate_service.calculate_interest_rate(
+            InterestRateRequest(age_category=age, professional_category=professional, monthly_net_income=income)
+        )
+        income_modifier = baseline_income_modifier(income)
+        expected = BASE_RATE + AGE_MODIFIERS[age.value] + PROFESSIONAL_MODIFIERS[professional.value] + income_modifier
+
+        assert response.annual_interest_rate == round(expected, 2)
+        assert response.age_modifier == AGE_MODIFIERS[age.value]
+        assert response.professional_modifier == PROFESSIONAL_MODIFIERS[professional.value]
+        assert response.income_modifier == income_modifier
+        assert response.additional_modifier == 0.0
+
+
+def test_default_categories_match_the_original_modifiers():
+    assert {c.code: c.rate_modifier for c in interest_rate_service.get_age_categories()} == AGE_MODIFIERS
+    assert {c.code: c.rate_modifier for c in interest_rate_service.get_professional_categories()} == \
+        PROFESSIONAL_MODIFIERS
+
+
+def all_requests(incomes):
+    return [
+        InterestRateRequest(age_category=age, professional_category=professional, monthly_net_income=income)
+        for age, professional, income in product(AgeCategory, ProfessionalCategory, incomes)
+    ]
+
+
+def test_batch_quotes_match_single_quotes(rules_file, default_rules):
+    # Modificateur additionnel : ses bornes de revenu découpent les tranches en segments
+    default_rules["modifiers"].append({
+        "name": "senior_freelancer", "age_categories": ["SENIOR"], "professional_categories": ["FREELANCER"],
+        "min_income": 3000, "max_income": 6000, "rate_modifier": 0.25
+    })
+    rules_file.write_text(json.dumps(default_rules), encoding="utf-8")
+    service = InterestRateCalculationService(InterestRateConfig(rules_file=str(rules_file)))
+    requests = all_requests(INCOMES + [2999.99, 3000.0, 5999.99, 6000.0])
+
+    batch = service.calculate_interest_rates(requests)
+
+    assert batch == [service.calculate_interest_rate(request).model_dump(mode="json") for request in requests]
+    assert any(row["additional_modifier"] == 0.25 for row in batch)
+
+
+def test_batch_endpoint_matches_single_endpoint():
+    client = TestClient(app)
+    payloads = [request.model_dump(mode="json") for request in all_requests(INCOMES)]
+
+    batch = client.post("/api/interest-rate/calculate-batch", json=payloads)
+
+    assert batch.status_code == 200
+    assert batch.json() == [client.post("/api/interest-rate/calculate", json=payload).json() for payload in payloads]
+
+
+def test_unknown_category_is_rejected_by_both_endpoints():
+    client = TestClient(app)
+    unknown = {"age_category": "CENTENARIAN", "professional_category": "EMPLOYEE", "monthly_net_income": 3000.0}
+    valid = {"age_category": "ADULT", "professional_category": "EMPLOYEE", "monthly_net_income": 3000.0}
+
+    assert client.post("/api/interest-rate/calculate", json=unknown).status_code == 422
+    # Une seule demande invalide fait rejeter tout le lot
+    assert client.post("/api/interest-rate/calculate-batch", json=[valid, unknown]).status_code == 422
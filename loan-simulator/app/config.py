@@ -0,0 +1,113 @@
+import os
+from typing import Literal
+from pydantic import BaseModel
+
+# Répertoire de l'API Interest Rate dans ce dépôt, chargé en mode embarqué
+DEFAULT_EMBEDDED_API_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "interest-rate-api"
+)
+
+
+# Frontend servi par l'application (pages HTML, CSS, JS)
+DEFAULT_STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class InterestRateClientConfig(BaseModel):
+    # http : appels à l'API distante ; embedded : moteur de taux chargé dans ce processus (même nœud)
+    transport: Literal["http", "embedded"] = os.getenv("INTEREST_RATE_TRANSPORT", "http")
+    embedded_api_path: str = os.getenv("INTEREST_RATE_EMBEDDED_PATH", DEFAULT_EMBEDDED_API_PATH)
+    base_url: str = os.getenv("INTEREST_RATE_API_URL", "http://localhost:8081")
+    timeout: float = float(os.getenv("INTEREST_RATE_API_TIMEOUT", "10.0"))
+    connect_timeout: float = float(os.getenv("INTEREST_RATE_API_CONNECT_TIMEOUT", "2.0"))
+    pool_timeout: float = float(os.getenv("INTEREST_RATE_API_POOL_TIMEOUT", "5.0"))
+    max_connections: int = int(os.getenv("INTEREST_RATE_API_MAX_CONNECTIONS", "100"))
+    max_keepalive_connections: int = int(os.getenv("INTEREST_RATE_API_MAX_KEEPALIVE", "20"))
+    keepalive_expiry: float = float(os.getenv("INTEREST_RATE_API_KEEPALIVE_EXPIRY", "30.0"))
+    # Nécessite le paquet optionnel h2 (pip install "httpx[http2]")
+    http2: bool = _env_bool("INTEREST_RATE_API_HTTP2", False)
+    # Cache des taux : une taille ou un TTL à 0 désactive le cache
+    rate_cache_size: int = int(os.getenv("INTEREST_RATE_CACHE_SIZE", "1024"))
+    rate_cache_ttl: float = float(os.getenv("INTEREST_RATE_CACHE_TTL", "300"))
+    config_check_interval: float = float(os.getenv("INTEREST_RATE_CONFIG_CHECK_INTERVAL", "30"))
+    # Rafraîchissement en arrière-plan des catégories (0 = chargement unique au premier appel)
+    category_refresh_interval: float = float(os.getenv("INTEREST_RATE_CATEGORY_REFRESH_INTERVAL", "60"))
+    # Relance d'un appel sans réponse au-delà du percentile de latence observé (ou d'un délai fixe si > 0)
+    hedge_enabled: bool = _env_bool("INTEREST_RATE_HEDGE", True)
+    hedge_percentile: float = float(os.getenv("INTEREST_RATE_HEDGE_PERCENTILE", "0.95"))
+    hedge_delay_ms: float = float(os.getenv("INTEREST_RATE_HEDGE_DELAY_MS", "0"))
+    hedge_min_delay_ms: float = float(os.getenv("INTEREST_RATE_HEDGE_MIN_DELAY_MS", "20"))
+    # Disjoncteur : échecs consécutifs avant ouverture (0 = désactivé) et durée d'ouverture en secondes
+    breaker_failure_threshold: int = int(os.getenv("INTEREST_RATE_BREAKER_FAILURES", "5"))
+    breaker_reset_timeout: float = float(os.getenv("INTEREST_RATE_BREAKER_RESET_TIMEOUT", "15"))
+    # Derniers taux connus, servis marqués comme périmés quand le moteur de taux est indisponible (0 = désactivé)
+    stale_rate_cache_size: int = int(os.getenv("INTEREST_RATE_STALE_CACHE_SIZE", "4096"))
+
+
+class DatabaseConfig(BaseModel):
+    url: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./loan_simulator.db")
+    echo: bool = _env_bool("DATABASE_ECHO", False)
+    # Pragmas SQLite appliqués à chaque nouvelle connexion
+    journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    # Valeur négative = taille en Kio (SQLite), ici ~64 Mio par connexion
+    cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    # Connexions en lecture seule, séparées de l'unique connexion d'écriture
+    read_pool_size: int = int(os.getenv("DATABASE_READ_POOL_SIZE", "5"))
+
+
+class SaveQueueConfig(BaseModel):
+    # Mode par défaut de /api/save-simulation : direct, grouped (commit groupé attendu) ou async
+    default_mode: Literal["direct", "grouped", "async"] = os.getenv("SAVE_SIMULATION_MODE", "direct")
+    # Un groupe est validé dès qu'il atteint max_batch_size ou que max_delay_ms est écoulé
+    max_batch_size: int = int(os.getenv("SAVE_QUEUE_MAX_BATCH_SIZE", "256"))
+    max_delay_ms: float = float(os.getenv("SAVE_QUEUE_MAX_DELAY_MS", "5"))
+    # Au-delà, les appelants attendent qu'une place se libère (contre-pression)
+    max_pending: int = int(os.getenv("SAVE_QUEUE_MAX_PENDING", "10000"))
+
+
+class ProfilingConfig(BaseModel):
+    # Jeton attendu dans l'en-tête X-Profile ou le paramètre ?profile= (vide = déclenchement manuel désactivé)
+    token: str = os.getenv("PROFILING_TOKEN", "")
+    # Part des requêtes profilées au hasard (0.01 = 1 %)
+    sample_rate: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    # cprofile (déterministe, fichiers .prof) ou pyinstrument (échantillonnage, paquet optionnel, fichiers speedscope)
+    profiler: Literal["cprofile", "pyinstrument"] = os.getenv("PROFILER", "cprofile")
+    interval_ms: float = float(os.getenv("PROFILING_INTERVAL_MS", "1"))
+    output_dir: str = os.getenv("PROFILING_OUTPUT_DIR", "profiles")
+    # Au-delà, les profils les plus anciens sont supprimés (0 = aucune limite)
+    max_files: int = int(os.getenv("PROFILING_MAX_FILES", "200"))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token) or self.sample_rate > 0
+
+
+class StaticAssetsConfig(BaseModel):
+    directory: str = os.getenv("STATIC_DIR", DEFAULT_STATIC_DIR)
+    minify: bool = _env_bool("STATIC_MINIFY", True)
+    # Pages HTML : cache court puis revalidation par ETag ; CSS/JS à empreinte : cache long, immutable
+    html_max_age: int = int(os.getenv("STATIC_HTML_MAX_AGE", "60"))
+    asset_max_age: int = int(os.getenv("STATIC_ASSET_MAX_AGE", "31536000"))
+    # Intervalle de détection des fichiers modifiés sur le disque (0 = construction unique au démarrage ;
+    # les scripts de développement le fixent à 2 s)
+    check_interval: float = float(os.getenv("STATIC_CHECK_INTERVAL", "0"))
+
+
+class LoanSimulatorConfig(BaseModel):
+    interest_rate_client: InterestRateClientConfig = InterestRateClientConfig()
+    database: DatabaseConfig = DatabaseConfig()
+    save_queue: SaveQueueConfig = SaveQueueConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
+    static_assets: StaticAssetsConfig = StaticAssetsConfig()
+
+
+settings = LoanSimulatorConfig()
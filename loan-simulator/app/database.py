@@ -1,19 +1,86 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, event, table, column, text
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from datetime import datetime
-import os
+from typing import Optional
+
+from app.config import settings, DatabaseConfig
 
 # Database configuration
-DATABASE_URL = "sqlite+aiosqlite:///./loan_simulator.db"
+DATABASE_URL = settings.database.url
+
+
+def _read_only_url(url: URL) -> Optional[URL]:
+    """URL SQLite en lecture seule (mode=ro) ; None pour une base en mémoire ou un autre moteur"""
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    if url.database.startswith("file:"):
+        return url.update_query_dict({"mode": "ro", "uri": "true"})
+    return url.set(database=f"file:{url.database}").update_query_dict({"mode": "ro", "uri": "true"})
+
+
+def _sqlite_pragmas(config: DatabaseConfig, read_only: bool):
+    pragmas = [
+        f"PRAGMA busy_timeout = {config.busy_timeout_ms}",
+        f"PRAGMA cache_size = {config.cache_size}",
+        f"PRAGMA mmap_size = {config.mmap_size}",
+    ]
+    if not read_only:
+        # Le mode WAL est persistant dans le fichier : seule la connexion d'écriture le positionne
+        pragmas += [
+            f"PRAGMA journal_mode = {config.journal_mode}",
+            f"PRAGMA synchronous = {config.synchronous}",
+        ]
+
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return apply
+
+
+def _create_engines(config: DatabaseConfig):
+    url = make_url(config.url)
+    if url.get_backend_name() != "sqlite":
+        engine = create_async_engine(url, echo=config.echo)
+        return engine, engine
 
-# Create async engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+    read_url = _read_only_url(url)
+    if read_url is None:
+        # Base en mémoire : une connexion en lecture seule ne verrait pas les mêmes données
+        engine = create_async_engine(url, echo=config.echo)
+        event.listen(engine.sync_engine, "connect", _sqlite_pragmas(config, read_only=False))
+        return engine, engine
 
-# Create session maker
+    # SQLite n'accepte qu'un écrivain à la fois : une seule connexion d'écriture évite
+    # les erreurs "database is locked", les lectures passent par leur propre pool.
+    # aiosqlite utilise NullPool par défaut (une connexion par session) : on impose un vrai pool
+    engine = create_async_engine(
+        url, echo=config.echo, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0
+    )
+    event.listen(engine.sync_engine, "connect", _sqlite_pragmas(config, read_only=False))
+
+    read_engine = create_async_engine(
+        read_url, echo=config.echo, poolclass=AsyncAdaptedQueuePool, pool_size=config.read_pool_size, max_overflow=0
+    )
+    event.listen(read_engine.sync_engine, "connect", _sqlite_pragmas(config, read_only=True))
+    return engine, read_engine
+
+
+# Create async engines (écriture et lecture)
+engine, read_engine = _create_engines(settings.database)
+
+# Create session makers
 AsyncSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+ReadSessionLocal = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 # Base class for models
 Base = declarative_base()
@@ -36,6 +103,54 @@ class LoanSimulation(Base):
     monthly_payment = Column(Float, nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Pagination par clé (created_at, id) de l'historique, seule ou après un filtre de catégorie
+        Index("ix_loan_simulations_created_at_id", "created_at", "id"),
+        Index("ix_loan_simulations_age_created_at_id", "age_category", "created_at", "id"),
+        Index("ix_loan_simulations_professional_created_at_id", "professional_category", "created_at", "id"),
+    )
+
+
+# Index plein texte (FTS5) des noms de clients : table externe adossée à loan_simulations,
+# insensible à la casse et aux accents, avec index de préfixes pour la recherche en cours de saisie
+SIMULATION_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE loan_simulations_fts USING fts5(
+        first_name, last_name,
+        content='loan_simulations', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS loan_simulations_fts_insert AFTER INSERT ON loan_simulations BEGIN
+        INSERT INTO loan_simulations_fts(rowid, first_name, last_name)
+        VALUES (new.id, new.first_name, new.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS loan_simulations_fts_delete AFTER DELETE ON loan_simulations BEGIN
+        INSERT INTO loan_simulations_fts(loan_simulations_fts, rowid, first_name, last_name)
+        VALUES ('delete', old.id, old.first_name, old.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS loan_simulations_fts_update AFTER UPDATE OF first_name, last_name ON loan_simulations BEGIN
+        INSERT INTO loan_simulations_fts(loan_simulations_fts, rowid, first_name, last_name)
+        VALUES ('delete', old.id, old.first_name, old.last_name);
+        INSERT INTO loan_simulations_fts(rowid, first_name, last_name)
+        VALUES (new.id, new.first_name, new.last_name);
+    END
+    """,
+]
+
+# Vue Core de la table FTS5 pour les requêtes (MATCH, rang bm25)
+simulation_search = table(
+    "loan_simulations_fts",
+    column("rowid"),
+    column("rank"),
+    column("loan_simulations_fts")
+)
+
 
 # Dependency to get database session
 async def get_db():
@@ -46,7 +161,51 @@ async def get_db():
             await session.close()
 
 
+# Dependency to get a read-only database session (historique, recherche)
+async def get_read_db():
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def dispose_engines():
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+# Sonde de disponibilité : la base de lecture répond
+async def ping_database():
+    async with read_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
 # Create tables
 async def create_tables():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all ne crée les index qu'avec leur table : on ajoute ceux qui manquent sur une base existante
+        await conn.run_sync(_create_missing_indexes)
+        if conn.dialect.name == "sqlite":
+            await conn.run_sync(_create_search_index)
+
+
+def _create_missing_indexes(sync_conn):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+def _create_search_index(sync_conn):
+    exists = sync_conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'loan_simulations_fts'")
+    ).first()
+    if not exists:
+        sync_conn.execute(text(SIMULATION_SEARCH_DDL[0]))
+    for ddl in SIMULATION_SEARCH_DDL[1:]:
+        sync_conn.execute(text(ddl))
+    if not exists:
+        # Indexe les simulations enregistrées avant la création de l'index
+        sync_conn.execute(text("INSERT INTO loan_simulations_fts(loan_simulations_fts) VALUES ('rebuild')"))
@@ -0,0 +1,58 @@
+"""Métriques Prometheus du simulateur : appels au moteur de taux et SQL, en plus des métriques communes
+(requêtes HTTP, caches, boucle d'événements) de common.metrics."""
+
+import time
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common.metrics import FAST_BUCKETS, EventLoopMonitor, ServiceMetrics
+
+service_metrics = ServiceMetrics()
+registry = service_metrics.registry
+render = service_metrics.render
+watch = service_metrics.watch
+event_loop_monitor = EventLoopMonitor(service_metrics.event_loop_lag)
+
+rate_engine_call_duration = Histogram(
+    "interest_rate_client_call_duration_seconds", "Durée des appels au moteur de taux",
+    ["operation", "outcome"], buckets=FAST_BUCKETS, registry=registry
+)
+rate_engine_errors = Counter(
+    "interest_rate_client_errors_total", "Appels au moteur de taux en échec", ["operation", "reason"], registry=registry
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds", "Durée des requêtes SQL", ["engine", "statement"],
+    buckets=FAST_BUCKETS, registry=registry
+)
+db_query_errors = Counter("db_query_errors_total", "Requêtes SQL en erreur", ["engine"], registry=registry)
+
+SQL_STATEMENTS = {"select", "insert", "update", "delete", "with", "pragma", "create", "begin", "commit", "rollback"}
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Mesure la durée de chaque requête SQL exécutée par `engine`"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        db_query_duration.labels(name, _statement_kind(statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+        db_query_errors.labels(name).inc()
+
+
+def _statement_kind(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    kind = words[0].lower() if words else ""
+    return kind if kind in SQL_STATEMENTS else "other"
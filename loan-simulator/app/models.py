@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class LoanRequest(BaseModel):
@@ -42,6 +43,7 @@ class LoanResponse(BaseModel):
     total_interest: float = Field(..., alias="totalInterest", description="Coût total des intérêts")
     total_cost: float = Field(..., alias="totalCost", description="Coût total du prêt")
     annual_interest_rate: Optional[float] = Field(None, alias="annualInterestRate", description="Taux d'intérêt annuel appliqué")
+    rate_stale: bool = Field(False, alias="rateStale", description="Taux issu du dernier calcul connu, le service de taux étant indisponible")
 
     class Config:
         populate_by_name = True
@@ -51,11 +53,134 @@ class LoanResponse(BaseModel):
                 "monthlyPayment": 1289.25,
                 "totalInterest": 59420.0,
                 "totalCost": 309420.0,
-                "annualInterestRate": 1.7
+                "annualInterestRate": 1.7,
+                "rateStale": False
             }
         }
 
 
+# Profils clients par grille : chacun coûte un appel au moteur de taux
+MAX_SCENARIO_PROFILES = 50
+
+
+class ScenarioAxis(BaseModel):
+    values: Optional[List[float]] = Field(None, description="Valeurs explicites de l'axe")
+    start: Optional[float] = Field(None, description="Première valeur de la plage")
+    stop: Optional[float] = Field(None, description="Dernière valeur de la plage (incluse)")
+    step: Optional[float] = Field(None, gt=0, description="Pas de la plage")
+
+
+class ClientProfile(BaseModel):
+    age_category: str = Field(..., alias="ageCategory", description="Catégorie d'âge")
+    professional_category: str = Field(..., alias="professionalCategory", description="Catégorie professionnelle")
+    monthly_net_income: float = Field(..., gt=0, alias="monthlyNetIncome", description="Revenu mensuel net")
+
+    class Config:
+        populate_by_name = True
+
+
+class LoanScenarioRequest(BaseModel):
+    amounts: ScenarioAxis = Field(..., description="Montants à comparer")
+    durations_years: ScenarioAxis = Field(..., alias="durationsYears", description="Durées à comparer, en années")
+    annual_interest_rates: Optional[ScenarioAxis] = Field(None, alias="annualInterestRates", description="Taux annuels à comparer, en pourcentage")
+    client_profiles: Optional[List[ClientProfile]] = Field(None, max_length=MAX_SCENARIO_PROFILES, alias="clientProfiles", description="Profils clients dont le taux est obtenu via l'API Interest Rate")
+
+    class Config:
+        populate_by_name = True
+        json_schema_extra = {
+            "example": {
+                "amounts": {"start": 150000.0, "stop": 250000.0, "step": 50000.0},
+                "durationsYears": {"values": [15, 20, 25]},
+                "annualInterestRates": {"values": [3.5, 4.0]},
+                "clientProfiles": [
+                    {"ageCategory": "ADULT", "professionalCategory": "EMPLOYEE", "monthlyNetIncome": 3500.0}
+                ]
+            }
+        }
+
+
+class LoanScenarioGrid(BaseModel):
+    amounts: List[float] = Field(..., description="Montants (1er axe des matrices)")
+    durations_years: List[int] = Field(..., alias="durationsYears", description="Durées (2e axe des matrices)")
+    annual_interest_rates: List[float] = Field(..., alias="annualInterestRates", description="Taux (3e axe des matrices)")
+    rate_profiles: List[Optional[ClientProfile]] = Field(..., alias="rateProfiles", description="Profil client à l'origine de chaque taux, null pour un taux saisi")
+    monthly_payments: List[List[List[float]]] = Field(..., alias="monthlyPayments", description="Mensualités [montant][durée][taux]")
+    total_costs: List[List[List[float]]] = Field(..., alias="totalCosts", description="Coûts totaux [montant][durée][taux]")
+    total_interests: List[List[List[float]]] = Field(..., alias="totalInterests", description="Intérêts totaux [montant][durée][taux]")
+    rate_stale: bool = Field(False, alias="rateStale", description="Au moins un taux de profil est le dernier connu, le service de taux étant indisponible")
+
+    class Config:
+        populate_by_name = True
+
+
+class RateInputs(BaseModel):
+    # Taux saisi (interface client) ou profil client dont le taux est calculé (interface employé)
+    annual_interest_rate: Optional[float] = Field(None, ge=0, alias="annualInterestRate", description="Taux d'intérêt annuel en pourcentage")
+    age_category: Optional[str] = Field(None, alias="ageCategory", description="Catégorie d'âge")
+    professional_category: Optional[str] = Field(None, alias="professionalCategory", description="Catégorie professionnelle")
+    monthly_net_income: Optional[float] = Field(None, alias="monthlyNetIncome", description="Revenu mensuel net")
+
+    class Config:
+        populate_by_name = True
+
+
+class MaxAmountRequest(RateInputs):
+    monthly_budget: float = Field(..., gt=0, alias="monthlyBudget", description="Mensualité maximale en euros")
+    duration_years: int = Field(..., gt=0, alias="durationYears", description="Durée du prêt en années")
+
+
+class MaxAmountResponse(BaseModel):
+    monthly_budget: float = Field(..., alias="monthlyBudget", description="Mensualité maximale")
+    duration_years: int = Field(..., alias="durationYears", description="Durée du prêt en années")
+    annual_interest_rate: float = Field(..., alias="annualInterestRate", description="Taux d'intérêt annuel appliqué")
+    max_amount: float = Field(..., alias="maxAmount", description="Montant maximal empruntable")
+    total_interest: float = Field(..., alias="totalInterest", description="Coût total des intérêts")
+    total_cost: float = Field(..., alias="totalCost", description="Coût total du prêt")
+    rate_stale: bool = Field(False, alias="rateStale", description="Taux issu du dernier calcul connu, le service de taux étant indisponible")
+
+    class Config:
+        populate_by_name = True
+
+
+class MinDurationRequest(RateInputs):
+    amount: float = Field(..., gt=0, description="Montant du prêt en euros")
+    monthly_budget: float = Field(..., gt=0, alias="monthlyBudget", description="Mensualité maximale en euros")
+
+
+class MinDurationResponse(BaseModel):
+    amount: float = Field(..., description="Montant du prêt")
+    monthly_budget: float = Field(..., alias="monthlyBudget", description="Mensualité maximale")
+    annual_interest_rate: float = Field(..., alias="annualInterestRate", description="Taux d'intérêt annuel appliqué")
+    feasible: bool = Field(..., description="Faux si la mensualité ne couvre pas les intérêts")
+    min_duration_months: Optional[int] = Field(None, alias="minDurationMonths", description="Nombre minimal de mensualités")
+    min_duration_years: Optional[int] = Field(None, alias="minDurationYears", description="Durée minimale en années entières")
+    monthly_payment: Optional[float] = Field(None, alias="monthlyPayment", description="Mensualité sur la durée minimale en années entières")
+    rate_stale: bool = Field(False, alias="rateStale", description="Taux issu du dernier calcul connu, le service de taux étant indisponible")
+
+    class Config:
+        populate_by_name = True
+
+
+class ImpliedRateRequest(BaseModel):
+    amount: float = Field(..., gt=0, description="Montant du prêt en euros")
+    duration_years: int = Field(..., gt=0, alias="durationYears", description="Durée du prêt en années")
+    monthly_payment: float = Field(..., gt=0, alias="monthlyPayment", description="Mensualité cible en euros")
+
+    class Config:
+        populate_by_name = True
+
+
+class ImpliedRateResponse(BaseModel):
+    amount: float = Field(..., description="Montant du prêt")
+    duration_years: int = Field(..., alias="durationYears", description="Durée du prêt en années")
+    monthly_payment: float = Field(..., alias="monthlyPayment", description="Mensualité cible")
+    feasible: bool = Field(..., description="Faux si la mensualité ne rembourse pas le capital (taux négatif)")
+    annual_interest_rate: Optional[float] = Field(None, alias="annualInterestRate", description="Taux d'intérêt annuel implicite en pourcentage")
+
+    class Config:
+        populate_by_name = True
+
+
 class SaveSimulationRequest(BaseModel):
     loan_request: LoanRequest = Field(..., alias="loanRequest", description="Données de la demande de prêt")
     loan_response: LoanResponse = Field(..., alias="loanResponse", description="Résultats du calcul de prêt")
@@ -77,6 +202,21 @@ class SaveSimulationResponse(BaseModel):
         }
 
 
+class BulkSaveSimulationResponse(BaseModel):
+    ids: List[int] = Field(..., description="ID des simulations sauvegardées, dans l'ordre des demandes")
+    count: int = Field(..., description="Nombre de simulations sauvegardées")
+    message: str = Field(..., description="Message de confirmation")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ids": [123, 124, 125],
+                "count": 3,
+                "message": "3 simulation(s) sauvegardée(s) avec succès"
+            }
+        }
+
+
 class SimulationHistory(BaseModel):
     id: int
     first_name: str = Field(..., alias="firstName")
@@ -98,4 +238,84 @@ class SimulationHistory(BaseModel):
 
     class Config:
         populate_by_name = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class RateCacheStats(BaseModel):
+    hits: int = Field(..., description="Nombre de taux servis depuis le cache")
+    misses: int = Field(..., description="Nombre de taux demandés à l'API Interest Rate")
+    size: int = Field(..., description="Nombre d'entrées actuellement en cache")
+    max_size: int = Field(..., alias="maxSize", description="Nombre maximal d'entrées")
+    ttl: float = Field(..., description="Durée de vie d'une entrée en secondes")
+    hit_ratio: float = Field(..., alias="hitRatio", description="Proportion de taux servis depuis le cache")
+    config_version: Optional[str] = Field(None, alias="configVersion", description="Version de la configuration des taux en cache")
+    upstream_calls: int = Field(0, alias="upstreamCalls", description="Appels effectivement envoyés au moteur de taux (taux et catégories)")
+    coalesced: int = Field(0, description="Demandes servies par un appel identique déjà en cours")
+    in_flight: int = Field(0, alias="inFlight", description="Appels au moteur de taux actuellement en cours")
+    circuit_state: str = Field("closed", alias="circuitState", description="État du disjoncteur (closed, open, half_open)")
+    hedged_requests: int = Field(0, alias="hedgedRequests", description="Appels relancés faute de réponse dans le délai de relance")
+    stale_served: int = Field(0, alias="staleServed", description="Taux périmés servis pendant une indisponibilité du service de taux")
+
+    class Config:
+        populate_by_name = True
+
+
+class SimulationFilters(BaseModel):
+    age_category: Optional[str] = Field(None, description="Catégorie d'âge")
+    professional_category: Optional[str] = Field(None, description="Catégorie professionnelle")
+    created_from: Optional[datetime] = Field(None, description="Simulations créées à partir de cette date (incluse)")
+    created_before: Optional[datetime] = Field(None, description="Simulations créées avant cette date (exclue)")
+    min_amount: Optional[float] = Field(None, description="Montant emprunté minimal")
+    max_amount: Optional[float] = Field(None, description="Montant emprunté maximal")
+    min_rate: Optional[float] = Field(None, description="Taux d'intérêt annuel minimal")
+    max_rate: Optional[float] = Field(None, description="Taux d'intérêt annuel maximal")
+    client: Optional[str] = Field(None, description="Début du nom ou du prénom du client (chaque mot doit correspondre)")
+
+
+class AmountPercentiles(BaseModel):
+    p25: Optional[float] = Field(None, description="1er quartile des montants empruntés")
+    median: Optional[float] = Field(None, description="Montant médian")
+    p75: Optional[float] = Field(None, description="3e quartile des montants empruntés")
+    p90: Optional[float] = Field(None, description="9e décile des montants empruntés")
+
+
+class SimulationStats(BaseModel):
+    count: int = Field(..., description="Nombre de simulations")
+    total_amount: Optional[float] = Field(None, alias="totalAmount", description="Volume total emprunté")
+    average_amount: Optional[float] = Field(None, alias="averageAmount", description="Montant moyen emprunté")
+    average_interest_rate: Optional[float] = Field(None, alias="averageInterestRate", description="Taux annuel moyen")
+    min_interest_rate: Optional[float] = Field(None, alias="minInterestRate", description="Taux annuel minimal")
+    max_interest_rate: Optional[float] = Field(None, alias="maxInterestRate", description="Taux annuel maximal")
+    average_duration_years: Optional[float] = Field(None, alias="averageDurationYears", description="Durée moyenne en années")
+    average_monthly_payment: Optional[float] = Field(None, alias="averageMonthlyPayment", description="Mensualité moyenne")
+    amount_percentiles: AmountPercentiles = Field(..., alias="amountPercentiles", description="Percentiles des montants (rang le plus proche)")
+
+    class Config:
+        populate_by_name = True
+
+
+class SimulationStatsGroup(SimulationStats):
+    age_category: Optional[str] = Field(None, alias="ageCategory", description="Catégorie d'âge du groupe")
+    professional_category: Optional[str] = Field(None, alias="professionalCategory", description="Catégorie professionnelle du groupe")
+    period: Optional[str] = Field(None, description="Période du groupe (ex. 2024-03 pour un regroupement mensuel)")
+
+
+class SimulationAnalytics(BaseModel):
+    overall: SimulationStats = Field(..., description="Statistiques sur l'ensemble des simulations filtrées")
+    groups: List[SimulationStatsGroup] = Field(..., description="Statistiques par groupe, triées par clé de regroupement")
+
+    class Config:
+        populate_by_name = True
+
+
+class SimulationPage(BaseModel):
+    items: List[SimulationHistory] = Field(..., description="Simulations de la page, de la plus récente à la plus ancienne")
+    next_cursor: Optional[str] = Field(None, alias="nextCursor", description="Curseur de la page suivante, absent sur la dernière page")
+
+    class Config:
+        populate_by_name = True
+
+
+class HealthStatus(BaseModel):
+    status: str = Field(..., description="UP ou DOWN")
+    checks: Dict[str, str] = Field(default_factory=dict, description="État de chaque vérification (lifecycle, database...)")
@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from common.health import health, UP, DOWN
+from app.models import HealthStatus
+
+router = APIRouter()
+
+
+@router.get(
+    "/health/live",
+    response_model=HealthStatus,
+    summary="Sonde de vivacité",
+    description="Répond tant que la boucle d'événements du processus traite les requêtes. Un échec signifie que le processus doit être redémarré.",
+    responses={
+        200: {"description": "Processus vivant"}
+    }
+)
+async def liveness():
+    return HealthStatus(status=UP)
+
+
+@router.get(
+    "/health/ready",
+    response_model=HealthStatus,
+    summary="Sonde de disponibilité",
+    description="Indique si le processus peut recevoir du trafic : démarrage terminé, pas d'arrêt en cours, dépendances joignables",
+    responses={
+        200: {"description": "Processus prêt à recevoir du trafic"},
+        503: {"description": "Processus en démarrage, en cours d'arrêt ou dépendance injoignable"}
+    }
+)
+async def readiness():
+    ready, checks = await health.readiness()
+    if not ready:
+        return JSONResponse(status_code=503, content=HealthStatus(status=DOWN, checks=checks).model_dump())
+    return HealthStatus(status=UP, checks=checks)
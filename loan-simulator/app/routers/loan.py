@@ -1,18 +1,47 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from datetime import date, datetime
+import math
+from typing import List, Literal, Optional, Union
 
 from app.models import (
     LoanRequest, LoanResponse, CategoryInfo,
-    SaveSimulationRequest, SaveSimulationResponse, SimulationHistory
+    SaveSimulationRequest, SaveSimulationResponse, SimulationHistory, RateCacheStats,
+    LoanScenarioRequest, LoanScenarioGrid,
+    MaxAmountRequest, MaxAmountResponse, MinDurationRequest, MinDurationResponse,
+    ImpliedRateRequest, ImpliedRateResponse, SimulationFilters, SimulationPage, BulkSaveSimulationResponse,
+    SimulationAnalytics
 )
 from app.services.loan_service import loan_service
+from app.services.amortization_service import amortization_service
+from app.services.scenario_service import scenario_service
+from app.services.affordability_service import affordability_service
 from app.services.interest_rate_client import interest_rate_client
+from app.services.rate_transport import RateEngineUnavailable
 from app.services.simulation_service import simulation_service
-from app.database import get_db
+from app.services.simulation_writer import simulation_writer
+from app.config import settings
+from app.database import get_db, get_read_db
+from common.http_cache import PayloadCache
 
 router = APIRouter()
 
+SCHEDULE_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Catégories sérialisées une fois par version de la copie locale de l'API Interest Rate
+category_payloads = PayloadCache(cache_control="public, max-age=300")
+
+# Marqueur HTTP d'une réponse périmée (RFC 7234, section 5.5.1)
+STALE_WARNING = '110 - "Response is Stale"'
+
+
+def rate_engine_unavailable(error: RateEngineUnavailable) -> HTTPException:
+    """503 immédiat quand le service de taux est indisponible et qu'aucun dernier taux connu ne peut être servi"""
+    retry_after = math.ceil(interest_rate_client.breaker.retry_after())
+    headers = {"Retry-After": str(retry_after)} if retry_after else None
+    return HTTPException(status_code=503, detail=str(error), headers=headers)
+
 
 @router.post(
     "/calculate-loan",
@@ -22,7 +51,8 @@ router = APIRouter()
     responses={
         200: {"description": "Calcul du prêt réalisé avec succès"},
         400: {"description": "Données d'entrée invalides"},
-        500: {"description": "Erreur interne du serveur"}
+        500: {"description": "Erreur interne du serveur"},
+        503: {"description": "Service de taux indisponible et aucun dernier taux connu pour ce profil"}
     }
 )
 async def calculate_loan(request: LoanRequest):
@@ -31,9 +61,182 @@ async def calculate_loan(request: LoanRequest):
         return response
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except RateEngineUnavailable as e:
+        raise rate_engine_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+
+@router.post(
+    "/calculate-loans",
+    response_model=List[LoanResponse],
+    summary="Calculer un lot de prêts immobiliers",
+    description="Calcule en un seul appel une liste de prêts (traitements de masse, 10 000 demandes au plus). Les résultats sont retournés dans l'ordre des demandes.",
+    responses={
+        200: {"description": "Calcul des prêts réalisé avec succès"},
+        400: {"description": "Données d'entrée invalides ou lot trop grand"},
+        500: {"description": "Erreur interne du serveur"},
+        503: {"description": "Service de taux indisponible et aucun dernier taux connu pour un des profils"}
+    }
+)
+async def calculate_loans(requests: List[LoanRequest]):
+    try:
+        responses = await loan_service.calculate_loans(requests)
+        return responses
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RateEngineUnavailable as e:
+        raise rate_engine_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+
+@router.post(
+    "/loan-scenarios",
+    response_model=LoanScenarioGrid,
+    summary="Comparer des scénarios de prêt",
+    description="Calcule en un seul appel la grille des mensualités, coûts totaux et intérêts pour toutes les combinaisons de montants, durées et taux (saisis ou déduits de profils clients).",
+    responses={
+        200: {"description": "Grille de scénarios calculée avec succès"},
+        400: {"description": "Données d'entrée invalides"},
+        500: {"description": "Erreur interne du serveur"},
+        503: {"description": "Service de taux indisponible et aucun dernier taux connu pour un des profils"}
+    }
+)
+async def calculate_loan_scenarios(request: LoanScenarioRequest):
+    try:
+        grid = await scenario_service.calculate_grid(request)
+        return grid
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RateEngineUnavailable as e:
+        raise rate_engine_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+
+@router.post(
+    "/affordability/max-amount",
+    response_model=List[MaxAmountResponse],
+    summary="Capacité d'emprunt",
+    description="Calcule, pour chaque demande, le montant maximal empruntable avec une mensualité, une durée et un taux (saisi ou déduit du profil client).",
+    responses={
+        200: {"description": "Capacités d'emprunt calculées avec succès"},
+        400: {"description": "Données d'entrée invalides"},
+        500: {"description": "Erreur interne du serveur"},
+        503: {"description": "Service de taux indisponible et aucun dernier taux connu pour un des profils"}
+    }
+)
+async def calculate_max_amounts(requests: List[MaxAmountRequest]):
+    try:
+        responses = await affordability_service.max_amounts(requests)
+        return responses
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RateEngineUnavailable as e:
+        raise rate_engine_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+
+@router.post(
+    "/affordability/min-duration",
+    response_model=List[MinDurationResponse],
+    summary="Durée minimale de remboursement",
+    description="Calcule, pour chaque demande, la durée minimale pour rembourser un montant avec une mensualité donnée et un taux (saisi ou déduit du profil client).",
+    responses={
+        200: {"description": "Durées minimales calculées avec succès"},
+        400: {"description": "Données d'entrée invalides"},
+        500: {"description": "Erreur interne du serveur"},
+        503: {"description": "Service de taux indisponible et aucun dernier taux connu pour un des profils"}
+    }
+)
+async def calculate_min_durations(requests: List[MinDurationRequest]):
+    try:
+        responses = await affordability_service.min_durations(requests)
+        return responses
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RateEngineUnavailable as e:
+        raise rate_engine_unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+
+@router.post(
+    "/affordability/implied-rate",
+    response_model=List[ImpliedRateResponse],
+    summary="Taux implicite",
+    description="Calcule, pour chaque demande, le taux annuel correspondant à une mensualité cible pour un montant et une durée.",
+    responses={
+        200: {"description": "Taux implicites calculés avec succès"},
+        400: {"description": "Données d'entrée invalides"},
+        500: {"description": "Erreur interne du serveur"}
+    }
+)
+async def calculate_implied_rates(requests: List[ImpliedRateRequest]):
+    try:
+        responses = affordability_service.implied_rates(requests)
+        return responses
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+
+@router.post(
+    "/amortization-schedule",
+    summary="Tableau d'amortissement d'un prêt",
+    description="Retourne en flux le tableau d'amortissement mois par mois (mensualité, part d'intérêts, part de capital, capital restant dû) au format NDJSON ou CSV.",
+    responses={
+        200: {
+            "description": "Tableau d'amortissement généré avec succès",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        },
+        400: {"description": "Données d'entrée invalides"},
+        500: {"description": "Erreur interne du serveur"},
+        503: {"description": "Service de taux indisponible et aucun dernier taux connu pour un des profils"}
+    }
+)
+async def get_amortization_schedule(request: LoanRequest, format: Literal["ndjson", "csv"] = "ndjson"):
+    return await _stream_schedules([request], format, with_loan_index=False)
+
+
+@router.post(
+    "/amortization-schedules",
+    summary="Tableaux d'amortissement d'un lot de prêts",
+    description="Retourne en flux les tableaux d'amortissement d'une liste de prêts au format NDJSON ou CSV. Chaque ligne porte l'index du prêt (loanIndex) dans la liste.",
+    responses={
+        200: {
+            "description": "Tableaux d'amortissement générés avec succès",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        },
+        400: {"description": "Données d'entrée invalides"},
+        500: {"description": "Erreur interne du serveur"},
+        503: {"description": "Service de taux indisponible et aucun dernier taux connu pour un des profils"}
+    }
+)
+async def get_amortization_schedules(requests: List[LoanRequest], format: Literal["ndjson", "csv"] = "ndjson"):
+    return await _stream_schedules(requests, format, with_loan_index=True)
+
+
+async def _stream_schedules(requests: List[LoanRequest], format: str, with_loan_index: bool) -> StreamingResponse:
+    try:
+        schedules, rate_stale = await amortization_service.resolve_schedules(requests)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RateEngineUnavailable as e:
+        raise rate_engine_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Erreur interne du serveur")
 
+    if format == "csv":
+        content = amortization_service.stream_csv(schedules, with_loan_index)
+    else:
+        content = amortization_service.stream_ndjson(schedules, with_loan_index)
+    # Flux de lignes sans enveloppe : un taux périmé est signalé par l'en-tête Warning
+    return _mark_stale(StreamingResponse(content, media_type=SCHEDULE_MEDIA_TYPES[format]), rate_stale)
+
 
 @router.get(
     "/age-categories",
@@ -42,13 +245,18 @@ async def calculate_loan(request: LoanRequest):
     description="Retourne la liste des catégories d'âge disponibles pour l'interface employé",
     responses={
         200: {"description": "Liste des catégories d'âge récupérée avec succès"},
-        500: {"description": "Erreur lors de la récupération des catégories"}
+        304: {"description": "Liste inchangée depuis la version détenue par le client"},
+        500: {"description": "Erreur lors de la récupération des catégories"},
+        503: {"description": "Service de taux indisponible et aucune liste encore chargée"}
     }
 )
-async def get_age_categories():
+async def get_age_categories(request: Request):
     try:
-        categories = await interest_rate_client.get_age_categories()
-        return categories
+        snapshot = await interest_rate_client.get_category_snapshot("age")
+        payload = category_payloads.get("age", snapshot.version, lambda: snapshot.categories)
+        return _mark_stale(payload.response(request), snapshot.stale)
+    except RateEngineUnavailable as e:
+        raise rate_engine_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération des catégories d'âge: {str(e)}")
 
@@ -60,30 +268,74 @@ async def get_age_categories():
     description="Retourne la liste des catégories professionnelles disponibles pour l'interface employé",
     responses={
         200: {"description": "Liste des catégories professionnelles récupérée avec succès"},
-        500: {"description": "Erreur lors de la récupération des catégories"}
+        304: {"description": "Liste inchangée depuis la version détenue par le client"},
+        500: {"description": "Erreur lors de la récupération des catégories"},
+        503: {"description": "Service de taux indisponible et aucune liste encore chargée"}
     }
 )
-async def get_professional_categories():
+async def get_professional_categories(request: Request):
     try:
-        categories = await interest_rate_client.get_professional_categories()
-        return categories
+        snapshot = await interest_rate_client.get_category_snapshot("professional")
+        payload = category_payloads.get("professional", snapshot.version, lambda: snapshot.categories)
+        return _mark_stale(payload.response(request), snapshot.stale)
+    except RateEngineUnavailable as e:
+        raise rate_engine_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération des catégories professionnelles: {str(e)}")
 
 
+def _mark_stale(response: Response, stale: bool) -> Response:
+    # Dernière copie connue servie pendant une indisponibilité de l'API Interest Rate
+    if stale:
+        response.headers["Warning"] = STALE_WARNING
+    return response
+
+
+@router.get(
+    "/interest-rate-cache/stats",
+    response_model=RateCacheStats,
+    summary="Statistiques du cache des taux",
+    description="Retourne les compteurs du cache des taux d'intérêt (succès, échecs, taille), ceux du regroupement des appels concurrents et la version de configuration associée",
+    responses={
+        200: {"description": "Statistiques récupérées avec succès"}
+    }
+)
+async def get_interest_rate_cache_stats():
+    return interest_rate_client.cache_stats()
+
+
 @router.post(
     "/save-simulation",
     response_model=SaveSimulationResponse,
     summary="Sauvegarder une simulation",
-    description="Sauvegarde une simulation de prêt en base de données pour l'employé",
+    description="Sauvegarde une simulation de prêt en base de données pour l'employé. "
+                "Mode `direct` : un commit par sauvegarde ; `grouped` : commit groupé avec les sauvegardes "
+                "concurrentes, l'ID est retourné une fois la simulation écrite ; `async` : la simulation est "
+                "acceptée (202) et écrite en arrière-plan, sans ID.",
     responses={
         200: {"description": "Simulation sauvegardée avec succès"},
+        202: {"description": "Simulation acceptée, sauvegarde en cours (mode async)"},
         400: {"description": "Données insuffisantes pour sauvegarder"},
         500: {"description": "Erreur lors de la sauvegarde"}
     }
 )
-async def save_simulation(request: SaveSimulationRequest, db: AsyncSession = Depends(get_db)):
+async def save_simulation(
+    request: SaveSimulationRequest,
+    mode: Optional[Literal["direct", "grouped", "async"]] = Query(
+        None, description="Mode de sauvegarde (par défaut : variable SAVE_SIMULATION_MODE)"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    mode = mode or settings.save_queue.default_mode
     try:
+        if mode == "grouped":
+            return await simulation_service.queue_simulation(request)
+        if mode == "async":
+            await simulation_service.queue_simulation(request, wait_for_commit=False)
+            return JSONResponse(
+                status_code=202,
+                content={"message": "Simulation acceptée, sauvegarde en cours", "pending": simulation_writer.pending}
+            )
         response = await simulation_service.save_simulation(request, db)
         return response
     except ValueError as e:
@@ -92,39 +344,221 @@ async def save_simulation(request: SaveSimulationRequest, db: AsyncSession = Dep
         raise HTTPException(status_code=500, detail=f"Erreur lors de la sauvegarde: {str(e)}")
 
 
+@router.post(
+    "/save-simulations",
+    response_model=BulkSaveSimulationResponse,
+    summary="Sauvegarder un lot de simulations",
+    description="Sauvegarde une liste de simulations en une seule transaction (synchronisation d'agences, migrations). Si une simulation est invalide, aucune n'est sauvegardée.",
+    responses={
+        200: {"description": "Simulations sauvegardées avec succès"},
+        400: {"description": "Données insuffisantes pour sauvegarder"},
+        500: {"description": "Erreur lors de la sauvegarde"}
+    }
+)
+async def save_simulations(requests: List[SaveSimulationRequest], db: AsyncSession = Depends(get_db)):
+    try:
+        response = await simulation_service.save_simulations(requests, db)
+        return response
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la sauvegarde: {str(e)}")
+
+
+def history_fields(
+    fields: Optional[str] = Query(
+        None, description="Champs à retourner, séparés par des virgules (ex. id,clientName,loanAmount) ; tous par défaut"
+    )
+) -> Optional[List[str]]:
+    try:
+        return simulation_service.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get(
     "/simulation-history",
-    response_model=List[SimulationHistory],
     summary="Historique des simulations",
     description="Récupère l'historique des simulations sauvegardées",
     responses={
-        200: {"description": "Historique récupéré avec succès"},
+        200: {
+            "model": List[SimulationHistory],
+            "description": "Historique récupéré avec succès ; avec fields, chaque simulation ne contient que les champs demandés"
+        },
+        400: {"description": "Champ inconnu dans le paramètre fields"},
         500: {"description": "Erreur lors de la récupération de l'historique"}
     }
 )
-async def get_simulation_history(limit: int = 50, db: AsyncSession = Depends(get_db)):
+async def get_simulation_history(
+    limit: int = 50,
+    fields: Optional[List[str]] = Depends(history_fields),
+    db: AsyncSession = Depends(get_read_db)
+):
     try:
-        history = await simulation_service.get_simulation_history(db, limit)
-        return history
+        # JSON produit directement depuis les lignes : pas de validation Pydantic par ligne
+        content = await simulation_service.get_simulation_history(db, limit, fields)
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération de l'historique: {str(e)}")
 
 
+def simulation_filters(
+    age_category: Optional[str] = Query(None, description="Catégorie d'âge"),
+    professional_category: Optional[str] = Query(None, description="Catégorie professionnelle"),
+    created_from: Optional[Union[datetime, date]] = Query(None, description="Créées à partir de cette date (incluse)"),
+    created_before: Optional[Union[datetime, date]] = Query(None, description="Créées avant cette date (exclue)"),
+    min_amount: Optional[float] = Query(None, description="Montant emprunté minimal"),
+    max_amount: Optional[float] = Query(None, description="Montant emprunté maximal"),
+    min_rate: Optional[float] = Query(None, description="Taux d'intérêt annuel minimal"),
+    max_rate: Optional[float] = Query(None, description="Taux d'intérêt annuel maximal"),
+    client: Optional[str] = Query(None, description="Début du nom ou du prénom du client (sans tenir compte des accents)")
+) -> SimulationFilters:
+    return SimulationFilters(
+        age_category=age_category,
+        professional_category=professional_category,
+        created_from=_as_datetime(created_from),
+        created_before=_as_datetime(created_before),
+        min_amount=min_amount,
+        max_amount=max_amount,
+        min_rate=min_rate,
+        max_rate=max_rate,
+        client=client
+    )
+
+
+def _as_datetime(value: Optional[Union[datetime, date]]) -> Optional[datetime]:
+    # Une date seule désigne minuit ce jour-là
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
+@router.get(
+    "/simulations",
+    response_model=SimulationPage,
+    summary="Rechercher dans l'historique des simulations",
+    description="Recherche paginée (par curseur) dans les simulations sauvegardées, avec filtres par catégorie, période, montant, taux et nom du client. Passer nextCursor dans le paramètre cursor pour obtenir la page suivante.",
+    responses={
+        200: {"description": "Page de simulations récupérée avec succès"},
+        400: {"description": "Curseur de pagination invalide"},
+        500: {"description": "Erreur lors de la récupération de l'historique"}
+    }
+)
+async def search_simulations(
+    limit: int = Query(50, ge=1, le=500, description="Nombre maximal de simulations par page"),
+    cursor: Optional[str] = Query(None, description="Curseur retourné par la page précédente"),
+    filters: SimulationFilters = Depends(simulation_filters),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        page = await simulation_service.search_simulations(db, filters, limit, cursor)
+        return page
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération de l'historique: {str(e)}")
+
+
+@router.get(
+    "/simulations/search",
+    response_model=List[SimulationHistory],
+    summary="Rechercher un client dans les simulations",
+    description="Recherche plein texte par nom et prénom du client : chaque mot est un début de nom, sans tenir compte de la casse ni des accents (« elo dup » trouve « Élodie Dupont »). Les simulations les plus pertinentes, puis les plus récentes, sont retournées en premier.",
+    responses={
+        200: {"description": "Simulations correspondantes"},
+        400: {"description": "Recherche vide"},
+        500: {"description": "Erreur lors de la recherche"}
+    }
+)
+async def search_clients(
+    q: str = Query(..., min_length=1, description="Nom et/ou prénom du client (début de mot)"),
+    limit: int = Query(20, ge=1, le=200, description="Nombre maximal de simulations"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        return await simulation_service.search_clients(db, q, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la recherche: {str(e)}")
+
+
+@router.get(
+    "/simulations/export",
+    summary="Exporter les simulations sauvegardées",
+    description="Exporte toutes les simulations, ou celles qui correspondent aux filtres, en NDJSON (une simulation par ligne) ou en CSV. Le flux est lu en base par blocs : la mémoire utilisée ne dépend pas du nombre de simulations exportées.",
+    responses={
+        200: {
+            "description": "Flux des simulations, de la plus ancienne à la plus récente",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        },
+        400: {"description": "Filtres incohérents (borne minimale supérieure à la borne maximale)"},
+        500: {"description": "Erreur lors de la préparation de l'export"}
+    }
+)
+async def export_simulations(
+    filters: SimulationFilters = Depends(simulation_filters),
+    format: Literal["ndjson", "csv"] = "ndjson"
+):
+    try:
+        content = simulation_service.export_simulations(filters, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors de l'export des simulations: {str(e)}")
+    return StreamingResponse(
+        content,
+        media_type=SCHEDULE_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="simulations.{format}"'}
+    )
+
+
+@router.get(
+    "/simulations/analytics",
+    response_model=SimulationAnalytics,
+    summary="Statistiques sur les simulations sauvegardées",
+    description="Nombre de simulations, volume emprunté, taux moyen/min/max et percentiles des montants, calculés en base sur les simulations filtrées. group_by (répétable) ventile par catégorie d'âge et/ou professionnelle, period par jour, semaine, mois ou année.",
+    responses={
+        200: {"description": "Statistiques calculées avec succès"},
+        500: {"description": "Erreur lors du calcul des statistiques"}
+    }
+)
+async def get_simulation_analytics(
+    filters: SimulationFilters = Depends(simulation_filters),
+    group_by: List[Literal["age_category", "professional_category"]] = Query(
+        [], description="Regroupement par catégorie (répétable)"
+    ),
+    period: Optional[Literal["day", "week", "month", "year"]] = Query(None, description="Regroupement par période"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        return await simulation_service.get_analytics(db, filters, list(dict.fromkeys(group_by)), period)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors du calcul des statistiques: {str(e)}")
+
+
 @router.get(
     "/simulation/{simulation_id}",
-    response_model=SimulationHistory,
     summary="Détail d'une simulation",
     description="Récupère le détail d'une simulation par son ID",
     responses={
-        200: {"description": "Simulation récupérée avec succès"},
+        200: {
+            "model": SimulationHistory,
+            "description": "Simulation récupérée avec succès ; avec fields, seuls les champs demandés sont présents"
+        },
+        400: {"description": "Champ inconnu dans le paramètre fields"},
         404: {"description": "Simulation non trouvée"},
         500: {"description": "Erreur lors de la récupération"}
     }
 )
-async def get_simulation_by_id(simulation_id: int, db: AsyncSession = Depends(get_db)):
+async def get_simulation_by_id(
+    simulation_id: int,
+    fields: Optional[List[str]] = Depends(history_fields),
+    db: AsyncSession = Depends(get_read_db)
+):
     try:
-        simulation = await simulation_service.get_simulation_by_id(simulation_id, db)
-        return simulation
+        content = await simulation_service.get_simulation_by_id(simulation_id, db, fields)
+        return Response(content=content, media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -135,37 +569,52 @@ async def get_simulation_by_id(simulation_id: int, db: AsyncSession = Depends(ge
 
 @router.get(
     "/saved-simulations",
-    response_model=List[SimulationHistory],
     summary="Simulations sauvegardées (alias)",
     description="Alias pour /simulation-history - pour compatibilité frontend",
     responses={
-        200: {"description": "Historique récupéré avec succès"},
+        200: {
+            "model": List[SimulationHistory],
+            "description": "Historique récupéré avec succès ; avec fields, chaque simulation ne contient que les champs demandés"
+        },
+        400: {"description": "Champ inconnu dans le paramètre fields"},
         500: {"description": "Erreur lors de la récupération de l'historique"}
     }
 )
-async def get_saved_simulations(limit: int = 50, db: AsyncSession = Depends(get_db)):
+async def get_saved_simulations(
+    limit: int = 50,
+    fields: Optional[List[str]] = Depends(history_fields),
+    db: AsyncSession = Depends(get_read_db)
+):
     try:
-        history = await simulation_service.get_simulation_history(db, limit)
-        return history
+        # JSON produit directement depuis les lignes : pas de validation Pydantic par ligne
+        content = await simulation_service.get_simulation_history(db, limit, fields)
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération de l'historique: {str(e)}")
 
 
 @router.get(
     "/saved-simulations/{simulation_id}",
-    response_model=SimulationHistory,
     summary="Détail d'une simulation sauvegardée (alias)",
     description="Alias pour /simulation/{id} - pour compatibilité frontend",
     responses={
-        200: {"description": "Simulation récupérée avec succès"},
+        200: {
+            "model": SimulationHistory,
+            "description": "Simulation récupérée avec succès ; avec fields, seuls les champs demandés sont présents"
+        },
+        400: {"description": "Champ inconnu dans le paramètre fields"},
         404: {"description": "Simulation non trouvée"},
         500: {"description": "Erreur lors de la récupération"}
     }
 )
-async def get_saved_simulation_by_id(simulation_id: int, db: AsyncSession = Depends(get_db)):
+async def get_saved_simulation_by_id(
+    simulation_id: int,
+    fields: Optional[List[str]] = Depends(history_fields),
+    db: AsyncSession = Depends(get_read_db)
+):
     try:
-        simulation = await simulation_service.get_simulation_by_id(simulation_id, db)
-        return simulation
+        content = await simulation_service.get_simulation_by_id(simulation_id, db, fields)
+        return Response(content=content, media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
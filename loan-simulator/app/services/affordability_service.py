@@ -0,0 +1,90 @@
+from typing import List
+
+import numpy as np
+
+from app.models import (
+    MaxAmountRequest, MaxAmountResponse, MinDurationRequest, MinDurationResponse,
+    ImpliedRateRequest, ImpliedRateResponse
+)
+from app.services.annuity import max_loan_amounts, min_duration_months, implied_annual_rates, loan_totals
+from app.services.loan_service import loan_service
+
+
+class AffordabilityService:
+    """Problèmes inverses de l'annuité, résolus sur des lots entiers de demandes"""
+
+    async def max_amounts(self, requests: List[MaxAmountRequest]) -> List[MaxAmountResponse]:
+        """Montant maximal empruntable pour une mensualité, une durée et un taux"""
+        lookups = await loan_service.resolve_rate_lookups(requests)
+        rates = np.array([lookup.rate for lookup in lookups], dtype=np.float64)
+        budgets = np.array([request.monthly_budget for request in requests], dtype=np.float64)
+        durations = np.array([request.duration_years for request in requests], dtype=np.float64)
+
+        amounts = max_loan_amounts(budgets, rates, durations)
+        total_costs = budgets * durations * 12
+
+        return [
+            MaxAmountResponse(
+                monthly_budget=request.monthly_budget,
+                duration_years=request.duration_years,
+                annual_interest_rate=round(rate, 2),
+                max_amount=round(amount, 2),
+                total_interest=round(total_cost - amount, 2),
+                total_cost=round(total_cost, 2),
+                rate_stale=lookup.stale
+            )
+            for request, lookup, rate, amount, total_cost in zip(
+                requests, lookups, rates.tolist(), amounts.tolist(), total_costs.tolist()
+            )
+        ]
+
+    async def min_durations(self, requests: List[MinDurationRequest]) -> List[MinDurationResponse]:
+        """Durée minimale pour rembourser un montant avec une mensualité donnée"""
+        lookups = await loan_service.resolve_rate_lookups(requests)
+        rates = np.array([lookup.rate for lookup in lookups], dtype=np.float64)
+        amounts = np.array([request.amount for request in requests], dtype=np.float64)
+        budgets = np.array([request.monthly_budget for request in requests], dtype=np.float64)
+
+        months = min_duration_months(amounts, budgets, rates)
+        feasible = ~np.isnan(months)
+        years = np.where(feasible, np.ceil(months / 12), 1)
+        # Les prêts sont exprimés en années entières : mensualité réelle sur la durée arrondie
+        payments, _, _ = loan_totals(amounts, rates, years)
+
+        return [
+            MinDurationResponse(
+                amount=request.amount,
+                monthly_budget=request.monthly_budget,
+                annual_interest_rate=round(rate, 2),
+                feasible=is_feasible,
+                min_duration_months=int(month_count) if is_feasible else None,
+                min_duration_years=int(year_count) if is_feasible else None,
+                monthly_payment=round(payment, 2) if is_feasible else None,
+                rate_stale=lookup.stale
+            )
+            for request, lookup, rate, is_feasible, month_count, year_count, payment in zip(
+                requests, lookups, rates.tolist(), feasible.tolist(), months.tolist(), years.tolist(), payments.tolist()
+            )
+        ]
+
+    def implied_rates(self, requests: List[ImpliedRateRequest]) -> List[ImpliedRateResponse]:
+        """Taux annuel implicite d'une mensualité cible"""
+        rates = implied_annual_rates(
+            [request.amount for request in requests],
+            [request.monthly_payment for request in requests],
+            [request.duration_years for request in requests]
+        )
+
+        return [
+            ImpliedRateResponse(
+                amount=request.amount,
+                duration_years=request.duration_years,
+                monthly_payment=request.monthly_payment,
+                feasible=not np.isnan(rate),
+                annual_interest_rate=None if np.isnan(rate) else round(rate, 4)
+            )
+            for request, rate in zip(requests, rates.tolist())
+        ]
+
+
+affordability_service = AffordabilityService()
@@ -0,0 +1,55 @@
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from app.models import LoanRequest
+from app.services.annuity import amortization_chunks
+from app.services.loan_service import loan_service
+
+CSV_HEADER = "month,payment,interest,principal,remainingBalance"
+
+
+class AmortizationService:
+
+    async def resolve_schedules(self, requests: List[LoanRequest]) -> Tuple[List[tuple], bool]:
+        """Résout le taux de chaque demande avant le début du flux (les erreurs restent des 400 ou 503).
+
+        Retourne les tableaux à produire et un indicateur vrai si un des taux est le dernier connu.
+        """
+        lookups = await loan_service.resolve_rate_lookups(requests)
+        schedules = [(request.amount, lookup.rate, request.duration_years) for request, lookup in zip(requests, lookups)]
+        return schedules, any(lookup.stale for lookup in lookups)
+
+    def stream_ndjson(self, schedules: List[tuple], with_loan_index: bool = False) -> Iterator[str]:
+        """Produit le tableau d'amortissement au format NDJSON, un bloc de lignes à la fois"""
+        for loan_index, rows in self._iter_rows(schedules):
+            prefix = f'"loanIndex":{loan_index},' if with_loan_index else ""
+            yield "".join(
+                "{" + prefix + f'"month":{month},"payment":{payment},"interest":{interest},'
+                f'"principal":{principal},"remainingBalance":{balance}' + "}\n"
+                for month, payment, interest, principal, balance in rows
+            )
+
+    def stream_csv(self, schedules: List[tuple], with_loan_index: bool = False) -> Iterator[str]:
+        """Produit le tableau d'amortissement au format CSV, un bloc de lignes à la fois"""
+        yield ("loanIndex," if with_loan_index else "") + CSV_HEADER + "\n"
+        for loan_index, rows in self._iter_rows(schedules):
+            prefix = f"{loan_index}," if with_loan_index else ""
+            yield "".join(
+                f"{prefix}{month},{payment},{interest},{principal},{balance}\n"
+                for month, payment, interest, principal, balance in rows
+            )
+
+    def _iter_rows(self, schedules: List[tuple]) -> Iterator[tuple]:
+        for loan_index, (amount, rate, duration_years) in enumerate(schedules):
+            for months, payments, interests, principals, balances in amortization_chunks(amount, rate, duration_years):
+                yield loan_index, zip(
+                    months.tolist(),
+                    np.round(payments, 2).tolist(),
+                    np.round(interests, 2).tolist(),
+                    np.round(principals, 2).tolist(),
+                    np.round(balances, 2).tolist()
+                )
+
+
+amortization_service = AmortizationService()
@@ -0,0 +1,176 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def monthly_payments(amounts, annual_interest_rates, durations_years) -> np.ndarray:
+    """Calcule les mensualités (formule d'annuité) en une seule passe vectorisée.
+
+    Les trois paramètres acceptent des scalaires ou des tableaux compatibles
+    par broadcasting NumPy ; le résultat a la forme du broadcast.
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    monthly_rates = np.asarray(annual_interest_rates, dtype=np.float64) / 100 / 12
+    number_of_payments = np.asarray(durations_years, dtype=np.float64) * 12
+
+    amounts, monthly_rates, number_of_payments = np.broadcast_arrays(amounts, monthly_rates, number_of_payments)
+
+    growth = np.power(1 + monthly_rates, number_of_payments)
+    zero_rate = monthly_rates == 0
+
+    # Les lignes à taux nul sont remboursées linéairement ; on neutralise leur
+    # dénominateur pour éviter une division par zéro dans la branche annuité.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = amounts * (monthly_rates * growth) / np.where(zero_rate, 1.0, growth - 1)
+
+    return np.where(zero_rate, amounts / number_of_payments, annuity)
+
+
+def loan_totals(amounts, annual_interest_rates, durations_years):
+    """Retourne (mensualités, coût total, intérêts totaux) sous forme de tableaux."""
+    payments = monthly_payments(amounts, annual_interest_rates, durations_years)
+    total_costs = payments * (np.asarray(durations_years, dtype=np.float64) * 12)
+    total_interests = total_costs - np.asarray(amounts, dtype=np.float64)
+    return payments, total_costs, total_interests
+
+
+def single_loan_totals(amount: float, annual_interest_rate: float, duration_years: int) -> Tuple[float, float, float]:
+    """loan_totals pour un seul prêt, en flottants Python.
+
+    Même formule et mêmes cas (taux nul) que monthly_payments ; pour un prêt isolé,
+    le coût fixe des appels NumPy dépasserait largement celui du calcul.
+    """
+    monthly_rate = annual_interest_rate / 100 / 12
+    number_of_payments = duration_years * 12
+    if monthly_rate == 0:
+        payment = amount / number_of_payments
+    else:
+        growth = (1 + monthly_rate) ** number_of_payments
+        payment = amount * (monthly_rate * growth) / (growth - 1)
+    total_cost = payment * number_of_payments
+    return payment, total_cost, total_cost - amount
+
+
+def amortization_chunks(amount: float, annual_interest_rate: float, duration_years: int, chunk_months: int = 120):
+    """Génère le tableau d'amortissement par blocs de `chunk_months` mois.
+
+    Chaque bloc est un tuple de tableaux (mois, mensualité, part d'intérêts,
+    part de capital, capital restant dû) calculés en forme fermée, si bien
+    qu'aucun bloc ne dépend du précédent et que le tableau complet n'est
+    jamais matérialisé.
+    """
+    monthly_rate = annual_interest_rate / 100 / 12
+    number_of_payments = duration_years * 12
+    payment = float(monthly_payments(amount, annual_interest_rate, duration_years))
+    growth = 1 + monthly_rate
+
+    for first_month in range(1, number_of_payments + 1, chunk_months):
+        months = np.arange(first_month, min(first_month + chunk_months, number_of_payments + 1))
+        paid_before = months - 1
+
+        # Capital restant dû après k mensualités : P(1+r)^k - M((1+r)^k - 1)/r, ou P - kM à taux nul
+        if monthly_rate == 0:
+            balances_before = amount - payment * paid_before
+            balances_after = amount - payment * months
+        else:
+            growth_before = np.power(growth, paid_before)
+            growth_after = growth_before * growth
+            balances_before = amount * growth_before - payment * (growth_before - 1) / monthly_rate
+            balances_after = amount * growth_after - payment * (growth_after - 1) / monthly_rate
+
+        interests = balances_before * monthly_rate
+        principals = payment - interests
+        # Absorbe l'erreur d'arrondi flottant sur la dernière échéance
+        balances_after = np.where(months == number_of_payments, 0.0, np.maximum(balances_after, 0.0))
+
+        yield months, np.full(months.shape, payment), interests, principals, balances_after
+
+
+def max_loan_amounts(monthly_budgets, annual_interest_rates, durations_years) -> np.ndarray:
+    """Montant maximal empruntable pour une mensualité donnée (inverse fermé de l'annuité)."""
+    budgets = np.asarray(monthly_budgets, dtype=np.float64)
+    monthly_rates = np.asarray(annual_interest_rates, dtype=np.float64) / 100 / 12
+    number_of_payments = np.asarray(durations_years, dtype=np.float64) * 12
+
+    zero_rate = monthly_rates == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = budgets * (1 - np.power(1 + monthly_rates, -number_of_payments)) / monthly_rates
+    return np.where(zero_rate, budgets * number_of_payments, annuity)
+
+
+def min_duration_months(amounts, monthly_budgets, annual_interest_rates) -> np.ndarray:
+    """Nombre minimal de mensualités (arrondi au mois supérieur) pour rembourser un montant.
+
+    Retourne NaN lorsque la mensualité ne couvre pas les intérêts du premier mois.
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    budgets = np.asarray(monthly_budgets, dtype=np.float64)
+    monthly_rates = np.asarray(annual_interest_rates, dtype=np.float64) / 100 / 12
+
+    zero_rate = monthly_rates == 0
+    feasible = budgets > amounts * monthly_rates
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months = -np.log1p(-amounts * monthly_rates / budgets) / np.log1p(monthly_rates)
+    months = np.where(zero_rate, amounts / budgets, months)
+    # Tolérance pour qu'une durée exacte (ex. 240,000000002 mois) ne soit pas arrondie au mois suivant
+    months = np.ceil(months - 1e-6)
+    return np.where(feasible, months, np.nan)
+
+
+def implied_annual_rates(amounts, monthly_payments_target, durations_years,
+                         tolerance: float = 1e-10, max_iterations: int = 100) -> np.ndarray:
+    """Taux annuel (en %) correspondant à une mensualité cible, résolu par Newton sécurisé.
+
+    Chaque ligne conserve un encadrement [bas, haut] de son taux mensuel : le pas
+    de Newton est accepté s'il reste dans l'encadrement, sinon on bissecte. Le
+    calcul porte sur tout le lot à la fois. Retourne NaN lorsque la mensualité
+    est inférieure au remboursement du seul capital (taux négatif).
+    """
+    amounts, targets, number_of_payments = np.broadcast_arrays(
+        np.asarray(amounts, dtype=np.float64),
+        np.asarray(monthly_payments_target, dtype=np.float64),
+        np.asarray(durations_years, dtype=np.float64) * 12
+    )
+    # Les lignes actives sont suivies par indice à plat : calcul sur des copies 1-D, résultat remis en forme
+    shape = amounts.shape
+    amounts, targets, number_of_payments = (np.ravel(array) for array in (amounts, targets, number_of_payments))
+
+    linear_payments = amounts / number_of_payments
+    feasible = targets >= linear_payments * (1 - 1e-12)
+
+    # La mensualité croît avec le taux et dépasse amount * r : r = target / amount majore la solution
+    low = np.zeros_like(amounts)
+    high = targets / amounts
+    # Point de départ : développement limité de l'annuité au voisinage de r = 0
+    rates = np.clip(2 * (targets / linear_payments - 1) / (number_of_payments + 1), 0, high)
+
+    active = feasible & (targets > linear_payments)
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+
+        r = rates[active]
+        n = number_of_payments[active]
+        p = amounts[active]
+        growth = np.power(1 + r, n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            payment = np.where(r > 0, p * r * growth / (growth - 1), p / n)
+            derivative = p * (growth * (growth - 1) - r * n * growth / (1 + r)) / (growth - 1) ** 2
+        residual = payment - targets[active]
+
+        # Resserre l'encadrement selon le signe du résidu
+        low[active] = np.where(residual < 0, r, low[active])
+        high[active] = np.where(residual > 0, r, high[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = r - residual / derivative
+        bisection = (low[active] + high[active]) / 2
+        in_bracket = np.isfinite(newton) & (newton > low[active]) & (newton < high[active])
+        rates[active] = np.where(in_bracket, newton, bisection)
+
+        converged = np.abs(residual) <= tolerance * targets[active]
+        still_active = np.flatnonzero(active)[~converged]
+        active = np.zeros_like(active)
+        active[still_active] = True
+
+    return np.where(feasible, rates * 12 * 100, np.nan).reshape(shape)
@@ -0,0 +1,80 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+# En deçà, le percentile observé n'est pas jugé fiable : pas de relance
+MIN_LATENCY_SAMPLES = 20
+
+
+class HedgePolicy:
+    """Relance un appel idempotent resté sans réponse au-delà du percentile de latence observé.
+
+    La première réponse reçue est retenue et l'autre appel est annulé : une instance lente ne
+    retient plus la requête que le temps du délai de relance.
+    """
+
+    def __init__(self, percentile: float, min_delay: float, fixed_delay: float = 0.0, window: int = 256):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        # Délai fixe en secondes ; 0 = délai déduit des latences observées
+        self.fixed_delay = fixed_delay
+        self.window = window
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def delay(self, operation: str) -> Optional[float]:
+        if self.fixed_delay > 0:
+            return self.fixed_delay
+        samples = self._latencies.get(operation)
+        if samples is None or len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        rank = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(ordered[rank], self.min_delay)
+
+    def record(self, operation: str, seconds: float) -> None:
+        samples = self._latencies.get(operation)
+        if samples is None:
+            samples = self._latencies[operation] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    async def call(self, operation: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        delay = self.delay(operation)
+        started = {}
+        first = self._attempt(call, started)
+        tasks = {first}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    self.hedged += 1
+                    tasks.add(self._attempt(call, started))
+
+            pending = tasks
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.record(operation, time.monotonic() - started[task])
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            # Tous les appels ont échoué : on remonte la dernière erreur reçue
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _attempt(call: Callable[[], Awaitable[Any]], started: dict) -> asyncio.Task:
+        task = asyncio.ensure_future(call())
+        started[task] = time.monotonic()
+        return task
+
+    def stats(self) -> dict:
+        return {"hedged": self.hedged, "hedge_wins": self.hedge_wins}
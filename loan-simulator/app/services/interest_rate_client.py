@@ -1,85 +1,349 @@
-import httpx
 import asyncio
-from typing import List, Optional
+import hashlib
+import json
+import math
+import time
+from bisect import bisect_right
+from typing import Dict, List, Optional
+from app import metrics
+from app.config import InterestRateClientConfig, settings
 from app.models import CategoryInfo
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.hedging import HedgePolicy
+from app.services.rate_cache import TTLCache
+from app.services.rate_transport import CATEGORY_SOURCES, RateEngineUnavailable, RateTransport, create_transport
+from app.services.single_flight import SingleFlight
+
+
+class CategorySnapshot:
+    """Copie locale d'une liste de catégories de l'API Interest Rate"""
+
+    def __init__(self, categories: List[CategoryInfo], etag: Optional[str], version: int):
+        self.categories = categories
+        self.etag = etag
+        self.version = version
+        # Horodatage du premier rafraîchissement échoué, tant que l'API reste indisponible
+        self.stale_since: Optional[float] = None
+
+    @property
+    def stale(self) -> bool:
+        return self.stale_since is not None
+
+
+class RateLookup:
+    """Taux fourni par le moteur de taux, ou dernier taux connu (périmé) pendant une indisponibilité"""
+
+    def __init__(self, rate: float, stale_since: Optional[float] = None):
+        self.rate = rate
+        self.stale_since = stale_since
+
+    @property
+    def stale(self) -> bool:
+        return self.stale_since is not None
 
 
 class InterestRateClient:
-    def __init__(self, base_url: str = "http://localhost:8081"):
-        self.base_url = base_url
-        self.timeout = 10.0
+
+    def __init__(self, base_url: Optional[str] = None, config: InterestRateClientConfig = settings.interest_rate_client,
+                 transport: Optional[RateTransport] = None):
+        self.config = config
+        # HTTP par défaut ; moteur embarqué dans le processus si INTEREST_RATE_TRANSPORT=embedded
+        self.transport = transport or create_transport(config, base_url)
+
+        # Le taux ne dépend que des catégories et de la tranche de revenu : on le met en cache
+        # sur ces critères, et on vide le cache dès que la configuration distante change
+        self.rate_cache = TTLCache(maxsize=config.rate_cache_size, ttl=config.rate_cache_ttl)
+        self.config_version: Optional[str] = None
+        # Incrémenté à chaque vidage du cache : un taux demandé avant le vidage n'y est pas remis
+        self._cache_generation = 0
+        self._income_bounds: Optional[List[float]] = None
+        self._config_checked_at: Optional[float] = None
+        self._config_lock = asyncio.Lock()
+
+        # Les demandes concurrentes identiques (taux ou catégories) partagent un seul appel au moteur de taux
+        self._flights = SingleFlight()
+
+        # Protection contre une API lente ou en panne : relance au-delà du p95, disjoncteur,
+        # et derniers taux connus servis comme périmés tant que l'API est indisponible
+        self.hedging = HedgePolicy(
+            percentile=config.hedge_percentile,
+            min_delay=config.hedge_min_delay_ms / 1000,
+            fixed_delay=config.hedge_delay_ms / 1000
+        )
+        self.breaker = CircuitBreaker(config.breaker_failure_threshold, config.breaker_reset_timeout)
+        self._last_known_rates = TTLCache(maxsize=config.stale_rate_cache_size, ttl=float("inf"))
+        self._last_known_version: Optional[str] = None
+        self._last_known_bounds: Optional[List[float]] = None
+        self.stale_served = 0
+
+        # Les catégories sont statiques : copie en mémoire rafraîchie en arrière-plan par GET conditionnel
+        self._category_snapshots: Dict[str, CategorySnapshot] = {}
+        self._category_refresh_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Ouvre l'accès au moteur de taux (appelé au démarrage de l'application)"""
+        await self.transport.start()
+        if self._category_refresh_task is None and self.config.category_refresh_interval > 0:
+            self._category_refresh_task = asyncio.create_task(self._refresh_categories_periodically())
+
+    async def close(self) -> None:
+        """Ferme l'accès au moteur de taux et libère les connexions du pool"""
+        if self._category_refresh_task is not None:
+            self._category_refresh_task.cancel()
+            try:
+                await self._category_refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._category_refresh_task = None
+        await self.transport.close()
 
     async def get_age_categories(self) -> List[CategoryInfo]:
         """Récupère les catégories d'âge depuis l'API Interest Rate"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(f"{self.base_url}/api/interest-rate/categories/age")
-                response.raise_for_status()
-
-                categories_data = response.json()
-                categories = []
-
-                for cat_data in categories_data:
-                    categories.append(CategoryInfo(
-                        code=cat_data["code"],  # Enum value for API calls
-                        name=cat_data["description"],
-                        description=cat_data.get("age_range", ""),
-                        rate_modifier=cat_data["rate_modifier"]
-                    ))
-
-                return categories
-            except httpx.RequestError as e:
-                raise Exception(f"Erreur de connexion à l'API Interest Rate: {e}")
-            except httpx.HTTPStatusError as e:
-                raise Exception(f"Erreur HTTP lors de la récupération des catégories d'âge: {e.response.status_code}")
+        return (await self.get_category_snapshot("age")).categories
 
     async def get_professional_categories(self) -> List[CategoryInfo]:
         """Récupère les catégories professionnelles depuis l'API Interest Rate"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(f"{self.base_url}/api/interest-rate/categories/professional")
-                response.raise_for_status()
-
-                categories_data = response.json()
-                categories = []
-
-                for cat_data in categories_data:
-                    categories.append(CategoryInfo(
-                        code=cat_data["code"],  # Enum value for API calls
-                        name=cat_data["name"],
-                        description=cat_data["description"],
-                        rate_modifier=cat_data["rate_modifier"]
-                    ))
-
-                return categories
-            except httpx.RequestError as e:
-                raise Exception(f"Erreur de connexion à l'API Interest Rate: {e}")
-            except httpx.HTTPStatusError as e:
-                raise Exception(f"Erreur HTTP lors de la récupération des catégories professionnelles: {e.response.status_code}")
+        return (await self.get_category_snapshot("professional")).categories
+
+    async def get_category_snapshot(self, kind: str) -> CategorySnapshot:
+        """Retourne la copie locale des catégories, chargée depuis l'API au premier appel"""
+        snapshot = self._category_snapshots.get(kind)
+        if snapshot is None:
+            snapshot = await self._refresh_categories(kind)
+        return snapshot
+
+    async def _refresh_categories(self, kind: str) -> CategorySnapshot:
+        return await self._flights.run(("categories", kind), lambda: self._fetch_categories(kind))
+
+    async def _fetch_categories(self, kind: str) -> CategorySnapshot:
+        current = self._category_snapshots.get(kind)
+        try:
+            fetched = await self._call_upstream(
+                "categories", lambda: self.transport.get_categories(kind, current.etag if current is not None else None)
+            )
+        except RateEngineUnavailable:
+            if current is None:
+                raise
+            # On continue de servir la dernière copie, marquée comme périmée
+            if current.stale_since is None:
+                current.stale_since = time.time()
+            return current
+
+        if fetched is None:
+            current.stale_since = None
+            return current
+
+        categories_data, etag = fetched
+        snapshot = CategorySnapshot(
+            categories=self._parse_categories(kind, categories_data),
+            etag=etag,
+            version=current.version + 1 if current is not None else 1
+        )
+        self._category_snapshots[kind] = snapshot
+        return snapshot
+
+    async def _refresh_categories_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.category_refresh_interval)
+            for kind in CATEGORY_SOURCES:
+                try:
+                    await self._refresh_categories(kind)
+                except Exception:
+                    # On conserve la dernière copie connue ; nouvelle tentative au prochain cycle
+                    pass
+
+    @staticmethod
+    def _parse_categories(kind: str, categories_data: list) -> List[CategoryInfo]:
+        if kind == "age":
+            return [
+                CategoryInfo(
+                    code=cat_data["code"],  # Enum value for API calls
+                    name=cat_data["description"],
+                    description=cat_data.get("age_range", ""),
+                    rate_modifier=cat_data["rate_modifier"]
+                )
+                for cat_data in categories_data
+            ]
+        return [
+            CategoryInfo(
+                code=cat_data["code"],  # Enum value for API calls
+                name=cat_data["name"],
+                description=cat_data["description"],
+                rate_modifier=cat_data["rate_modifier"]
+            )
+            for cat_data in categories_data
+        ]
 
     async def calculate_interest_rate(self, age_category: str, professional_category: str, monthly_net_income: float) -> float:
-        """Calcule le taux d'intérêt via l'API Interest Rate"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        """Calcule le taux d'intérêt via l'API Interest Rate, en s'appuyant sur le cache des taux"""
+        return (await self.get_interest_rate(age_category, professional_category, monthly_net_income)).rate
+
+    async def get_interest_rate(self, age_category: str, professional_category: str, monthly_net_income: float) -> RateLookup:
+        """Comme calculate_interest_rate, en indiquant si le taux est le dernier connu faute d'API disponible"""
+        try:
+            return RateLookup(await self._current_interest_rate(age_category, professional_category, monthly_net_income))
+        except RateEngineUnavailable:
+            last_known = self._last_known_rates.get(
+                self._last_known_key(age_category, professional_category, monthly_net_income)
+            )
+            if last_known is None:
+                raise
+            self.stale_served += 1
+            rate, fetched_at = last_known
+            return RateLookup(rate, stale_since=fetched_at)
+
+    async def _current_interest_rate(self, age_category: str, professional_category: str, monthly_net_income: float) -> float:
+        if not self.rate_cache.enabled:
+            key = self._rate_cache_key(age_category, professional_category, monthly_net_income)
+            return await self._flights.run(
+                ("rate", key), lambda: self._fetch_interest_rate(age_category, professional_category, monthly_net_income)
+            )
+
+        await self._check_config_version()
+
+        key = self._rate_cache_key(age_category, professional_category, monthly_net_income)
+        rate = self.rate_cache.get(key)
+        if rate is None:
+            # La version fait partie de la clé : un appel lancé avant un changement de grille n'est pas partagé après
+            rate = await self._flights.run(
+                ("rate", self.config_version, key),
+                lambda: self._fetch_and_cache_rate(key, age_category, professional_category, monthly_net_income)
+            )
+        return rate
+
+    async def _fetch_and_cache_rate(self, key: tuple, age_category: str, professional_category: str,
+                                    monthly_net_income: float) -> float:
+        generation = self._cache_generation
+        rate = await self._fetch_interest_rate(age_category, professional_category, monthly_net_income)
+        # La grille a pu changer pendant l'appel : un taux de l'ancienne grille ne doit pas repeupler le cache
+        if generation == self._cache_generation:
+            self.rate_cache.set(key, rate)
+        return rate
+
+    async def _fetch_interest_rate(self, age_category: str, professional_category: str, monthly_net_income: float) -> float:
+        """Calcule le taux d'intérêt via le moteur de taux (API Interest Rate ou moteur embarqué)"""
+        version = self._last_known_version
+        rate = await self._call_upstream(
+            "rate", lambda: self.transport.calculate_interest_rate(age_category, professional_category, monthly_net_income)
+        )
+        if version == self._last_known_version:
+            self._last_known_rates.set(
+                self._last_known_key(age_category, professional_category, monthly_net_income), (rate, time.time())
+            )
+        return rate
+
+    async def _call_upstream(self, operation: str, call):
+        """Appelle le moteur de taux derrière le disjoncteur, avec relance si l'appel tarde (API distante)"""
+        if not self.breaker.allow_request():
+            metrics.rate_engine_errors.labels(operation, "circuit_open").inc()
+            raise RateEngineUnavailable(
+                "Service de calcul des taux momentanément indisponible, "
+                f"nouvel essai dans {math.ceil(self.breaker.retry_after())} s"
+            )
+        started = time.perf_counter()
+        try:
+            if self.transport.remote and self.config.hedge_enabled:
+                result = await self.hedging.call(operation, call)
+            else:
+                result = await call()
+        except RateEngineUnavailable:
+            self.breaker.record_failure()
+            self._observe_call(operation, "unavailable", started)
+            raise
+        except Exception:
+            # L'API a répondu (demande refusée) : elle est disponible
+            self.breaker.record_success()
+            self._observe_call(operation, "rejected", started)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        self._observe_call(operation, "success", started)
+        return result
+
+    @staticmethod
+    def _observe_call(operation: str, outcome: str, started: float) -> None:
+        metrics.rate_engine_call_duration.labels(operation, outcome).observe(time.perf_counter() - started)
+        if outcome != "success":
+            metrics.rate_engine_errors.labels(operation, outcome).inc()
+
+    def cache_stats(self) -> dict:
+        """Retourne les compteurs du cache des taux"""
+        flights = self._flights.stats()
+        return {
+            **self.rate_cache.stats(),
+            "config_version": self.config_version,
+            "upstream_calls": flights["calls"],
+            "coalesced": flights["coalesced"],
+            "in_flight": flights["in_flight"],
+            "circuit_state": self.breaker.state,
+            "hedged_requests": self.hedging.hedged,
+            "stale_served": self.stale_served
+        }
+
+    def _rate_cache_key(self, age_category: str, professional_category: str, monthly_net_income: float) -> tuple:
+        # Sans seuils connus (configuration indisponible), on se rabat sur le revenu exact
+        if self._income_bounds is None:
+            return age_category, professional_category, monthly_net_income
+        return age_category, professional_category, bisect_right(self._income_bounds, monthly_net_income)
+
+    def _last_known_key(self, age_category: str, professional_category: str, monthly_net_income: float) -> tuple:
+        # Tranches de la dernière configuration lue avec succès : elles restent valables pendant une panne
+        if self._last_known_bounds is None:
+            return age_category, professional_category, monthly_net_income
+        return age_category, professional_category, bisect_right(self._last_known_bounds, monthly_net_income)
+
+    async def _check_config_version(self) -> None:
+        """Relit la configuration distante à intervalle régulier et invalide le cache si elle a changé"""
+        if self._config_checked_at is not None and \
+                time.monotonic() - self._config_checked_at < self.config.config_check_interval:
+            return
+
+        async with self._config_lock:
+            # Une autre requête a pu effectuer la vérification pendant l'attente du verrou
+            if self._config_checked_at is not None and \
+                    time.monotonic() - self._config_checked_at < self.config.config_check_interval:
+                return
+
             try:
-                request_data = {
-                    "age_category": age_category,
-                    "professional_category": professional_category,
-                    "monthly_net_income": monthly_net_income
-                }
-
-                response = await client.post(
-                    f"{self.base_url}/api/interest-rate/calculate",
-                    json=request_data
-                )
-                response.raise_for_status()
+                remote_config = await self._call_upstream("config", self.transport.get_config)
+            except Exception:
+                # Configuration indisponible : on oublie les tranches pour ne pas servir de taux obsolète
+                self._income_bounds = None
+                self.config_version = None
+                self._clear_rate_cache()
+                self._config_checked_at = time.monotonic()
+                return
+
+            # Version publiée par l'API ; à défaut, empreinte de la configuration reçue
+            version = remote_config.get("version") or \
+                hashlib.sha256(json.dumps(remote_config, sort_keys=True).encode()).hexdigest()[:16]
+            if version != self.config_version:
+                self._clear_rate_cache()
+                self.config_version = version
+                self._income_bounds = self._income_bounds_from_config(remote_config)
+            if version != self._last_known_version:
+                # Nouvelle grille : les derniers taux connus ne lui correspondent plus
+                self._last_known_rates.clear()
+                self._last_known_version = version
+                self._last_known_bounds = self._income_bounds
+            self._config_checked_at = time.monotonic()
 
-                result = response.json()
-                return result["annual_interest_rate"]
+    def _clear_rate_cache(self) -> None:
+        self.rate_cache.clear()
+        self._cache_generation += 1
 
-            except httpx.RequestError as e:
-                raise Exception(f"Erreur de connexion à l'API Interest Rate: {e}")
-            except httpx.HTTPStatusError as e:
-                raise Exception(f"Erreur HTTP lors du calcul du taux d'intérêt: {e.response.status_code}")
+    @staticmethod
+    def _income_bounds_from_config(remote_config: dict) -> Optional[List[float]]:
+        # Le taux ne varie qu'aux bornes de tranche et aux bornes de revenu des modificateurs additionnels
+        try:
+            bounds = {float(band["below"]) for band in remote_config["income_bands"] if band.get("below") is not None}
+            for rule in remote_config.get("modifiers") or []:
+                bounds.update(float(rule[name]) for name in ("min_income", "max_income") if rule.get(name) is not None)
+        except (KeyError, TypeError, ValueError):
+            return None
+        return sorted(bounds)
 
 
 # Instance globale du client
@@ -1,6 +1,14 @@
-import math
-from app.models import LoanRequest, LoanResponse
-from app.services.interest_rate_client import interest_rate_client
+import asyncio
+from typing import List, Union
+
+from app.models import LoanRequest, LoanResponse, RateInputs
+from app.services.annuity import loan_totals, single_loan_totals
+from app.services.interest_rate_client import RateLookup, interest_rate_client
+
+# Demandes par lot (calculate-loans, capacités, durées, tableaux d'amortissement)
+MAX_BATCH_SIZE = 10_000
+# Profils dont le taux est demandé simultanément au moteur de taux lors d'un lot
+MAX_CONCURRENT_RATE_LOOKUPS = 20
 
 
 class LoanCalculationService:
@@ -8,41 +16,99 @@ class LoanCalculationService:
     async def calculate_loan(self, request: LoanRequest) -> LoanResponse:
         # Si les informations client sont fournies mais pas le taux, calculer automatiquement
         annual_interest_rate = request.annual_interest_rate
+        rate_stale = False
 
         if annual_interest_rate is None and self._is_employee_request(request):
             # Interface employé - calculer le taux automatiquement
-            annual_interest_rate = await interest_rate_client.calculate_interest_rate(
+            rate_lookup = await interest_rate_client.get_interest_rate(
                 age_category=request.age_category,
                 professional_category=request.professional_category,
                 monthly_net_income=request.monthly_net_income
             )
+            annual_interest_rate = rate_lookup.rate
+            rate_stale = rate_lookup.stale
         elif annual_interest_rate is None:
             raise ValueError("Le taux d'intérêt annuel est requis pour l'interface client")
 
-        monthly_rate = annual_interest_rate / 100 / 12
-        number_of_payments = request.duration_years * 12
-
-        if monthly_rate == 0:
-            monthly_payment = request.amount / number_of_payments
-        else:
-            monthly_payment = request.amount * (
-                monthly_rate * (1 + monthly_rate) ** number_of_payments
-            ) / (
-                (1 + monthly_rate) ** number_of_payments - 1
-            )
-
-        total_cost = monthly_payment * number_of_payments
-        total_interest = total_cost - request.amount
+        monthly_payment, total_cost, total_interest = single_loan_totals(
+            request.amount, annual_interest_rate, request.duration_years
+        )
 
         return LoanResponse(
             loan_amount=round(request.amount, 2),
             monthly_payment=round(monthly_payment, 2),
             total_interest=round(total_interest, 2),
             total_cost=round(total_cost, 2),
-            annual_interest_rate=round(annual_interest_rate, 2)
+            annual_interest_rate=round(annual_interest_rate, 2),
+            rate_stale=rate_stale
         )
 
-    def _is_employee_request(self, request: LoanRequest) -> bool:
+    async def calculate_loans(self, requests: List[LoanRequest]) -> List[LoanResponse]:
+        """Calcule un lot de prêts en une seule passe vectorisée"""
+        rate_lookups = await self.resolve_rate_lookups(requests)
+        annual_interest_rates = [lookup.rate for lookup in rate_lookups]
+
+        monthly_payments, total_costs, total_interests = loan_totals(
+            [request.amount for request in requests],
+            annual_interest_rates,
+            [request.duration_years for request in requests]
+        )
+
+        return [
+            LoanResponse(
+                loan_amount=round(request.amount, 2),
+                monthly_payment=round(float(monthly_payment), 2),
+                total_interest=round(float(total_interest), 2),
+                total_cost=round(float(total_cost), 2),
+                annual_interest_rate=round(lookup.rate, 2),
+                rate_stale=lookup.stale
+            )
+            for request, lookup, monthly_payment, total_cost, total_interest in zip(
+                requests, rate_lookups, monthly_payments, total_costs, total_interests
+            )
+        ]
+
+    async def resolve_interest_rates(self, requests: List[Union[LoanRequest, RateInputs]]) -> List[float]:
+        """Résout le taux de chaque demande, avec un seul appel distant par profil client"""
+        return [lookup.rate for lookup in await self.resolve_rate_lookups(requests)]
+
+    async def resolve_rate_lookups(self, requests: List[Union[LoanRequest, RateInputs]]) -> List[RateLookup]:
+        """Comme resolve_interest_rates, en indiquant pour chaque demande si le taux est périmé"""
+        if len(requests) > MAX_BATCH_SIZE:
+            raise ValueError(f"Le lot compte {len(requests)} demandes (maximum {MAX_BATCH_SIZE})")
+
+        profiles = {}
+        for index, request in enumerate(requests):
+            if request.annual_interest_rate is not None:
+                continue
+            if not self._is_employee_request(request):
+                raise ValueError(f"Le taux d'intérêt annuel est requis pour l'interface client (demande n°{index + 1})")
+            profiles.setdefault(
+                (request.age_category, request.professional_category, request.monthly_net_income), None
+            )
+
+        # Un lot aux profils tous différents ne doit pas ouvrir un appel par profil d'un coup
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_RATE_LOOKUPS)
+
+        async def lookup(age_category: str, professional_category: str, monthly_net_income: float) -> RateLookup:
+            async with semaphore:
+                return await interest_rate_client.get_interest_rate(
+                    age_category=age_category,
+                    professional_category=professional_category,
+                    monthly_net_income=monthly_net_income
+                )
+
+        rates = await asyncio.gather(*(lookup(*profile) for profile in profiles))
+        profile_rates = dict(zip(profiles, rates))
+
+        return [
+            RateLookup(request.annual_interest_rate)
+            if request.annual_interest_rate is not None
+            else profile_rates[(request.age_category, request.professional_category, request.monthly_net_income)]
+            for request in requests
+        ]
+
+    def _is_employee_request(self, request: Union[LoanRequest, RateInputs]) -> bool:
         """Détermine si c'est une requête de l'interface employé"""
         return (request.age_category is not None and
                 request.professional_category is not None and
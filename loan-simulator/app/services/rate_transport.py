@@ -0,0 +1,237 @@
+import importlib
+import importlib.util
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+import httpx
+
+from app.config import InterestRateClientConfig
+
+# Type de catégorie -> (chemin distant, libellé utilisé dans les messages d'erreur)
+CATEGORY_SOURCES = {
+    "age": ("/api/interest-rate/categories/age", "d'âge"),
+    "professional": ("/api/interest-rate/categories/professional", "professionnelles")
+}
+
+
+# Nom sous lequel le paquet `app` de l'API Interest Rate est importé en mode embarqué
+EMBEDDED_PACKAGE = "interest_rate_api"
+
+
+class RateEngineUnavailable(Exception):
+    """Moteur de taux injoignable, hors délai ou en erreur serveur : l'appel pourra être retenté"""
+
+
+class RateTransport(ABC):
+    """Accès au moteur de taux : par HTTP (déploiement séparé) ou en direct dans le même processus"""
+
+    # Appels réseau : sujets aux pannes et aux lenteurs d'une instance distante
+    remote = False
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def calculate_interest_rate(self, age_category: str, professional_category: str,
+                                      monthly_net_income: float) -> float:
+        ...
+
+    @abstractmethod
+    async def get_categories(self, kind: str, etag: Optional[str] = None) -> Optional[Tuple[list, Optional[str]]]:
+        """Retourne (catégories brutes, etag), ou None si la version détenue (etag) est toujours à jour"""
+
+    @abstractmethod
+    async def get_config(self) -> dict:
+        ...
+
+
+class HttpRateTransport(RateTransport):
+    """Appels à l'API Interest Rate via un client HTTP partagé et mutualisé"""
+
+    remote = True
+
+    def __init__(self, config: InterestRateClientConfig, base_url: Optional[str] = None):
+        self.config = config
+        self.base_url = base_url or config.base_url
+        self.timeout = config.timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = self._create_client()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Création paresseuse si le client est utilisé hors du cycle de vie de l'application (scripts, tests)
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(
+                self.timeout,
+                connect=self.config.connect_timeout,
+                pool=self.config.pool_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry
+            ),
+            http2=self.config.http2
+        )
+
+    async def calculate_interest_rate(self, age_category: str, professional_category: str,
+                                      monthly_net_income: float) -> float:
+        try:
+            request_data = {
+                "age_category": age_category,
+                "professional_category": professional_category,
+                "monthly_net_income": monthly_net_income
+            }
+
+            response = await self.client.post(
+                "/api/interest-rate/calculate",
+                json=request_data
+            )
+            response.raise_for_status()
+
+            result = response.json()
+            return result["annual_interest_rate"]
+
+        except httpx.RequestError as e:
+            raise RateEngineUnavailable(f"Erreur de connexion à l'API Interest Rate: {e}")
+        except httpx.HTTPStatusError as e:
+            raise _status_error(e, "Erreur HTTP lors du calcul du taux d'intérêt")
+
+    async def get_categories(self, kind: str, etag: Optional[str] = None) -> Optional[Tuple[list, Optional[str]]]:
+        path, label = CATEGORY_SOURCES[kind]
+        headers = {"If-None-Match": etag} if etag else {}
+
+        try:
+            response = await self.client.get(path, headers=headers)
+            if response.status_code == 304 and etag:
+                return None
+            response.raise_for_status()
+            return response.json(), response.headers.get("etag")
+        except httpx.RequestError as e:
+            raise RateEngineUnavailable(f"Erreur de connexion à l'API Interest Rate: {e}")
+        except httpx.HTTPStatusError as e:
+            raise _status_error(e, f"Erreur HTTP lors de la récupération des catégories {label}")
+
+    async def get_config(self) -> dict:
+        try:
+            response = await self.client.get("/api/interest-rate/config")
+            response.raise_for_status()
+            return response.json()
+        except httpx.RequestError as e:
+            raise RateEngineUnavailable(f"Erreur de connexion à l'API Interest Rate: {e}")
+        except httpx.HTTPStatusError as e:
+            raise _status_error(e, "Erreur HTTP lors de la lecture de la configuration des taux")
+
+
+def _status_error(error: httpx.HTTPStatusError, message: str) -> Exception:
+    # 5xx et 429 : l'API est en difficulté ; 400 et 422 : données refusées, comme en mode embarqué
+    status_code = error.response.status_code
+    if status_code >= 500 or status_code == 429:
+        return RateEngineUnavailable(f"{message}: {status_code}")
+    if status_code in (400, 422):
+        return ValueError(f"{message}: {status_code}")
+    return Exception(f"{message}: {status_code}")
+
+
+class EmbeddedRateTransport(RateTransport):
+    """Moteur de taux de l'API Interest Rate chargé dans ce processus (déploiement sur un même nœud).
+
+    Les appels vont directement à InterestRateCalculationService : ni sérialisation
+    JSON, ni requête HTTP, ni second serveur à traverser.
+    """
+
+    def __init__(self, api_path: str):
+        self.api_path = api_path
+        self._service = None
+        self._models = None
+
+    async def start(self) -> None:
+        # Surveillance du fichier de règles, comme le fait l'API lorsqu'elle tourne seule
+        self.service.start()
+
+    async def close(self) -> None:
+        if self._service is not None:
+            await self._service.close()
+
+    @property
+    def service(self):
+        if self._service is None:
+            self._service, self._models = load_embedded_rate_engine(self.api_path)
+        return self._service
+
+    async def calculate_interest_rate(self, age_category: str, professional_category: str,
+                                      monthly_net_income: float) -> float:
+        service = self.service
+        try:
+            request = self._models.InterestRateRequest(
+                age_category=age_category,
+                professional_category=professional_category,
+                monthly_net_income=monthly_net_income
+            )
+        except ValueError as e:
+            # Même type d'erreur qu'une demande refusée par l'API en HTTP (400/422)
+            raise ValueError(f"Données invalides pour le calcul du taux d'intérêt: {e}")
+        return service.calculate_interest_rate(request).annual_interest_rate
+
+    async def get_categories(self, kind: str, etag: Optional[str] = None) -> Optional[Tuple[list, Optional[str]]]:
+        service = self.service
+        # La version de la grille sert d'etag : les catégories n'évoluent qu'avec elle
+        version = service.config_version
+        if etag == version:
+            return None
+        categories = service.get_age_categories() if kind == "age" else service.get_professional_categories()
+        return [category.model_dump() for category in categories], version
+
+    async def get_config(self) -> dict:
+        return self.service.get_current_config().model_dump(mode="json")
+
+
+def load_embedded_rate_engine(api_path: str):
+    """Importe le service de calcul de l'API Interest Rate depuis son répertoire.
+
+    Les deux services nomment leur paquet `app` : celui de l'API est chargé sous le nom
+    EMBEDDED_PACKAGE, sans toucher au paquet `app` de ce processus. Ses services ne doivent
+    donc utiliser que des imports relatifs (voir interest-rate-api/app/services/__init__.py).
+    Retourne (interest_rate_service, module models de l'API).
+    """
+    if EMBEDDED_PACKAGE not in sys.modules:
+        package_dir = os.path.join(api_path, "app")
+        spec = importlib.util.spec_from_file_location(
+            EMBEDDED_PACKAGE, os.path.join(package_dir, "__init__.py"), submodule_search_locations=[package_dir]
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[EMBEDDED_PACKAGE] = package
+        try:
+            spec.loader.exec_module(package)
+        except BaseException:
+            del sys.modules[EMBEDDED_PACKAGE]
+            raise
+
+    service_module = importlib.import_module(f"{EMBEDDED_PACKAGE}.services.interest_rate_service")
+    models_module = importlib.import_module(f"{EMBEDDED_PACKAGE}.models")
+    return service_module.interest_rate_service, models_module
+
+
+def create_transport(config: InterestRateClientConfig, base_url: Optional[str] = None) -> RateTransport:
+    if config.transport == "embedded":
+        return EmbeddedRateTransport(config.embedded_api_path)
+    return HttpRateTransport(config, base_url)
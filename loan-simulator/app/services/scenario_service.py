@@ -0,0 +1,97 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.models import ScenarioAxis, ClientProfile, LoanScenarioRequest, LoanScenarioGrid
+from app.services.annuity import loan_totals
+from app.services.interest_rate_client import interest_rate_client
+
+# Garde-fou sur la taille de la grille (montants × durées × taux)
+MAX_SCENARIO_CELLS = 100_000
+
+
+class ScenarioService:
+
+    async def calculate_grid(self, request: LoanScenarioRequest) -> LoanScenarioGrid:
+        """Calcule la matrice des mensualités et coûts pour toutes les combinaisons demandées"""
+        amounts = self._axis_values(request.amounts, "montants")
+        durations = self._axis_values(request.durations_years, "durées")
+        if np.any(amounts <= 0):
+            raise ValueError("Les montants doivent être strictement positifs")
+        if np.any(durations <= 0) or np.any(durations != np.round(durations)):
+            raise ValueError("Les durées doivent être des nombres entiers d'années strictement positifs")
+        durations = durations.astype(np.int64)
+
+        explicit_rates = self._explicit_rates(request)
+        profiles = request.client_profiles or []
+        if len(explicit_rates) + len(profiles) == 0:
+            raise ValueError("Au moins un taux d'intérêt ou un profil client est requis")
+
+        # Taille contrôlée avant d'interroger le moteur de taux pour chaque profil
+        cells = len(amounts) * len(durations) * (len(explicit_rates) + len(profiles))
+        if cells > MAX_SCENARIO_CELLS:
+            raise ValueError(f"La grille demandée compte {cells} combinaisons (maximum {MAX_SCENARIO_CELLS})")
+
+        profile_rates, rate_stale = await self._profile_rates(profiles)
+        rates = np.concatenate([explicit_rates, profile_rates])
+        rate_profiles: List[Optional[ClientProfile]] = [None] * len(explicit_rates) + list(profiles)
+
+        # Broadcast montant × durée × taux : une seule opération vectorisée pour toute la grille
+        monthly_payments, total_costs, total_interests = loan_totals(
+            amounts[:, None, None], rates[None, None, :], durations[None, :, None]
+        )
+
+        return LoanScenarioGrid(
+            amounts=amounts.tolist(),
+            durations_years=durations.tolist(),
+            annual_interest_rates=np.round(rates, 2).tolist(),
+            rate_profiles=rate_profiles,
+            monthly_payments=np.round(monthly_payments, 2).tolist(),
+            total_costs=np.round(total_costs, 2).tolist(),
+            total_interests=np.round(total_interests, 2).tolist(),
+            rate_stale=rate_stale
+        )
+
+    def _explicit_rates(self, request: LoanScenarioRequest) -> np.ndarray:
+        if request.annual_interest_rates is None:
+            return np.empty(0, dtype=np.float64)
+        rates = self._axis_values(request.annual_interest_rates, "taux")
+        if np.any(rates < 0):
+            raise ValueError("Les taux d'intérêt ne peuvent pas être négatifs")
+        return rates
+
+    async def _profile_rates(self, profiles: List[ClientProfile]) -> Tuple[np.ndarray, bool]:
+        """Taux de chaque profil client, et vrai si l'un d'eux est le dernier connu (moteur indisponible)"""
+        lookups = await asyncio.gather(*(
+            interest_rate_client.get_interest_rate(
+                age_category=profile.age_category,
+                professional_category=profile.professional_category,
+                monthly_net_income=profile.monthly_net_income
+            )
+            for profile in profiles
+        ))
+        rates = np.array([lookup.rate for lookup in lookups], dtype=np.float64)
+        return rates, any(lookup.stale for lookup in lookups)
+
+    @staticmethod
+    def _axis_values(axis: ScenarioAxis, label: str) -> np.ndarray:
+        if axis.values is not None:
+            values = np.array(axis.values, dtype=np.float64)
+        elif axis.start is not None and axis.stop is not None and axis.step is not None:
+            if axis.stop < axis.start:
+                raise ValueError(f"Plage de {label} invalide : la fin précède le début")
+            count = int(np.floor((axis.stop - axis.start) / axis.step + 1e-9)) + 1
+            if count > MAX_SCENARIO_CELLS:
+                raise ValueError(f"La plage de {label} compte trop de valeurs (maximum {MAX_SCENARIO_CELLS})")
+            # Valeurs calculées depuis le début de plage pour ne pas cumuler l'erreur du pas
+            values = axis.start + axis.step * np.arange(count)
+        else:
+            raise ValueError(f"L'axe des {label} doit fournir 'values' ou 'start', 'stop' et 'step'")
+
+        if values.size == 0:
+            raise ValueError(f"L'axe des {label} ne contient aucune valeur")
+        return values
+
+
+scenario_service = ScenarioService()
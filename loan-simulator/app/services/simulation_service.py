@@ -1,41 +1,88 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from app.database import LoanSimulation
-from app.models import SaveSimulationRequest, SaveSimulationResponse, SimulationHistory
-from typing import List
-from datetime import datetime
+from sqlalchemy import select, desc, insert, or_, tuple_, func, case, type_coerce, String, false
+from sqlalchemy.sql import Select
+from app.database import LoanSimulation, read_engine, simulation_search
+from app.services.simulation_writer import simulation_writer
+from app.models import (
+    SaveSimulationRequest, SaveSimulationResponse, SimulationHistory, SimulationFilters, SimulationPage,
+    BulkSaveSimulationResponse, SimulationAnalytics, SimulationStats, SimulationStatsGroup, AmountPercentiles
+)
+from typing import AsyncIterator, List, Optional, Tuple
+from datetime import datetime, timezone
+import base64
+import csv
+import io
+import json
+import re
 
+import orjson
 
-class SimulationService:
 
-    async def save_simulation(self, request: SaveSimulationRequest, db: AsyncSession) -> SaveSimulationResponse:
-        """Sauvegarde une simulation de prêt en base de données"""
+# Format strftime (SQLite) de chaque granularité de période
+PERIOD_FORMATS = {
+    "day": "%Y-%m-%d",
+    "week": "%Y-W%W",
+    "month": "%Y-%m",
+    "year": "%Y"
+}
 
-        # Validation des données obligatoires
-        loan_req = request.loan_request
-        loan_resp = request.loan_response
+# Colonnes exportées : nom dans l'export (mêmes clés que l'historique) -> colonne en base
+EXPORT_COLUMNS = {
+    "id": LoanSimulation.id,
+    "firstName": LoanSimulation.first_name,
+    "lastName": LoanSimulation.last_name,
+    "ageCategory": LoanSimulation.age_category,
+    "professionalCategory": LoanSimulation.professional_category,
+    "monthlyNetIncome": LoanSimulation.monthly_net_income,
+    "loanAmount": LoanSimulation.loan_amount,
+    "durationYears": LoanSimulation.duration_years,
+    "annualInterestRate": LoanSimulation.annual_interest_rate,
+    "totalInterest": LoanSimulation.total_interest,
+    "totalCost": LoanSimulation.total_cost,
+    "monthlyPayment": LoanSimulation.monthly_payment,
+    "createdAt": LoanSimulation.created_at
+}
 
-        if not loan_req.first_name or not loan_req.last_name:
-            raise ValueError("Le prénom et le nom sont obligatoires")
+# created_at tel que stocké par SQLite ("AAAA-MM-JJ HH:MM:SS.ffffff"), sans conversion en datetime
+_CREATED_AT_TEXT = type_coerce(LoanSimulation.created_at, String)
 
-        if not loan_req.age_category or not loan_req.professional_category:
-            raise ValueError("Les catégories d'âge et professionnelle sont obligatoires")
+# Champs de l'historique (clés JSON de SimulationHistory) -> expression SQL produisant directement la valeur JSON
+HISTORY_FIELDS = {
+    "id": LoanSimulation.id,
+    "firstName": LoanSimulation.first_name,
+    "lastName": LoanSimulation.last_name,
+    "ageCategory": LoanSimulation.age_category,
+    "professionalCategory": LoanSimulation.professional_category,
+    "monthlyNetIncome": LoanSimulation.monthly_net_income,
+    "loanAmount": LoanSimulation.loan_amount,
+    "durationYears": LoanSimulation.duration_years,
+    "annualInterestRate": LoanSimulation.annual_interest_rate,
+    "totalInterest": LoanSimulation.total_interest,
+    "totalCost": LoanSimulation.total_cost,
+    "monthlyPayment": LoanSimulation.monthly_payment,
+    # Même rendu que datetime.isoformat() : les microsecondes nulles sont omises
+    "createdAt": case(
+        (func.substr(_CREATED_AT_TEXT, 20) == ".000000", func.replace(func.substr(_CREATED_AT_TEXT, 1, 19), " ", "T")),
+        else_=func.replace(_CREATED_AT_TEXT, " ", "T")
+    ),
+    "clientName": LoanSimulation.first_name + " " + LoanSimulation.last_name,
+    "formattedCreatedAt": func.strftime("%d/%m/%Y à %H:%M", LoanSimulation.created_at)
+}
+
+# Lignes lues par aller-retour avec le curseur lors d'un export
+EXPORT_PARTITION_SIZE = 1000
+
+# Percentiles des montants : nom du champ -> rang relatif
+AMOUNT_PERCENTILES = {"p25": 0.25, "median": 0.5, "p75": 0.75, "p90": 0.9}
+
+
+class SimulationService:
+
+    async def save_simulation(self, request: SaveSimulationRequest, db: AsyncSession) -> SaveSimulationResponse:
+        """Sauvegarde une simulation de prêt en base de données"""
 
         # Créer l'enregistrement en base
-        simulation = LoanSimulation(
-            first_name=loan_req.first_name,
-            last_name=loan_req.last_name,
-            age_category=loan_req.age_category,
-            professional_category=loan_req.professional_category,
-            monthly_net_income=loan_req.monthly_net_income,
-            loan_amount=loan_req.amount,
-            duration_years=loan_req.duration_years,
-            annual_interest_rate=loan_resp.annual_interest_rate,
-            total_interest=loan_resp.total_interest,
-            total_cost=loan_resp.total_cost,
-            monthly_payment=loan_resp.monthly_payment,
-            created_at=datetime.utcnow()
-        )
+        simulation = LoanSimulation(**self._simulation_values(request))
 
         db.add(simulation)
         await db.commit()
@@ -46,37 +93,172 @@ class SimulationService:
             message="Simulation sauvegardée avec succès"
         )
 
-    async def get_simulation_history(self, db: AsyncSession, limit: int = 50) -> List[SimulationHistory]:
-        """Récupère l'historique des simulations"""
+    async def queue_simulation(self, request: SaveSimulationRequest,
+                               wait_for_commit: bool = True) -> Optional[SaveSimulationResponse]:
+        """Sauvegarde une simulation via la file d'écriture (commit groupé avec d'autres sauvegardes)
+
+        Sans attente du commit, la simulation est seulement acceptée : aucun ID n'est retourné.
+        """
+
+        # Validation immédiate : les erreurs restent des 400 même en mode asynchrone
+        future = await simulation_writer.submit(self._simulation_values(request), wait=wait_for_commit)
+        if future is None:
+            return None
+
+        return SaveSimulationResponse(
+            id=await future,
+            message="Simulation sauvegardée avec succès"
+        )
+
+    async def save_simulations(self, requests: List[SaveSimulationRequest], db: AsyncSession) -> BulkSaveSimulationResponse:
+        """Sauvegarde un lot de simulations en une seule requête et une seule transaction"""
+
+        rows = []
+        for index, request in enumerate(requests):
+            try:
+                rows.append(self._simulation_values(request))
+            except ValueError as e:
+                raise ValueError(f"{e} (simulation n°{index + 1})")
+
+        ids = []
+        if rows:
+            # INSERT ... RETURNING exécuté par lots : les ID reviennent dans l'ordre des demandes
+            # sans relire chaque ligne comme le fait db.refresh()
+            result = await db.execute(
+                insert(LoanSimulation).returning(LoanSimulation.id, sort_by_parameter_order=True),
+                rows
+            )
+            ids = list(result.scalars().all())
+            await db.commit()
+
+        return BulkSaveSimulationResponse(
+            ids=ids,
+            count=len(ids),
+            message=f"{len(ids)} simulation(s) sauvegardée(s) avec succès"
+        )
+
+    async def get_simulation_history(self, db: AsyncSession, limit: int = 50,
+                                     fields: Optional[List[str]] = None) -> bytes:
+        """Récupère l'historique des simulations, directement sérialisé en JSON"""
+
+        names = fields or list(HISTORY_FIELDS)
+        query = self._history_select(names).order_by(desc(LoanSimulation.created_at)).limit(limit)
+        result = await db.execute(query)
+
+        return orjson.dumps(self._history_rows(names, result.all()))
+
+    async def search_simulations(self, db: AsyncSession, filters: SimulationFilters, limit: int = 50,
+                                 cursor: Optional[str] = None) -> SimulationPage:
+        """Recherche paginée par clé (created_at, id) dans l'historique des simulations"""
+
+        # created_at est lu tel que stocké : le curseur reprend exactement la valeur comparée par ORDER BY
+        query = self._apply_filters(select(LoanSimulation, _CREATED_AT_TEXT.label("created_at_text")), filters)
+        if cursor:
+            created_at, simulation_id = self._decode_cursor(cursor)
+            query = query.where(
+                tuple_(_CREATED_AT_TEXT, LoanSimulation.id) < tuple_(type_coerce(created_at, String), simulation_id)
+            )
+
+        # Une ligne de plus que demandé indique s'il existe une page suivante
+        query = query.order_by(desc(LoanSimulation.created_at), desc(LoanSimulation.id)).limit(limit + 1)
+        result = await db.execute(query)
+        rows = result.all()
+
+        page = rows[:limit]
+        next_cursor = self._encode_cursor(*page[-1]) if len(rows) > limit else None
+
+        return SimulationPage(
+            items=[self._to_history(sim) for sim, _ in page],
+            next_cursor=next_cursor
+        )
+
+    async def search_clients(self, db: AsyncSession, terms: str, limit: int = 20) -> List[SimulationHistory]:
+        """Recherche plein texte des simulations par nom de client, les plus pertinentes en premier"""
 
-        query = select(LoanSimulation).order_by(desc(LoanSimulation.created_at)).limit(limit)
+        match = self._client_match(terms)
+        if match is None:
+            raise ValueError("La recherche doit contenir au moins une lettre ou un chiffre")
+
+        query = (
+            select(LoanSimulation)
+            .join(simulation_search, simulation_search.c.rowid == LoanSimulation.id)
+            .where(simulation_search.c.loan_simulations_fts.op("MATCH")(match))
+            .order_by(simulation_search.c.rank, desc(LoanSimulation.created_at))
+            .limit(limit)
+        )
         result = await db.execute(query)
         simulations = result.scalars().all()
 
-        history = []
-        for sim in simulations:
-            history.append(SimulationHistory(
-                id=sim.id,
-                first_name=sim.first_name,
-                last_name=sim.last_name,
-                age_category=sim.age_category,
-                professional_category=sim.professional_category,
-                monthly_net_income=sim.monthly_net_income,
-                loan_amount=sim.loan_amount,
-                duration_years=sim.duration_years,
-                annual_interest_rate=sim.annual_interest_rate,
-                total_interest=sim.total_interest,
-                total_cost=sim.total_cost,
-                monthly_payment=sim.monthly_payment,
-                created_at=sim.created_at.isoformat(),
-                client_name=f"{sim.first_name} {sim.last_name}",
-                formatted_created_at=sim.created_at.strftime("%d/%m/%Y à %H:%M")
-            ))
+        return [self._to_history(sim) for sim in simulations]
+
+    async def get_analytics(self, db: AsyncSession, filters: SimulationFilters, group_by: List[str],
+                            period: Optional[str] = None) -> SimulationAnalytics:
+        """Statistiques agrégées en base (GROUP BY et fonctions de fenêtre) sur les simulations filtrées"""
+
+        keys = [(name, getattr(LoanSimulation, name)) for name in group_by]
+        if period is not None:
+            keys.append(("period", func.strftime(PERIOD_FORMATS[period], LoanSimulation.created_at)))
+
+        overall = await self._aggregate(db, filters, [])
+        groups = await self._aggregate(db, filters, keys) if keys else []
+
+        return SimulationAnalytics(
+            overall=SimulationStats(**self._stats_values(overall[0])),
+            groups=[
+                SimulationStatsGroup(**{name: row._mapping[name] for name, _ in keys}, **self._stats_values(row))
+                for row in groups
+            ]
+        )
+
+    def export_simulations(self, filters: SimulationFilters, format: str = "ndjson") -> AsyncIterator[bytes]:
+        """Exporte les simulations filtrées (CSV ou NDJSON) depuis un curseur, un bloc de lignes à la fois.
+
+        Les filtres sont vérifiés et la requête construite avant le premier bloc : une erreur
+        (ValueError) est levée ici, tant qu'une réponse d'erreur peut encore être renvoyée.
+        """
+        self._check_filters(filters)
+        query = self._apply_filters(
+            select(*[column.label(name) for name, column in EXPORT_COLUMNS.items()]),
+            filters
+        ).order_by(LoanSimulation.id).execution_options(yield_per=EXPORT_PARTITION_SIZE)
+        return self._stream_export(query, format)
+
+    async def _stream_export(self, query: Select, format: str) -> AsyncIterator[bytes]:
+        if format == "csv":
+            yield (",".join(EXPORT_COLUMNS) + "\n").encode()
 
-        return history
+        # Connexion dédiée ouverte pour toute la durée du flux : la mémoire reste bornée
+        # à un bloc de lignes quel que soit le volume exporté
+        async with read_engine.connect() as conn:
+            result = await conn.stream(query)
+            async for rows in result.partitions():
+                if format == "csv":
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer, lineterminator="\n")
+                    writer.writerows(self._export_values(row) for row in rows)
+                    yield buffer.getvalue().encode()
+                else:
+                    yield b"".join(
+                        orjson.dumps(dict(zip(EXPORT_COLUMNS, self._export_values(row))), option=orjson.OPT_APPEND_NEWLINE)
+                        for row in rows
+                    )
 
-    async def get_simulation_by_id(self, simulation_id: int, db: AsyncSession) -> SimulationHistory:
-        """Récupère une simulation par son ID"""
+    async def get_simulation_by_id(self, simulation_id: int, db: AsyncSession,
+                                   fields: Optional[List[str]] = None) -> bytes:
+        """Récupère une simulation par son ID, directement sérialisée en JSON"""
+
+        names = fields or list(HISTORY_FIELDS)
+        query = self._history_select(names).where(LoanSimulation.id == simulation_id)
+        result = await db.execute(query)
+        row = result.one_or_none()
+
+        if not row:
+            raise ValueError(f"Aucune simulation trouvée avec l'ID {simulation_id}")
+
+        return orjson.dumps(self._history_rows(names, [row])[0])
+
+    async def delete_simulation(self, simulation_id: int, db: AsyncSession) -> None:
+        """Supprime une simulation par son ID"""
 
         query = select(LoanSimulation).where(LoanSimulation.id == simulation_id)
         result = await db.execute(query)
@@ -85,6 +267,204 @@ class SimulationService:
         if not simulation:
             raise ValueError(f"Aucune simulation trouvée avec l'ID {simulation_id}")
 
+        await db.delete(simulation)
+        await db.commit()
+
+
+    async def _aggregate(self, db: AsyncSession, filters: SimulationFilters, keys: list) -> list:
+        partition = [expr for _, expr in keys] or None
+
+        # Rang de chaque montant dans son groupe : le percentile p (rang le plus proche) est
+        # le plus petit montant dont le rang atteint p × effectif du groupe
+        ranked = self._apply_filters(select(
+            *[expr.label(name) for name, expr in keys],
+            LoanSimulation.loan_amount,
+            LoanSimulation.annual_interest_rate,
+            LoanSimulation.duration_years,
+            LoanSimulation.monthly_payment,
+            func.row_number().over(partition_by=partition, order_by=LoanSimulation.loan_amount).label("amount_rank"),
+            func.count().over(partition_by=partition).label("group_size")
+        ), filters).subquery()
+
+        group_columns = [ranked.c[name] for name, _ in keys]
+        query = select(
+            *group_columns,
+            func.count().label("count"),
+            func.sum(ranked.c.loan_amount).label("total_amount"),
+            func.avg(ranked.c.loan_amount).label("average_amount"),
+            func.avg(ranked.c.annual_interest_rate).label("average_interest_rate"),
+            func.min(ranked.c.annual_interest_rate).label("min_interest_rate"),
+            func.max(ranked.c.annual_interest_rate).label("max_interest_rate"),
+            func.avg(ranked.c.duration_years).label("average_duration_years"),
+            func.avg(ranked.c.monthly_payment).label("average_monthly_payment"),
+            *[
+                func.min(case(
+                    (ranked.c.amount_rank >= rank * ranked.c.group_size, ranked.c.loan_amount)
+                )).label(name)
+                for name, rank in AMOUNT_PERCENTILES.items()
+            ]
+        )
+        if group_columns:
+            query = query.group_by(*group_columns).order_by(*group_columns)
+
+        result = await db.execute(query)
+        return result.all()
+
+    @staticmethod
+    def _stats_values(row) -> dict:
+        values = row._mapping
+
+        def rounded(name: str) -> Optional[float]:
+            return round(values[name], 2) if values[name] is not None else None
+
+        return {
+            "count": values["count"],
+            "total_amount": rounded("total_amount"),
+            "average_amount": rounded("average_amount"),
+            "average_interest_rate": rounded("average_interest_rate"),
+            "min_interest_rate": rounded("min_interest_rate"),
+            "max_interest_rate": rounded("max_interest_rate"),
+            "average_duration_years": rounded("average_duration_years"),
+            "average_monthly_payment": rounded("average_monthly_payment"),
+            "amount_percentiles": AmountPercentiles(**{name: rounded(name) for name in AMOUNT_PERCENTILES})
+        }
+
+    @staticmethod
+    def _export_values(row) -> tuple:
+        *values, created_at = row
+        return (*values, created_at.isoformat())
+
+    @staticmethod
+    def _simulation_values(request: SaveSimulationRequest) -> dict:
+        # Validation des données obligatoires
+        loan_req = request.loan_request
+        loan_resp = request.loan_response
+
+        if not loan_req.first_name or not loan_req.last_name:
+            raise ValueError("Le prénom et le nom sont obligatoires")
+
+        if not loan_req.age_category or not loan_req.professional_category:
+            raise ValueError("Les catégories d'âge et professionnelle sont obligatoires")
+
+        return {
+            "first_name": loan_req.first_name,
+            "last_name": loan_req.last_name,
+            "age_category": loan_req.age_category,
+            "professional_category": loan_req.professional_category,
+            "monthly_net_income": loan_req.monthly_net_income,
+            "loan_amount": loan_req.amount,
+            "duration_years": loan_req.duration_years,
+            "annual_interest_rate": loan_resp.annual_interest_rate,
+            "total_interest": loan_resp.total_interest,
+            "total_cost": loan_resp.total_cost,
+            "monthly_payment": loan_resp.monthly_payment,
+            "created_at": datetime.utcnow()
+        }
+
+    def _check_filters(self, filters: SimulationFilters) -> None:
+        # Dates comparées sous leur forme stockée : les bornes avec et sans fuseau restent comparables
+        created_from, created_before = (
+            None if value is None else self._stored_datetime(value)
+            for value in (filters.created_from, filters.created_before)
+        )
+        ranges = [
+            ("created_from", created_from, "created_before", created_before),
+            ("min_amount", filters.min_amount, "max_amount", filters.max_amount),
+            ("min_rate", filters.min_rate, "max_rate", filters.max_rate),
+        ]
+        for low_name, low, high_name, high in ranges:
+            if low is not None and high is not None and low > high:
+                raise ValueError(f"Filtres incohérents : {low_name} doit être inférieur ou égal à {high_name}")
+
+    def _apply_filters(self, query: Select, filters: SimulationFilters) -> Select:
+        if filters.age_category:
+            query = query.where(LoanSimulation.age_category == filters.age_category)
+        if filters.professional_category:
+            query = query.where(LoanSimulation.professional_category == filters.professional_category)
+        if filters.created_from is not None:
+            query = query.where(_CREATED_AT_TEXT >= self._stored_datetime(filters.created_from))
+        if filters.created_before is not None:
+            query = query.where(_CREATED_AT_TEXT < self._stored_datetime(filters.created_before))
+        if filters.min_amount is not None:
+            query = query.where(LoanSimulation.loan_amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            query = query.where(LoanSimulation.loan_amount <= filters.max_amount)
+        if filters.min_rate is not None:
+            query = query.where(LoanSimulation.annual_interest_rate >= filters.min_rate)
+        if filters.max_rate is not None:
+            query = query.where(LoanSimulation.annual_interest_rate <= filters.max_rate)
+        if filters.client:
+            match = self._client_match(filters.client)
+            if match is None:
+                # Filtre sans lettre ni chiffre : aucun nom ne peut lui correspondre
+                return query.where(false())
+            # Recherche par préfixe, insensible à la casse et aux accents, servie par l'index FTS5
+            query = query.where(LoanSimulation.id.in_(
+                select(simulation_search.c.rowid).where(simulation_search.c.loan_simulations_fts.op("MATCH")(match))
+            ))
+        return query
+
+    @staticmethod
+    def _client_match(terms: str) -> Optional[str]:
+        # Chaque mot devient un préfixe entre guillemets : la syntaxe FTS5 de l'utilisateur n'est pas interprétée
+        words = re.findall(r"\w+", terms)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+
+    @staticmethod
+    def _stored_datetime(value: datetime) -> str:
+        """Borne de date au format texte de la colonne, comparée comme chaîne par SQLite.
+
+        Les dates insérées par l'application ont des microsecondes (AAAA-MM-JJ HH:MM:SS.ffffff), celles
+        insérées en SQL (datetime(...), sample_data.sql) n'en ont pas : sans microsecondes, la borne
+        est rendue sans partie fractionnaire pour que « SS » et « SS.000000 » restent du même côté.
+        """
+        if value.tzinfo is not None:
+            # created_at est stocké en UTC sans fuseau
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=" ")
+
+    @staticmethod
+    def _encode_cursor(simulation: LoanSimulation, created_at_text) -> str:
+        created_at = created_at_text if isinstance(created_at_text, str) else created_at_text.isoformat(sep=" ")
+        payload = json.dumps([created_at, simulation.id])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, int]:
+        try:
+            created_at, simulation_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            # Valide la date, mais garde le texte tel que stocké (curseurs antérieurs : séparateur « T »)
+            datetime.fromisoformat(created_at)
+            return created_at.replace("T", " "), int(simulation_id)
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError("Curseur de pagination invalide")
+
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+        """Liste des champs demandés (paramètre fields=a,b,c) ; None pour tous les champs"""
+        if not fields:
+            return None
+        names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in HISTORY_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Champ(s) inconnu(s) : {', '.join(unknown)} (champs disponibles : {', '.join(HISTORY_FIELDS)})"
+            )
+        return names or None
+
+    @staticmethod
+    def _history_select(names: List[str]) -> Select:
+        # Seules les colonnes demandées sont lues, déjà au format JSON : ni objet ORM ni modèle Pydantic
+        return select(*[HISTORY_FIELDS[name].label(name) for name in names])
+
+    @staticmethod
+    def _history_rows(names: List[str], rows) -> List[dict]:
+        return [dict(zip(names, row)) for row in rows]
+
+    @staticmethod
+    def _to_history(simulation: LoanSimulation) -> SimulationHistory:
         return SimulationHistory(
             id=simulation.id,
             first_name=simulation.first_name,
@@ -103,18 +483,5 @@ class SimulationService:
             formatted_created_at=simulation.created_at.strftime("%d/%m/%Y à %H:%M")
         )
 
-    async def delete_simulation(self, simulation_id: int, db: AsyncSession) -> None:
-        """Supprime une simulation par son ID"""
-
-        query = select(LoanSimulation).where(LoanSimulation.id == simulation_id)
-        result = await db.execute(query)
-        simulation = result.scalar_one_or_none()
-
-        if not simulation:
-            raise ValueError(f"Aucune simulation trouvée avec l'ID {simulation_id}")
-
-        await db.delete(simulation)
-        await db.commit()
-
 
 simulation_service = SimulationService()
\ No newline at end of file
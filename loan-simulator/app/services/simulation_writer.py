@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from app.config import SaveQueueConfig, settings
+from app.database import AsyncSessionLocal, LoanSimulation
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationWriter:
+    """File d'écriture différée : les simulations sont insérées et validées par groupes.
+
+    Un seul commit (et donc une seule synchronisation disque) couvre tout un
+    groupe, au lieu d'un commit par sauvegarde.
+    """
+
+    def __init__(self, config: SaveQueueConfig = settings.save_queue):
+        self.config = config
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.committed = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        return {"pending": self.pending, "committed": self.committed, "failed": self.failed, "batches": self.batches}
+
+    def start(self) -> None:
+        """Démarre la tâche de fond qui vide la file (appelé au démarrage de l'application)"""
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.config.max_pending)
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Valide toutes les simulations en attente puis arrête la tâche de fond"""
+        if self._worker is None:
+            return
+        # Le marqueur None est placé après les demandes déjà en file : elles sont toutes écrites.
+        # File pleine : on attend une place, sauf si la tâche de fond s'arrête entre-temps
+        marker = asyncio.ensure_future(self._queue.put(None))
+        await asyncio.wait({marker, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+        marker.cancel()
+        await asyncio.wait({self._worker})
+        if not self._worker.cancelled() and self._worker.exception() is not None:
+            logger.error("Arrêt anormal de la file d'écriture des simulations", exc_info=self._worker.exception())
+
+        # Demandes restées en file si la tâche de fond s'est arrêtée sans les écrire
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                self._fail(item, RuntimeError("File d'écriture arrêtée avant la sauvegarde de la simulation"))
+        self._worker = None
+        self._queue = None
+
+    async def submit(self, values: dict, wait: bool = True) -> Optional["asyncio.Future[int]"]:
+        """Met une simulation en file ; retourne un futur résolu avec son ID une fois validée"""
+        # Démarrage paresseux si la file est utilisée hors du cycle de vie de l'application
+        self.start()
+        future = asyncio.get_running_loop().create_future() if wait else None
+        await self._queue.put((values, future))
+        return future
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = self._drain(batch)
+            if not stopping and len(batch) < self.config.max_batch_size and self.config.max_delay_ms > 0:
+                # Fenêtre de regroupement : les sauvegardes arrivées entre-temps partagent le commit
+                await asyncio.sleep(self.config.max_delay_ms / 1000)
+                stopping = self._drain(batch)
+
+            await self._write(batch)
+            if stopping:
+                return
+
+    def _drain(self, batch: list) -> bool:
+        """Complète le groupe avec ce qui est déjà en file ; True si l'arrêt a été demandé"""
+        while len(batch) < self.config.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if item is None:
+                return True
+            batch.append(item)
+        return False
+
+    async def _write(self, batch: List[Tuple[dict, Optional[asyncio.Future]]]) -> None:
+        try:
+            ids = await self._insert([values for values, _ in batch])
+        except Exception:
+            # Une ligne fautive ne doit pas faire échouer tout le groupe : on isole ligne par ligne
+            for entry in batch:
+                await self._write_one(entry)
+            return
+
+        self.batches += 1
+        self.committed += len(ids)
+        for (_, future), simulation_id in zip(batch, ids):
+            if future is not None and not future.done():
+                future.set_result(simulation_id)
+
+    async def _write_one(self, entry: Tuple[dict, Optional[asyncio.Future]]) -> None:
+        values, future = entry
+        try:
+            simulation_id = (await self._insert([values]))[0]
+        except Exception as e:
+            self._fail(entry, e)
+            return
+
+        self.batches += 1
+        self.committed += 1
+        if future is not None and not future.done():
+            future.set_result(simulation_id)
+
+    def _fail(self, entry: Tuple[dict, Optional[asyncio.Future]], error: Exception) -> None:
+        values, future = entry
+        self.failed += 1
+        if future is None:
+            # Sauvegarde asynchrone (202) : personne n'attend le résultat, la simulation n'est conservée que dans le journal
+            logger.error("Échec de la sauvegarde asynchrone de la simulation %r : %s", values, error)
+        elif not future.done():
+            future.set_exception(error)
+
+    @staticmethod
+    async def _insert(rows: List[dict]) -> List[int]:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                insert(LoanSimulation).returning(LoanSimulation.id, sort_by_parameter_order=True),
+                rows
+            )
+            ids = list(result.scalars().all())
+            await session.commit()
+            return ids
+
+
+# Global writer instance
+simulation_writer = SimulationWriter()
@@ -0,0 +1,284 @@
+"""Fichiers statiques du frontend : CSS/JS minifiés et renommés d'après leur contenu, variantes gzip/brotli précalculées."""
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from typing import Dict, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import PlainTextResponse
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : seules les variantes gzip sont alors produites
+    brotli = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # minifieurs optionnels : CSS/JS servis tels quels, toujours renommés et précompressés
+    rcssmin = rjsmin = None
+
+# Fichiers minifiés et renommés avec l'empreinte de leur contenu (style.css -> style.1a2b3c4d5e.css)
+FINGERPRINTED_EXTENSIONS = {".css", ".js"}
+COMPRESSIBLE_TYPES = {"application/javascript", "application/json", "image/svg+xml", "text/javascript"}
+# En dessous, la compression ne fait pas gagner de paquet réseau
+MIN_COMPRESSED_SIZE = 256
+# Codages proposés, par ordre de préférence à qualité égale
+ENCODINGS = ("br", "gzip", "identity")
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz", "identity": ""}
+
+_HTML_REFERENCE = re.compile(r"""(\b(?:href|src)\s*=\s*["'])([^"'?#]+)([^"']*["'])""", re.I)
+
+
+def minify_css(source: str) -> str:
+    return rcssmin.cssmin(source) if rcssmin is not None else source
+
+
+def minify_js(source: str) -> str:
+    """Retire commentaires et espaces superflus (rjsmin) ; le code n'est pas réécrit."""
+    return rjsmin.jsmin(source) if rjsmin is not None else source
+
+
+class StaticAsset:
+    """Contenu d'un fichier et ses variantes compressées, chacune avec son ETag fort."""
+
+    def __init__(self, body: bytes, media_type: str):
+        self.media_type = media_type
+        digest = hashlib.sha256(body).hexdigest()
+        self.fingerprint = digest[:10]
+        self.variants: Dict[str, bytes] = {"identity": body}
+        if _is_compressible(media_type) and len(body) >= MIN_COMPRESSED_SIZE:
+            candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                candidates["br"] = brotli.compress(body, mode=brotli.MODE_TEXT, quality=11)
+            # Une variante qui ne gagne rien n'est pas proposée
+            self.variants.update((encoding, data) for encoding, data in candidates.items() if len(data) < len(body))
+        # Chaque représentation a son propre ETag (RFC 9110, section 8.8.3)
+        self.etags = {encoding: f'"{digest[:32]}{ETAG_SUFFIXES[encoding]}"' for encoding in self.variants}
+
+    def negotiate(self, accept_encoding: str) -> str:
+        if len(self.variants) == 1:
+            return "identity"
+        accepted = _parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best, best_quality = "identity", 0.0
+        for encoding in ENCODINGS:
+            if encoding not in self.variants:
+                continue
+            quality = accepted.get(encoding, 1.0 if encoding == "identity" else wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def response(self, method: str, headers: Dict[str, str], cache_control: str) -> Response:
+        encoding = self.negotiate(headers.get("accept-encoding", ""))
+        body = self.variants[encoding]
+        response_headers = {"ETag": self.etags[encoding], "Cache-Control": cache_control}
+        if len(self.variants) > 1:
+            response_headers["Vary"] = "Accept-Encoding"
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            if "*" in candidates or self.etags[encoding] in candidates:
+                return Response(status_code=304, headers=response_headers)
+
+        if method == "HEAD":
+            response_headers["Content-Length"] = str(len(body))
+            body = b""
+        return Response(content=body, media_type=self.media_type, headers=response_headers)
+
+
+def _is_compressible(media_type: str) -> bool:
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+def _parse_accept_encoding(value: str) -> Dict[str, float]:
+    accepted = {}
+    for item in value.split(","):
+        name, _, parameters = item.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            key, _, number = parameter.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.lower()] = quality
+    return accepted
+
+
+class AssetBundle:
+    """Construit en mémoire l'ensemble des fichiers servis à partir du répertoire static/."""
+
+    def __init__(self, directory: str, minify: bool, html_cache_control: str, asset_cache_control: str):
+        # Chemin servi -> (fichier, Cache-Control)
+        self.assets: Dict[str, Tuple[StaticAsset, str]] = {}
+        sources = _read_sources(directory)
+        renamed = {}
+
+        for path, body in sources.items():
+            root, extension = posixpath.splitext(path)
+            if extension not in FINGERPRINTED_EXTENSIONS:
+                continue
+            if minify:
+                text = body.decode("utf-8")
+                body = (minify_css(text) if extension == ".css" else minify_js(text)).encode("utf-8")
+            asset = StaticAsset(body, _media_type(path))
+            renamed[path] = f"{root}.{asset.fingerprint}{extension}"
+            self.assets[renamed[path]] = (asset, asset_cache_control)
+            # Ancien nom toujours servi (pages déjà en cache, liens externes), sans cache long
+            self.assets[path] = (asset, html_cache_control)
+
+        for path, body in sources.items():
+            if path in self.assets:
+                continue
+            if path.endswith(".html"):
+                body = _rewrite_references(body.decode("utf-8"), path, renamed).encode("utf-8")
+            self.assets[path] = (StaticAsset(body, _media_type(path)), html_cache_control)
+
+    def get(self, path: str) -> Optional[Tuple[StaticAsset, str]]:
+        path = path.lstrip("/")
+        if path == "" or path.endswith("/"):
+            path += "index.html"
+        return self.assets.get(path)
+
+
+def _read_sources(directory: str) -> Dict[str, bytes]:
+    sources = {}
+    for folder, _, files in os.walk(directory):
+        for name in files:
+            full_path = os.path.join(folder, name)
+            relative = os.path.relpath(full_path, directory).replace(os.sep, "/")
+            with open(full_path, "rb") as file:
+                sources[relative] = file.read()
+    return sources
+
+
+def _media_type(path: str) -> str:
+    # Response ajoute lui-même le charset aux types text/*
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def _rewrite_references(html: str, html_path: str, renamed: Dict[str, str]) -> str:
+    def replace(match: re.Match) -> str:
+        reference = match.group(2)
+        absolute = reference.startswith("/")
+        target = posixpath.normpath(reference.lstrip("/") if absolute else
+                                    posixpath.join(posixpath.dirname(html_path), reference))
+        if target not in renamed:
+            return match.group(0)
+        fingerprinted = renamed[target]
+        if absolute:
+            new_reference = "/" + fingerprinted
+        else:
+            new_reference = posixpath.relpath(fingerprinted, posixpath.dirname(html_path) or ".")
+        return match.group(1) + new_reference + match.group(3)
+
+    return _HTML_REFERENCE.sub(replace, html)
+
+
+def _directory_signature(directory: str) -> Tuple:
+    signature = []
+    for folder, _, files in os.walk(directory):
+        for name in files:
+            stat = os.stat(os.path.join(folder, name))
+            signature.append((folder, name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+
+class StaticAssets:
+    """Application ASGI servant le frontend : remplace StaticFiles.
+
+    Les CSS/JS renommés avec leur empreinte sont servis avec un cache d'un an marqué immutable :
+    les pages suivantes les reprennent du cache sans requête. Les pages HTML, qui référencent
+    ces noms, gardent un cache court et se revalident par ETag. Chaque fichier est servi dans le
+    meilleur codage accepté par le navigateur (brotli, gzip, sinon non compressé).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.hits = 0
+        self.not_modified = 0
+        self._signature = None
+        self._bundle: Optional[AssetBundle] = None
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Construit le bundle hors de la boucle d'événements, puis surveille le répertoire si demandé"""
+        self._bundle = await asyncio.to_thread(self._build)
+        if self.config.check_interval > 0 and self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    @property
+    def bundle(self) -> AssetBundle:
+        # Construction paresseuse si l'application est servie sans son cycle de vie (scripts, tests)
+        if self._bundle is None:
+            self._bundle = self._build()
+        return self._bundle
+
+    def _build(self) -> AssetBundle:
+        self._signature = _directory_signature(self.config.directory)
+        return AssetBundle(
+            self.config.directory,
+            minify=self.config.minify,
+            html_cache_control=f"public, max-age={self.config.html_max_age}, must-revalidate",
+            asset_cache_control=f"public, max-age={self.config.asset_max_age}, immutable"
+        )
+
+    async def _watch(self) -> None:
+        # Fichiers modifiés sur le disque (développement) : nouvelle construction, nouvelles empreintes.
+        # Parcours et construction dans un thread : les requêtes en cours ne sont jamais bloquées
+        while True:
+            await asyncio.sleep(self.config.check_interval)
+            if await asyncio.to_thread(_directory_signature, self.config.directory) != self._signature:
+                self._bundle = await asyncio.to_thread(self._build)
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405)
+        else:
+            found = self.bundle.get(scope["path"])
+            if found is None:
+                response = PlainTextResponse("Not Found", status_code=404)
+            else:
+                asset, cache_control = found
+                headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+                response = asset.response(scope["method"], headers, cache_control)
+                if response.status_code == 304:
+                    self.not_modified += 1
+                else:
+                    self.hits += 1
+        await response(scope, receive, send)
+
+    def stats(self) -> dict:
+        # Un CSS/JS est servi sous deux noms : compté une seule fois
+        assets = {id(asset): asset for asset, _ in self.bundle.assets.values()}.values()
+        sizes = [(len(asset.variants["identity"]), min(len(data) for data in asset.variants.values())) for asset in assets]
+        return {
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "files": len(sizes),
+            "bytes": sum(size for size, _ in sizes),
+            "compressed_bytes": sum(size for _, size in sizes)
+        }
@@ -1,18 +1,62 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import os
 import uvicorn
 
-from app.routers import loan
-from app.database import create_tables
+from app import metrics
+from app.config import settings
+from common.health import health
+from common.metrics import MetricsMiddleware
+from common.profiling import ProfilingMiddleware
+from app.static_assets import StaticAssets
+from app.routers import loan, health as health_router, metrics as metrics_router
+from app.database import create_tables, dispose_engines, engine, read_engine, ping_database
+from app.services.interest_rate_client import interest_rate_client
+from app.services.simulation_writer import simulation_writer
+
+# SQL timings, plus cache and write-queue counters read on every /metrics scrape
+metrics.instrument_engine(engine, "write")
+if read_engine is not engine:
+    metrics.instrument_engine(read_engine, "read")
+metrics.watch(
+    "interest_rate_client", "Client du moteur de taux", interest_rate_client.cache_stats,
+    counters=["hits", "misses", "upstream_calls", "coalesced", "hedged_requests", "stale_served"]
+)
+metrics.watch("category_payload_cache", "Cache des catégories sérialisées", loan.category_payloads.stats,
+              counters=["hits", "misses"])
+metrics.watch("simulation_writer", "File d'écriture des simulations", simulation_writer.stats,
+              counters=["committed", "failed", "batches"])
+
+# Frontend: minified, fingerprinted and precompressed at startup (built in the lifespan)
+static_assets = StaticAssets(settings.static_assets)
+metrics.watch("static_assets", "Fichiers statiques du frontend", static_assets.stats, counters=["hits", "not_modified"])
+
+# /health/ready fails while the database is unreachable
+health.add_check("database", ping_database)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize database tables
     await create_tables()
+    # Build the frontend bundle off the event loop, and watch for changes in development
+    await static_assets.start()
+    # Open the shared, connection-pooled client to the Interest Rate API
+    await interest_rate_client.start()
+    # Start the write-behind queue used by grouped/async saves
+    simulation_writer.start()
+    # Sample event loop lag for /metrics
+    metrics.event_loop_monitor.start()
+    health.mark_started()
     yield
+    health.start_draining()
+    await metrics.event_loop_monitor.stop()
+    # Flush pending saves before closing the database engines
+    await simulation_writer.stop()
+    await interest_rate_client.close()
+    await static_assets.stop()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -22,6 +66,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware, metrics=metrics.service_metrics)
+
+# Opt-in request profiling (PROFILING_TOKEN and/or PROFILING_SAMPLE_RATE)
+if settings.profiling.enabled:
+    app.add_middleware(ProfilingMiddleware, config=settings.profiling)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -31,8 +81,12 @@ app.add_middleware(
 )
 
 app.include_router(loan.router, prefix="/api", tags=["Loan Calculator"])
+app.include_router(metrics_router.router, tags=["Monitoring"])
+app.include_router(health_router.router, tags=["Monitoring"])
 
-app.mount("/", StaticFiles(directory="loan-simulator/static", html=True), name="static")
+app.mount("/", static_assets, name="static")
 
 if __name__ == "__main__":
+    # Development: pick up frontend edits without a restart
+    os.environ.setdefault("STATIC_CHECK_INTERVAL", "2")
     uvicorn.run("main:app", host="0.0.0.0", port=8080, reload=True)
\ No newline at end of file
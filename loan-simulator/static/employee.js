@@ -7,9 +7,17 @@ document.addEventListener('DOMContentLoaded', function() {
     const saveButton = document.getElementById('saveSimulationBtn');
     const saveSuccessDiv = document.getElementById('saveSuccess');
 
+    const durationInput = document.getElementById('duration');
+    const comparisonBody = document.getElementById('durationComparisonBody');
+
+    // Durées comparées à celle saisie, calculées dans le même appel à /api/loan-scenarios
+    const COMPARED_DURATIONS = [10, 15, 20, 25, 30];
+
     // Variables pour stocker la dernière simulation
     let lastSimulationRequest = null;
     let lastSimulationResponse = null;
+    // Grille de la dernière simulation : changer de durée ne relance aucun calcul
+    let lastScenarioGrid = null;
 
     // Charger les catégories au démarrage
     loadCategories();
@@ -84,23 +92,30 @@ document.addEventListener('DOMContentLoaded', function() {
         }
 
         try {
-            const response = await fetch('/api/calculate-loan', {
+            // Une seule requête pour la durée saisie et les durées de comparaison
+            const durations = [...new Set([...COMPARED_DURATIONS, loanRequest.durationYears])].sort((a, b) => a - b);
+            const response = await fetch('/api/loan-scenarios', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify(loanRequest)
+                body: JSON.stringify({
+                    amounts: { values: [loanRequest.amount] },
+                    durationsYears: { values: durations },
+                    clientProfiles: [{
+                        ageCategory: loanRequest.ageCategory,
+                        professionalCategory: loanRequest.professionalCategory,
+                        monthlyNetIncome: loanRequest.monthlyNetIncome
+                    }]
+                })
             });
 
             if (!response.ok) {
                 throw new Error('Erreur lors du calcul');
             }
 
-            const result = await response.json();
-            // Sauvegarder pour utilisation ultérieure
-            lastSimulationRequest = loanRequest;
-            lastSimulationResponse = result;
-            displayEmployeeResult(result, loanRequest);
+            lastScenarioGrid = await response.json();
+            selectDuration(loanRequest);
         } catch (error) {
             showError('Une erreur est survenue lors du calcul. Veuillez réessayer.');
             console.error('Error:', error);
@@ -109,6 +124,48 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    function selectDuration(loanRequest) {
+        const result = scenarioResult(lastScenarioGrid, loanRequest.durationYears);
+        // Sauvegarder pour utilisation ultérieure
+        lastSimulationRequest = loanRequest;
+        lastSimulationResponse = result;
+        displayEmployeeResult(result, loanRequest);
+        displayDurationComparison(lastScenarioGrid, loanRequest.durationYears);
+    }
+
+    function scenarioResult(grid, durationYears) {
+        // Grille [montant][durée][taux] : un seul montant et un seul profil client
+        const index = grid.durationsYears.indexOf(durationYears);
+        return {
+            loanAmount: grid.amounts[0],
+            monthlyPayment: grid.monthlyPayments[0][index][0],
+            totalInterest: grid.totalInterests[0][index][0],
+            totalCost: grid.totalCosts[0][index][0],
+            annualInterestRate: grid.annualInterestRates[0],
+            rateStale: grid.rateStale
+        };
+    }
+
+    function displayDurationComparison(grid, selectedDuration) {
+        comparisonBody.innerHTML = '';
+        grid.durationsYears.forEach(durationYears => {
+            const result = scenarioResult(grid, durationYears);
+            const row = document.createElement('tr');
+            row.className = durationYears === selectedDuration ? 'selected' : '';
+            row.innerHTML = `
+                <td>${durationYears} ans</td>
+                <td>${formatCurrency(result.monthlyPayment)}</td>
+                <td>${formatCurrency(result.totalInterest)}</td>
+                <td>${formatCurrency(result.totalCost)}</td>
+            `;
+            row.addEventListener('click', function() {
+                durationInput.value = durationYears;
+                selectDuration({ ...lastSimulationRequest, durationYears: durationYears });
+            });
+            comparisonBody.appendChild(row);
+        });
+    }
+
     function validateEmployeeInput(data) {
         const errors = [];
 
@@ -160,6 +217,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
         // Taux appliqué
         document.getElementById('appliedRate').textContent = `${result.annualInterestRate.toFixed(2)}%`;
+        document.getElementById('rateStaleNotice').style.display = result.rateStale ? 'block' : 'none';
 
         // Détail du calcul (si on avait accès aux composants du taux)
         displayRateCalculation(result.annualInterestRate, ageOption, profOption);
@@ -13,6 +13,9 @@ document.addEventListener('DOMContentLoaded', function() {
     const noSimulationsDiv = document.getElementById('noSimulations');
     const totalCountSpan = document.getElementById('totalCount');
     const displayedCountSpan = document.getElementById('displayedCount');
+    const averageRateSpan = document.getElementById('averageRate');
+    const medianAmountSpan = document.getElementById('medianAmount');
+    const loadMoreBtn = document.getElementById('loadMoreBtn');
 
     // Modal
     const modal = document.getElementById('detailModal');
@@ -22,8 +25,10 @@ document.addEventListener('DOMContentLoaded', function() {
     const deleteBtn = document.getElementById('deleteBtn');
 
     // Variables
+    const PAGE_SIZE = 50;
     let allSimulations = [];
-    let filteredSimulations = [];
+    let nextCursor = null;
+    let analytics = null;
     let currentSimulation = null;
 
     // Initialisation
@@ -33,6 +38,7 @@ document.addEventListener('DOMContentLoaded', function() {
     searchBtn.addEventListener('click', filterSimulations);
     clearBtn.addEventListener('click', clearFilters);
     refreshBtn.addEventListener('click', loadSimulations);
+    loadMoreBtn.addEventListener('click', loadMoreSimulations);
     searchInput.addEventListener('keypress', function(e) {
         if (e.key === 'Enter') {
             filterSimulations();
@@ -90,14 +96,15 @@ document.addEventListener('DOMContentLoaded', function() {
         hideError();
 
         try {
-            const response = await fetch('/api/saved-simulations');
-
-            if (!response.ok) {
-                throw new Error('Erreur lors du chargement des simulations');
-            }
-
-            allSimulations = await response.json();
-            filteredSimulations = [...allSimulations];
+            // Les filtres sont appliqués côté serveur ; la pagination se fait par curseur
+            // et les statistiques sont calculées en base sur l'ensemble des résultats
+            const [page, stats] = await Promise.all([
+                fetchSimulationsPage(null),
+                fetchAnalytics()
+            ]);
+            allSimulations = page.items;
+            analytics = stats;
+            nextCursor = page.nextCursor;
 
             displaySimulations();
             updateStats();
@@ -109,41 +116,73 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    function filterSimulations() {
-        const searchTerm = searchInput.value.toLowerCase().trim();
-        const ageFilter = filterAge.value;
-        const professionFilter = filterProfession.value;
+    async function loadMoreSimulations() {
+        if (!nextCursor) return;
 
-        filteredSimulations = allSimulations.filter(simulation => {
-            const matchesSearch = !searchTerm ||
-                simulation.clientName.toLowerCase().includes(searchTerm);
+        try {
+            const page = await fetchSimulationsPage(nextCursor);
+            allSimulations = allSimulations.concat(page.items);
+            nextCursor = page.nextCursor;
 
-            const matchesAge = !ageFilter ||
-                simulation.ageCategory === ageFilter;
+            displaySimulations();
+            updateStats();
+        } catch (error) {
+            showError('Impossible de charger les simulations: ' + error.message);
+            console.error('Error loading simulations:', error);
+        }
+    }
 
-            const matchesProfession = !professionFilter ||
-                simulation.professionalCategory === professionFilter;
+    function filterParams() {
+        const params = new URLSearchParams();
+        const searchTerm = searchInput.value.trim();
 
-            return matchesSearch && matchesAge && matchesProfession;
-        });
+        if (searchTerm) params.set('client', searchTerm);
+        if (filterAge.value) params.set('age_category', filterAge.value);
+        if (filterProfession.value) params.set('professional_category', filterProfession.value);
+        return params;
+    }
 
-        displaySimulations();
-        updateStats();
+    async function fetchAnalytics() {
+        try {
+            const response = await fetch(`/api/simulations/analytics?${filterParams()}`);
+            return response.ok ? response.json() : null;
+        } catch (error) {
+            console.error('Error loading analytics:', error);
+            return null;
+        }
+    }
+
+    async function fetchSimulationsPage(cursor) {
+        const params = filterParams();
+        params.set('limit', PAGE_SIZE);
+        if (cursor) params.set('cursor', cursor);
+
+        const response = await fetch(`/api/simulations?${params}`);
+
+        if (!response.ok) {
+            throw new Error('Erreur lors du chargement des simulations');
+        }
+
+        return response.json();
+    }
+
+    function filterSimulations() {
+        loadSimulations();
     }
 
     function clearFilters() {
         searchInput.value = '';
         filterAge.value = '';
         filterProfession.value = '';
-        filteredSimulations = [...allSimulations];
-        displaySimulations();
-        updateStats();
+        loadSimulations();
     }
 
     function displaySimulations() {
         simulationsBody.innerHTML = '';
 
-        if (filteredSimulations.length === 0) {
+        loadMoreBtn.style.display = nextCursor ? 'inline-block' : 'none';
+
+        if (allSimulations.length === 0) {
             simulationsTable.style.display = 'none';
             noSimulationsDiv.style.display = 'block';
             return;
@@ -152,7 +191,7 @@ document.addEventListener('DOMContentLoaded', function() {
         simulationsTable.style.display = 'table';
         noSimulationsDiv.style.display = 'none';
 
-        filteredSimulations.forEach(simulation => {
+        allSimulations.forEach(simulation => {
             const row = createSimulationRow(simulation);
             simulationsBody.appendChild(row);
         });
@@ -188,8 +227,20 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     function updateStats() {
-        totalCountSpan.textContent = allSimulations.length;
-        displayedCountSpan.textContent = filteredSimulations.length;
+        displayedCountSpan.textContent = allSimulations.length;
+
+        if (!analytics) {
+            // Sans statistiques serveur, le total exact n'est pas connu tant qu'il reste des pages
+            totalCountSpan.textContent = allSimulations.length + (nextCursor ? '+' : '');
+            averageRateSpan.textContent = '-';
+            medianAmountSpan.textContent = '-';
+            return;
+        }
+
+        const overall = analytics.overall;
+        totalCountSpan.textContent = overall.count;
+        averageRateSpan.textContent = overall.averageInterestRate !== null ? overall.averageInterestRate.toFixed(2) + '%' : '-';
+        medianAmountSpan.textContent = overall.amountPercentiles.median !== null ? formatCurrency(overall.amountPercentiles.median) : '-';
     }
 
     async function viewSimulation(id) {
@@ -302,9 +353,9 @@ document.addEventListener('DOMContentLoaded', function() {
                 throw new Error('Impossible de supprimer la simulation');
             }
 
-            // Retirer de la liste locale
+            // Retirer de la liste locale et recalculer les statistiques
             allSimulations = allSimulations.filter(s => s.id !== id);
-            filteredSimulations = filteredSimulations.filter(s => s.id !== id);
+            analytics = await fetchAnalytics();
 
             displaySimulations();
             updateStats();
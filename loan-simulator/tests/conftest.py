@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Base SQLite jetable : DATABASE_URL doit être fixée avant le premier import de app.database
+_DATABASE_DIR = tempfile.mkdtemp(prefix="loan-simulator-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_DATABASE_DIR, 'tests.db')}"
+_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Répertoire du service (paquet app) puis racine du dépôt (paquet common partagé)
+sys.path[:0] = [_SERVICE_DIR, os.path.dirname(_SERVICE_DIR)]
+
+from sqlalchemy import text  # noqa: E402
+
+from app.database import AsyncSessionLocal, create_tables, dispose_engines  # noqa: E402
+
+
+@pytest.fixture
+def run():
+    """Exécute une coroutine dans une boucle neuve ; les connexions sont fermées avec la boucle"""
+
+    def runner(coroutine):
+        async def scenario():
+            try:
+                return await coroutine
+            finally:
+                await dispose_engines()
+
+        return asyncio.run(scenario())
+
+    return runner
+
+
+@pytest.fixture
+def db(run):
+    """Session sur une table loan_simulations vide"""
+
+    async def reset():
+        await create_tables()
+        async with AsyncSessionLocal() as session:
+            await session.execute(text("DELETE FROM loan_simulations"))
+            await session.commit()
+
+    run(reset())
+    return AsyncSessionLocal
+
+
+async def insert_simulation(session, created_at_sql: str, loan_amount: float = 100000.0, **values) -> None:
+    """Insère une simulation en SQL brut, comme sample_data.sql (created_at_sql : expression SQL)"""
+    row = {
+        "first_name": "Marie", "last_name": "Dubois", "age_category": "ADULT", "professional_category": "EMPLOYEE",
+        "monthly_net_income": 4000.0, "loan_amount": loan_amount, "duration_years": 20,
+        "annual_interest_rate": 3.0, "total_interest": 30000.0, "total_cost": loan_amount + 30000.0,
+        "monthly_payment": 554.6, **values
+    }
+    await session.execute(
+        text(
+            f"INSERT INTO loan_simulations ({', '.join(row)}, created_at) "
+            f"VALUES ({', '.join(':' + name for name in row)}, {created_at_sql})"
+        ),
+        row
+    )
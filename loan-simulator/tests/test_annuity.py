@@ -0,0 +1,68 @@
+import numpy as np
+
+from app.services.annuity import (
+    implied_annual_rates, loan_totals, max_loan_amounts, min_duration_months, monthly_payments, single_loan_totals
+)
+
+# Grille amount × taux × durée, du taux nul aux taux usuraires
+AMOUNTS = np.array([1_000.0, 150_000.0, 2_500_000.0])[:, None, None]
+RATES = np.array([0.0, 0.01, 1.5, 4.2, 12.0, 35.0, 60.0])[None, :, None]
+DURATIONS = np.array([1, 7, 20, 30, 50])[None, None, :]
+
+
+def test_max_loan_amount_inverts_monthly_payment():
+    payments = monthly_payments(AMOUNTS, RATES, DURATIONS)
+    np.testing.assert_allclose(max_loan_amounts(payments, RATES, DURATIONS), np.broadcast_to(AMOUNTS, payments.shape),
+                               rtol=1e-9)
+
+
+def test_min_duration_recovers_exact_durations():
+    payments = monthly_payments(AMOUNTS, RATES, DURATIONS)
+    months = min_duration_months(AMOUNTS, payments, RATES)
+    np.testing.assert_array_equal(months, np.broadcast_to(DURATIONS * 12.0, payments.shape))
+
+
+def test_min_duration_rounds_up_to_the_next_month():
+    # Une mensualité légèrement inférieure à celle de 20 ans demande un mois de plus
+    payment = float(monthly_payments(200_000, 3.0, 20))
+    assert min_duration_months(200_000, payment - 1, 3.0) == 241
+
+
+def test_implied_rate_recovers_rate():
+    payments = monthly_payments(AMOUNTS, RATES, DURATIONS)
+    rates = implied_annual_rates(AMOUNTS, payments, DURATIONS)
+    np.testing.assert_allclose(rates, np.broadcast_to(RATES, payments.shape), rtol=1e-6, atol=1e-8)
+
+
+def test_zero_rate_is_linear_repayment():
+    assert max_loan_amounts(500.0, 0.0, 10) == 60_000.0
+    assert min_duration_months(60_000.0, 500.0, 0.0) == 120
+    assert min_duration_months(60_001.0, 500.0, 0.0) == 121
+    assert implied_annual_rates(60_000.0, 500.0, 10) == 0.0
+
+
+def test_payments_that_cannot_repay_are_nan():
+    # Mensualité sous le remboursement du seul capital : aucun taux positif ne convient
+    assert np.isnan(implied_annual_rates(60_000.0, 499.0, 10))
+    # Mensualité égale aux intérêts du premier mois : le capital ne diminue jamais
+    assert np.isnan(min_duration_months(120_000.0, 500.0, 5.0))
+    assert not np.isnan(min_duration_months(120_000.0, 500.01, 5.0))
+
+
+def test_iteration_budget_bounds_the_estimate():
+    # Itérations épuisées avant convergence : l'estimation reste dans l'encadrement [0, mensualité / montant]
+    amount, duration, rate = 150_000.0, 25, 4.0
+    payment = float(monthly_payments(amount, rate, duration))
+    estimates = [float(implied_annual_rates(amount, payment, duration, max_iterations=count)) for count in (0, 1, 2)]
+    assert all(0 < estimate <= payment / amount * 1200 for estimate in estimates)
+    errors = [abs(estimate - rate) for estimate in estimates]
+    assert errors[0] > errors[1] > errors[2] > 0
+    assert abs(float(implied_annual_rates(amount, payment, duration)) - rate) < 1e-9
+
+
+def test_single_loan_totals_match_vectorized_totals():
+    totals = loan_totals(AMOUNTS, RATES, DURATIONS)
+    for index in np.ndindex(totals[0].shape):
+        amount, rate, duration = AMOUNTS[index[0], 0, 0], RATES[0, index[1], 0], DURATIONS[0, 0, index[2]]
+        single = single_loan_totals(float(amount), float(rate), int(duration))
+        np.testing.assert_allclose(single, [array[index] for array in totals], rtol=1e-12)
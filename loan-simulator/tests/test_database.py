@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import database
+from app.config import DatabaseConfig
+from app.database import ReadSessionLocal, dispose_engines, get_read_db, ping_database
+
+
+def test_read_sessions_cannot_write(run, db):
+    async def scenario():
+        sessions = get_read_db()
+        session = await sessions.__anext__()
+        try:
+            await session.execute(text("DELETE FROM loan_simulations"))
+        finally:
+            await sessions.aclose()
+
+    # Connexion mode=ro : SQLite refuse toute écriture
+    with pytest.raises(OperationalError, match="readonly"):
+        run(scenario())
+
+
+def test_file_database_has_separate_engines(run, db):
+    assert database.read_engine is not database.engine
+    assert database.read_engine.url.query["mode"] == "ro"
+
+    async def scenario():
+        await ping_database()
+        async with ReadSessionLocal() as session:
+            await session.execute(text("SELECT COUNT(*) FROM loan_simulations"))
+        await dispose_engines()
+        # Les pools vidés se reconstituent à l'utilisation suivante
+        await ping_database()
+        return database.engine.pool.checkedout(), database.read_engine.pool.checkedout()
+
+    assert run(scenario()) == (0, 0)
+
+
+def test_memory_database_shares_one_engine(run, monkeypatch):
+    engine, read_engine = database._create_engines(DatabaseConfig(url="sqlite+aiosqlite:///:memory:"))
+    assert read_engine is engine
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "read_engine", read_engine)
+
+    # ping_database et dispose_engines (appelé par la fixture run) avec un seul moteur
+    run(ping_database())
@@ -0,0 +1,49 @@
+import asyncio
+
+from app.config import InterestRateClientConfig
+from app.services.interest_rate_client import InterestRateClient
+from app.services.rate_transport import RateTransport
+
+
+class SlowRateTransport(RateTransport):
+    """Moteur de taux dont le calcul reste en attente jusqu'à release"""
+
+    def __init__(self):
+        self.version = "v1"
+        self.rate = 3.0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def calculate_interest_rate(self, age_category, professional_category, monthly_net_income):
+        rate = self.rate
+        self.started.set()
+        await self.release.wait()
+        return rate
+
+    async def get_categories(self, kind, etag=None):
+        return [], None
+
+    async def get_config(self):
+        return {"version": self.version, "income_bands": [{"below": 3000}, {"below": None}]}
+
+
+def test_rate_fetched_before_config_change_is_not_cached(run):
+    transport = SlowRateTransport()
+    client = InterestRateClient(config=InterestRateClientConfig(hedge_enabled=False), transport=transport)
+
+    async def scenario():
+        lookup = asyncio.create_task(client.get_interest_rate("ADULT", "EMPLOYEE", 4000))
+        await transport.started.wait()
+
+        # Nouvelle grille publiée pendant l'appel : le cache est vidé
+        transport.version, transport.rate = "v2", 4.0
+        client._config_checked_at = None
+        await client._check_config_version()
+
+        transport.release.set()
+        in_flight_rate = (await lookup).rate
+        return in_flight_rate, await client.calculate_interest_rate("ADULT", "EMPLOYEE", 4000)
+
+    in_flight_rate, next_rate = run(scenario())
+    assert in_flight_rate == 3.0
+    assert next_rate == 4.0
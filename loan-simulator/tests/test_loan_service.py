@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.models import LoanRequest
+from app.services import loan_service as loan_service_module
+from app.services.interest_rate_client import RateLookup, interest_rate_client
+from app.services.loan_service import MAX_CONCURRENT_RATE_LOOKUPS, loan_service
+
+
+def test_single_and_batch_calculations_agree(run):
+    requests = [
+        LoanRequest(amount=amount, duration_years=years, annual_interest_rate=rate)
+        for amount, years, rate in [(200000, 20, 3.5), (150000, 25, 0.0), (99999.99, 7, 12.25), (1000, 1, 0.01)]
+    ]
+
+    async def scenario():
+        return [await loan_service.calculate_loan(request) for request in requests], \
+            await loan_service.calculate_loans(requests)
+
+    singles, batch = run(scenario())
+    assert singles == batch
+    assert singles[1].monthly_payment == 500.0
+
+
+def test_batch_size_is_capped(run, monkeypatch):
+    monkeypatch.setattr(loan_service_module, "MAX_BATCH_SIZE", 3)
+    requests = [LoanRequest(amount=100000, duration_years=20, annual_interest_rate=3.0)] * 4
+
+    with pytest.raises(ValueError, match="maximum 3"):
+        run(loan_service.calculate_loans(requests))
+
+
+def test_rate_lookups_are_bounded(run, monkeypatch):
+    running, peak = 0, 0
+
+    async def get_interest_rate(**profile):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return RateLookup(3.0)
+
+    monkeypatch.setattr(interest_rate_client, "get_interest_rate", get_interest_rate)
+    # Profils tous différents : un appel au moteur de taux par demande
+    requests = [
+        LoanRequest(amount=100000, duration_years=20, age_category="ADULT", professional_category="EMPLOYEE",
+                    monthly_net_income=2000 + income)
+        for income in range(3 * MAX_CONCURRENT_RATE_LOOKUPS)
+    ]
+
+    responses = run(loan_service.calculate_loans(requests))
+    assert len(responses) == len(requests)
+    assert peak == MAX_CONCURRENT_RATE_LOOKUPS
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Un worker : compte deux requêtes et expose un compteur de composant
+_WORKER = """
+import os
+from common.metrics import ServiceMetrics
+
+metrics = ServiceMetrics()
+metrics.watch("cache", "Cache", lambda: {"hits": 3}, counters=["hits"])
+metrics.http_requests.labels("GET", "/api/x", "200").inc(2)
+metrics.http_requests_in_progress.labels("GET").inc()
+if os.environ.get("RENDER"):
+    print(metrics.render().decode())
+"""
+
+
+def _worker(directory, render=False):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(directory), "RENDER": "1" if render else ""}
+    result = subprocess.run(
+        [sys.executable, "-c", _WORKER], cwd=_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def _sample(output, prefix):
+    return [line for line in output.splitlines() if line.startswith(prefix)]
+
+
+def test_render_aggregates_all_workers(tmp_path):
+    _worker(tmp_path)
+    _worker(tmp_path)
+    output = _worker(tmp_path, render=True)
+
+    # Trois workers ont compté deux requêtes chacun, quel que soit celui qui répond
+    assert _sample(output, 'http_requests_total{method="GET",route="/api/x",status="200"}') == [
+        'http_requests_total{method="GET",route="/api/x",status="200"} 6.0'
+    ]
+    # Composants : valeurs du seul worker qui répond, identifié par son PID
+    hits = _sample(output, "cache_hits_total")
+    assert len(hits) == 1 and 'worker="' in hits[0] and hits[0].endswith(" 3.0")
+
+
+def test_render_without_multiprocess_directory():
+    from common.metrics import ServiceMetrics
+
+    metrics = ServiceMetrics()
+    metrics.watch("cache", "Cache", lambda: {"hits": 3, "state": "closed"}, counters=["hits"])
+    metrics.http_requests.labels("GET", "/api/x", "200").inc()
+    output = metrics.render().decode()
+
+    assert 'http_requests_total{method="GET",route="/api/x",status="200"} 1.0' in output
+    assert "cache_hits_total 3.0" in output
+    assert 'cache_state{state="closed"} 1.0' in output
@@ -0,0 +1,50 @@
+import httpx
+import pytest
+
+from app.config import InterestRateClientConfig
+from app.services.rate_transport import EmbeddedRateTransport, HttpRateTransport, RateEngineUnavailable
+
+
+@pytest.fixture
+def embedded():
+    """Moteur de taux de l'API Interest Rate chargé dans ce processus (paquet interest_rate_api)"""
+    return EmbeddedRateTransport(InterestRateClientConfig().embedded_api_path)
+
+
+def http_transport(status_code, body=None):
+    transport = HttpRateTransport(InterestRateClientConfig(), base_url="http://interest-rate-api")
+    transport._client = httpx.AsyncClient(
+        base_url=transport.base_url,
+        transport=httpx.MockTransport(lambda request: httpx.Response(status_code, json=body))
+    )
+    return transport
+
+
+def test_embedded_engine_computes_rates_and_categories(run, embedded):
+    async def scenario():
+        rate = await embedded.calculate_interest_rate("ADULT", "EXECUTIVE", 5000.0)
+        ages, version = await embedded.get_categories("age")
+        professionals, _ = await embedded.get_categories("professional")
+        unchanged = await embedded.get_categories("age", etag=version)
+        return rate, ages, professionals, unchanged, await embedded.get_config()
+
+    rate, ages, professionals, unchanged, config = run(scenario())
+    # 1,5 de base, -0,2 (cadre), -0,1 (4000 à 8000 €)
+    assert rate == 1.2
+    assert [category["code"] for category in ages] == ["YOUNG_ADULT", "ADULT", "MIDDLE_AGED", "SENIOR"]
+    assert {category["code"]: category["rate_modifier"] for category in professionals}["UNEMPLOYED"] == 0.8
+    assert unchanged is None
+    assert config["base_rate"] == 1.5 and config["version"]
+
+
+def test_invalid_category_is_rejected_alike_by_both_transports(run, embedded):
+    http = http_transport(422, {"detail": [{"msg": "Input should be 'YOUNG_ADULT', 'ADULT', ..."}]})
+
+    for transport in (embedded, http):
+        with pytest.raises(ValueError):
+            run(transport.calculate_interest_rate("INCONNUE", "EMPLOYEE", 3000.0))
+
+
+def test_http_server_errors_mean_unavailable(run):
+    with pytest.raises(RateEngineUnavailable):
+        run(http_transport(503).calculate_interest_rate("ADULT", "EMPLOYEE", 3000.0))
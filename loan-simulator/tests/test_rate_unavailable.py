@@ -0,0 +1,55 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models import ClientProfile, LoanRequest, LoanScenarioRequest, MaxAmountRequest, MinDurationRequest
+from app.routers import loan
+from app.services.interest_rate_client import RateLookup, interest_rate_client
+from app.services.rate_transport import RateEngineUnavailable
+
+PROFILE = {"age_category": "ADULT", "professional_category": "EMPLOYEE", "monthly_net_income": 4000.0}
+
+
+@pytest.fixture
+def stale_rates(monkeypatch):
+    """Moteur de taux indisponible, dernier taux connu servi comme périmé"""
+
+    async def get_interest_rate(**profile):
+        return RateLookup(3.0, stale_since=1.0)
+
+    monkeypatch.setattr(interest_rate_client, "get_interest_rate", get_interest_rate)
+
+
+@pytest.fixture
+def rate_engine_down(monkeypatch):
+    """Moteur de taux indisponible sans dernier taux connu"""
+
+    async def get_interest_rate(**profile):
+        raise RateEngineUnavailable("moteur de taux injoignable")
+
+    monkeypatch.setattr(interest_rate_client, "get_interest_rate", get_interest_rate)
+
+
+def route_calls():
+    return [
+        lambda: loan.calculate_loan_scenarios(LoanScenarioRequest(
+            amounts={"values": [100000]}, durations_years={"values": [20]}, client_profiles=[ClientProfile(**PROFILE)]
+        )),
+        lambda: loan.calculate_max_amounts([MaxAmountRequest(monthly_budget=800, duration_years=20, **PROFILE)]),
+        lambda: loan.calculate_min_durations([MinDurationRequest(amount=100000, monthly_budget=800, **PROFILE)]),
+        lambda: loan.get_amortization_schedules([LoanRequest(amount=100000, duration_years=20, **PROFILE)]),
+    ]
+
+
+def test_rate_engine_unavailable_maps_to_503(run, rate_engine_down):
+    for call in route_calls():
+        with pytest.raises(HTTPException) as error:
+            run(call())
+        assert error.value.status_code == 503
+
+
+def test_stale_rate_is_flagged(run, stale_rates):
+    grid, max_amounts, min_durations, schedules = (run(call()) for call in route_calls())
+    assert grid.rate_stale
+    assert max_amounts[0].rate_stale
+    assert min_durations[0].rate_stale
+    assert schedules.headers["Warning"] == loan.STALE_WARNING
@@ -0,0 +1,50 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models import MAX_SCENARIO_PROFILES, LoanScenarioRequest
+from app.services.interest_rate_client import RateLookup, interest_rate_client
+from app.services.scenario_service import scenario_service
+
+PROFILE = {"ageCategory": "ADULT", "professionalCategory": "EMPLOYEE", "monthlyNetIncome": 4000.0}
+
+
+@pytest.fixture
+def rate_calls(monkeypatch):
+    """Profils dont le taux a été demandé au moteur de taux"""
+    calls = []
+
+    async def get_interest_rate(**profile):
+        calls.append(profile)
+        return RateLookup(3.0)
+
+    monkeypatch.setattr(interest_rate_client, "get_interest_rate", get_interest_rate)
+    return calls
+
+
+def test_grid_mixes_explicit_and_profile_rates(run, rate_calls):
+    grid = run(scenario_service.calculate_grid(LoanScenarioRequest(
+        amounts={"values": [100000]}, durationsYears={"values": [10, 20]},
+        annualInterestRates={"values": [2.0]}, clientProfiles=[PROFILE]
+    )))
+    assert grid.annual_interest_rates == [2.0, 3.0]
+    assert grid.rate_profiles[0] is None and grid.rate_profiles[1].age_category == "ADULT"
+    assert len(grid.monthly_payments[0]) == 2 and len(grid.monthly_payments[0][0]) == 2
+    assert not grid.rate_stale
+
+
+def test_oversized_grid_is_rejected_before_rate_lookups(run, rate_calls):
+    request = LoanScenarioRequest(
+        amounts={"start": 1000, "stop": 1_000_000, "step": 1000}, durationsYears={"start": 1, "stop": 30, "step": 1},
+        clientProfiles=[PROFILE] * 5
+    )
+    with pytest.raises(ValueError, match="combinaisons"):
+        run(scenario_service.calculate_grid(request))
+    assert rate_calls == []
+
+
+def test_client_profiles_are_capped():
+    with pytest.raises(ValidationError):
+        LoanScenarioRequest(
+            amounts={"values": [100000]}, durationsYears={"values": [20]},
+            clientProfiles=[PROFILE] * (MAX_SCENARIO_PROFILES + 1)
+        )
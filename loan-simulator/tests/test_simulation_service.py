@@ -0,0 +1,228 @@
+import csv
+import io
+import math
+from datetime import datetime
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.models import LoanRequest, LoanResponse, SaveSimulationRequest, SimulationFilters
+from app.routers import loan
+from app.services import simulation_service as simulation_service_module
+from app.services.simulation_service import AMOUNT_PERCENTILES, EXPORT_COLUMNS, simulation_service
+from tests.conftest import insert_simulation
+
+
+def test_search_pages_rows_stored_without_microseconds(run, db):
+    async def scenario():
+        async with db() as session:
+            # Comme sample_data.sql : datetime(...) stocke « AAAA-MM-JJ HH:MM:SS », sans microsecondes
+            for minute in range(6):
+                await insert_simulation(session, f"datetime('2024-01-15 10:{minute:02d}:00')")
+            await session.commit()
+
+            pages, cursor = [], None
+            # Borne : un curseur qui ne progresse pas ne doit pas boucler indéfiniment
+            while len(pages) < 10:
+                page = await simulation_service.search_simulations(session, SimulationFilters(), limit=2, cursor=cursor)
+                pages.append([item.id for item in page.items])
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            return pages
+
+    assert run(scenario()) == [[6, 5], [4, 3], [2, 1]]
+
+
+def test_search_pages_mixed_timestamp_formats(run, db):
+    async def scenario():
+        async with db() as session:
+            # Même seconde, avec et sans microsecondes
+            await insert_simulation(session, "'2024-01-15 10:00:00'")
+            await insert_simulation(session, "'2024-01-15 10:00:00.000000'")
+            await insert_simulation(session, "'2024-01-15 10:00:00.250000'")
+            await insert_simulation(session, "'2024-01-15 10:00:01'")
+            await session.commit()
+
+            seen, cursor = [], None
+            while len(seen) < 10:
+                page = await simulation_service.search_simulations(session, SimulationFilters(), limit=1, cursor=cursor)
+                seen.extend(item.id for item in page.items)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            return seen
+
+    seen = run(scenario())
+    assert sorted(seen) == [1, 2, 3, 4]
+    assert seen[0] == 4
+
+
+def test_date_filters_include_rows_stored_without_microseconds(run, db):
+    async def scenario():
+        async with db() as session:
+            await insert_simulation(session, "datetime('2024-01-15 10:00:00')")
+            await insert_simulation(session, "datetime('2024-01-16 10:00:00')")
+            await insert_simulation(session, "'2024-01-17 10:00:00.500000'")
+            await session.commit()
+
+            filters = SimulationFilters(
+                created_from=datetime(2024, 1, 15, 10, 0, 0), created_before=datetime(2024, 1, 17, 10, 0, 0, 500000)
+            )
+            page = await simulation_service.search_simulations(session, filters, limit=10)
+            return [item.id for item in page.items]
+
+    assert run(scenario()) == [2, 1]
+
+
+def test_client_filter_without_terms_matches_nothing(run, db):
+    async def scenario():
+        async with db() as session:
+            await insert_simulation(session, "datetime('2024-01-15 10:00:00')")
+            await session.commit()
+
+            matching = await simulation_service.search_simulations(session, SimulationFilters(client="dub"))
+            termless = await simulation_service.search_simulations(session, SimulationFilters(client="-- !"))
+            analytics = await simulation_service.get_analytics(session, SimulationFilters(client="-- !"), [])
+            return len(matching.items), len(termless.items), analytics.overall.count
+
+    assert run(scenario()) == (1, 0, 0)
+
+
+def nearest_rank(amounts, p):
+    """Percentile au rang le plus proche : le ⌈p × n⌉-ième plus petit montant"""
+    ordered = sorted(amounts)
+    return ordered[math.ceil(p * len(ordered)) - 1]
+
+
+def test_amount_percentiles_use_nearest_rank_per_group(run, db):
+    amounts = {
+        "ADULT": [250000.0, 90000.0, 120000.0, 120000.0, 300000.0, 75000.0, 180000.0, 210000.0, 60000.0, 150000.0],
+        "SENIOR": [80000.0, 40000.0, 100000.0],
+        "YOUNG_ADULT": [110000.0],
+    }
+
+    async def scenario():
+        async with db() as session:
+            for age_category, values in amounts.items():
+                for amount in values:
+                    await insert_simulation(session, "datetime('now')", loan_amount=amount, age_category=age_category)
+            await session.commit()
+            return await simulation_service.get_analytics(session, SimulationFilters(), ["age_category"])
+
+    analytics = run(scenario())
+    everything = [amount for values in amounts.values() for amount in values]
+    assert analytics.overall.count == len(everything)
+    assert analytics.overall.amount_percentiles.model_dump() == {
+        name: nearest_rank(everything, p) for name, p in AMOUNT_PERCENTILES.items()
+    }
+    assert {group.age_category: group.amount_percentiles.model_dump() for group in analytics.groups} == {
+        age_category: {name: nearest_rank(values, p) for name, p in AMOUNT_PERCENTILES.items()}
+        for age_category, values in amounts.items()
+    }
+
+
+def test_amount_percentiles_are_empty_without_simulations(run, db):
+    async def scenario():
+        async with db() as session:
+            return await simulation_service.get_analytics(session, SimulationFilters(), [])
+
+    overall = run(scenario()).overall
+    assert overall.count == 0
+    assert overall.amount_percentiles.model_dump() == {name: None for name in AMOUNT_PERCENTILES}
+
+
+def test_export_streams_every_partition(run, db, monkeypatch):
+    # Petites partitions : l'export traverse plusieurs allers-retours avec le curseur
+    monkeypatch.setattr(simulation_service_module, "EXPORT_PARTITION_SIZE", 4)
+
+    async def scenario():
+        async with db() as session:
+            for index in range(10):
+                await insert_simulation(
+                    session, f"datetime('2024-01-15 10:{index:02d}:00')", loan_amount=100000.0 + index,
+                    age_category="SENIOR" if index % 2 else "ADULT", first_name="Éloïse"
+                )
+            await session.commit()
+
+        async def export(filters, format):
+            return [chunk async for chunk in simulation_service.export_simulations(filters, format)]
+
+        return (
+            await export(SimulationFilters(), "ndjson"),
+            await export(SimulationFilters(age_category="SENIOR", min_amount=100004.0), "ndjson"),
+            await export(SimulationFilters(), "csv")
+        )
+
+    ndjson, filtered, csv_chunks = run(scenario())
+
+    rows = [orjson.loads(line) for line in b"".join(ndjson).splitlines()]
+    assert len(ndjson) == 3
+    assert [row["loanAmount"] for row in rows] == [100000.0 + index for index in range(10)]
+    assert rows[0]["firstName"] == "Éloïse" and rows[0]["createdAt"] == "2024-01-15T10:00:00"
+    assert [row["loanAmount"] for row in (orjson.loads(line) for line in b"".join(filtered).splitlines())] == \
+        [100005.0, 100007.0, 100009.0]
+
+    lines = list(csv.reader(io.StringIO(b"".join(csv_chunks).decode())))
+    assert lines[0] == list(EXPORT_COLUMNS)
+    assert len(lines) == 11
+
+
+def test_export_rejects_inconsistent_filters_before_streaming(run, db):
+    with pytest.raises(HTTPException) as error:
+        run(loan.export_simulations(SimulationFilters(min_amount=200000.0, max_amount=100000.0), "csv"))
+    assert error.value.status_code == 400
+
+    response = run(loan.export_simulations(SimulationFilters(created_from=datetime(2024, 1, 1)), "csv"))
+    assert response.media_type == "text/csv"
+
+
+def saved_request(first_name, amount, last_name="Martin"):
+    return SaveSimulationRequest(
+        loan_request=LoanRequest(
+            first_name=first_name, last_name=last_name, age_category="ADULT", professional_category="EMPLOYEE",
+            monthly_net_income=4000.0, amount=amount, duration_years=20, annual_interest_rate=3.0
+        ),
+        loan_response=LoanResponse(
+            loan_amount=amount, monthly_payment=amount / 200, total_interest=amount / 4, total_cost=amount * 1.25,
+            annual_interest_rate=3.0
+        )
+    )
+
+
+def test_bulk_save_returns_ids_in_request_order(run, db):
+    # Montants décroissants : un ordre de retour trié sur une colonne se verrait
+    requests = [saved_request(f"Client{index}", 500000.0 - index * 1000) for index in range(25)]
+
+    async def scenario():
+        async with db() as session:
+            await insert_simulation(session, "datetime('2024-01-15 10:00:00')")
+            await session.commit()
+            response = await loan.save_simulations(requests, db=session)
+            rows = await session.execute(text("SELECT id, first_name, loan_amount FROM loan_simulations WHERE id > 1"))
+            return response, {row.id: (row.first_name, row.loan_amount) for row in rows}
+
+    response, rows = run(scenario())
+    assert response.count == len(requests)
+    assert response.ids == sorted(response.ids) and len(set(response.ids)) == len(requests)
+    assert [rows[simulation_id] for simulation_id in response.ids] == [
+        (request.loan_request.first_name, request.loan_request.amount) for request in requests
+    ]
+
+
+def test_bulk_save_rejects_the_whole_batch_on_invalid_item(run, db):
+    requests = [saved_request("Léa", 150000.0), saved_request("Hugo", 90000.0, last_name=""), saved_request("Inès", 1e5)]
+
+    async def scenario():
+        async with db() as session:
+            with pytest.raises(HTTPException) as error:
+                await loan.save_simulations(requests, db=session)
+            count = await session.scalar(text("SELECT COUNT(*) FROM loan_simulations"))
+            return error.value, count
+
+    error, count = run(scenario())
+    assert error.status_code == 400
+    assert "simulation n°2" in error.detail
+    assert count == 0
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+
+from app.config import SaveQueueConfig
+from app.services.simulation_writer import SimulationWriter
+
+
+def writer(max_pending: int = 10) -> SimulationWriter:
+    return SimulationWriter(SaveQueueConfig(max_batch_size=8, max_delay_ms=0, max_pending=max_pending))
+
+
+def test_stop_returns_when_worker_died_with_full_queue(run):
+    simulation_writer = writer(max_pending=1)
+
+    async def scenario():
+        simulation_writer.start()
+        simulation_writer._worker.cancel()
+        await asyncio.sleep(0)
+        future = await simulation_writer.submit({"loan_amount": 1.0})
+        await asyncio.wait_for(simulation_writer.stop(), timeout=5)
+        return future
+
+    future = run(scenario())
+    assert isinstance(future.exception(), RuntimeError)
+    assert simulation_writer.failed == 1
+
+
+def test_async_save_failure_is_logged_with_values(run, caplog, monkeypatch):
+    simulation_writer = writer()
+
+    async def failing_insert(rows):
+        raise RuntimeError("base indisponible")
+
+    monkeypatch.setattr(simulation_writer, "_insert", failing_insert)
+
+    async def scenario():
+        await simulation_writer.submit({"loan_amount": 123456.0}, wait=False)
+        await simulation_writer.stop()
+
+    with caplog.at_level(logging.ERROR, logger="app.services.simulation_writer"):
+        run(scenario())
+    assert simulation_writer.failed == 1
+    assert "123456.0" in caplog.text and "base indisponible" in caplog.text
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.config import StaticAssetsConfig
+from app.static_assets import AssetBundle, StaticAssets, minify_css, minify_js
+
+
+def write(path, content):
+    path.write_text(content, encoding="utf-8")
+
+
+def asset_names(static_assets):
+    return sorted(name for name in static_assets.bundle.assets if name.endswith(".css"))
+
+
+def test_bundle_is_rebuilt_in_background_when_files_change(run, tmp_path):
+    write(tmp_path / "index.html", '<link rel="stylesheet" href="style.css">')
+    write(tmp_path / "style.css", "body { color: red; }")
+    static_assets = StaticAssets(StaticAssetsConfig(directory=str(tmp_path), check_interval=0.01))
+
+    async def scenario():
+        await static_assets.start()
+        before = asset_names(static_assets)
+        write(tmp_path / "style.css", "body { color: blue; }")
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if asset_names(static_assets) != before:
+                break
+        await static_assets.stop()
+        return before, asset_names(static_assets)
+
+    before, after = run(scenario())
+    assert before != after
+
+
+def test_no_watcher_without_check_interval(run, tmp_path):
+    write(tmp_path / "index.html", "<p>simulateur</p>")
+    static_assets = StaticAssets(StaticAssetsConfig(directory=str(tmp_path), check_interval=0))
+
+    async def scenario():
+        await static_assets.start()
+        watching = static_assets._watcher is not None
+        await static_assets.stop()
+        return watching
+
+    assert not run(scenario())
+    assert static_assets.stats()["files"] == 1
+
+
+@pytest.mark.parametrize("source, expected", [
+    # Expression régulière après « ) » : ni division, ni espaces retouchés
+    ("if (x) /a  b/.test(s);", "if(x)/a  b/.test(s);"),
+    # Apostrophe dans une expression régulière : pas de chaîne ouverte
+    ("if (ok) /'/.test(s); var t = 'a  b';", "if(ok)/'/.test(s);var t='a  b';"),
+    ("var r = a / b / c;", "var r=a/b/c;"),
+    ("const t = `a  ${ b +  c }  d`; // fin", "const t=`a  ${ b +  c }  d`;"),
+    ("a = b\n++c", "a=b\n++c"),
+    ("x = a + +b; y = a - -b;", "x=a+ +b;y=a- -b;"),
+])
+def test_minify_js(source, expected):
+    assert minify_js(source) == expected
+
+
+def test_minify_css_keeps_strings():
+    source = 'a::before { content: "x  ;  y" ; color : red ; }\n/* commentaire */\nb > c { margin: 0 }'
+    assert minify_css(source) == 'a::before{content:"x  ;  y";color:red}b>c{margin:0}'
+
+
+def test_bundle_serves_sources_unchanged_without_minify(tmp_path):
+    source = "if (x) /a  b/.test(s);\n"
+    write(tmp_path / "app.js", source)
+    bundle = AssetBundle(str(tmp_path), minify=False, html_cache_control="no-cache", asset_cache_control="immutable")
+    asset, _ = bundle.assets["app.js"]
+    assert asset.variants["identity"] == source.encode("utf-8")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Production launcher: pre-forked uvicorn workers for one or both applications
+
+    python serve.py                                   # both applications
+    python serve.py loan-simulator --loan-simulator-workers 4 --loan-simulator-cpus 0-3
+    python serve.py both --embedded                   # loan simulator alone, with the in-process rate engine
+
+Each service binds its port once; its workers share the listening socket and
+can be pinned to CPUs. A worker that dies is restarted. SIGTERM drains:
+workers report not ready on /health/ready for --drain-delay seconds while still
+serving, then stop accepting connections and finish in-flight requests.
+SIGINT (Ctrl+C) skips the drain delay.
+Each service's workers share a prometheus_client multiprocess directory
+(a subdirectory of PROMETHEUS_MULTIPROC_DIR, or a temporary directory), so
+/metrics returns the counters of all its workers whichever worker answers.
+start-both.py and the start-*.py scripts remain the development (auto-reload) mode.
+"""
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import uvicorn
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Service name -> (directory, default port)
+SERVICES = {
+    "loan-simulator": ("loan-simulator", 8080),
+    "interest-rate-api": ("interest-rate-api", 8081),
+}
+
+# A worker that dies sooner than this after starting failed to boot: restarting it would loop
+MIN_WORKER_UPTIME = 10.0
+
+multiprocessing.allow_connection_pickling()
+spawn = multiprocessing.get_context("spawn")
+
+
+@dataclass
+class ServiceOptions:
+    name: str
+    port: int
+    workers: int
+    cpus: List[int]
+    env: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(ROOT, SERVICES[self.name][0])
+
+    def cpu_for(self, index: int) -> Optional[int]:
+        # Workers are spread round-robin over the allowed CPUs, one CPU each
+        return self.cpus[index % len(self.cpus)] if self.cpus else None
+
+
+@dataclass
+class Worker:
+    service: ServiceOptions
+    index: int
+    process: multiprocessing.Process
+    started_at: float
+
+
+def parse_cpus(value: str) -> List[int]:
+    """'0-3,6' -> [0, 1, 2, 3, 6]"""
+    cpus = []
+    for part in filter(None, (part.strip() for part in value.split(","))):
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def env_prefix(service: str) -> str:
+    return service.upper().replace("-", "_")
+
+
+def default_workers(cpus: List[int]) -> int:
+    if cpus:
+        return len(cpus)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that reports not ready before shutting down on SIGTERM"""
+
+    def __init__(self, config: uvicorn.Config, drain_delay: float, health):
+        super().__init__(config)
+        self.drain_delay = drain_delay
+        self.health = health
+        self.draining = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def serve(self, sockets=None) -> None:
+        # Signal handlers run outside the loop: they need a reference to it to schedule work
+        self.loop = asyncio.get_running_loop()
+        await super().serve(sockets=sockets)
+
+    def handle_exit(self, sig, frame) -> None:
+        if sig != signal.SIGTERM or self.drain_delay <= 0 or self.draining or self.should_exit or self.loop is None:
+            super().handle_exit(sig, frame)
+            return
+        # Keep serving while load balancers notice the failing readiness probe
+        self.draining = True
+        self.health.start_draining()
+        exit_later = super().handle_exit
+        # call_soon_threadsafe wakes the loop up, which a plain call_later from a signal handler does not
+        self.loop.call_soon_threadsafe(self.loop.call_later, self.drain_delay, exit_later, sig, frame)
+
+
+def mark_process_dead(pid: int, directory: str) -> None:
+    # Imported on use: workers re-import this module, and prometheus_client picks its
+    # multiprocess mode at import time, before run_worker sets PROMETHEUS_MULTIPROC_DIR
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(pid, directory)
+
+
+def run_worker(service: ServiceOptions, index: int, sockets, options: dict) -> None:
+    # Own process group: Ctrl+C reaches the supervisor only, which then stops the workers once
+    os.setpgrp()
+    cpu = service.cpu_for(index)
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+    os.environ.update(service.env)
+    # The service directory provides `main` and `app`; the repository root provides the shared `common` package
+    sys.path[:0] = [service.directory, ROOT]
+
+    config = uvicorn.Config(
+        "main:app",
+        loop=options["loop"],
+        http=options["http"],
+        lifespan="on",
+        access_log=options["access_log"],
+        timeout_graceful_shutdown=options["graceful_timeout"],
+        timeout_keep_alive=options["keep_alive"],
+        log_level=options["log_level"],
+    )
+    config.setup_event_loop()
+    config.load()
+    # Health state of the service just loaded
+    health = importlib.import_module("common.health").health
+    DrainingServer(config, options["drain_delay"], health).run(sockets=sockets)
+
+
+class Supervisor:
+    """Binds each service's socket, keeps its workers running and stops them on SIGTERM/SIGINT"""
+
+    def __init__(self, services: List[ServiceOptions], options: dict):
+        self.services = services
+        self.options = options
+        self.sockets = {}
+        self.workers: List[Worker] = []
+        self.stop_signal: Optional[int] = None
+        self.metrics_root: Optional[str] = None
+
+    def run(self) -> int:
+        self._prepare_metrics()
+        for service in self.services:
+            config = uvicorn.Config("main:app", host=self.options["host"], port=service.port)
+            self.sockets[service.name] = config.bind_socket()
+            cpus = ",".join(map(str, service.cpus)) if service.cpus else "any"
+            print(f"📍 {service.name}: http://{self.options['host']}:{service.port} "
+                  f"({service.workers} workers, CPUs: {cpus})")
+        print(f"⚡ Event loop: {self.options['loop']}, HTTP parser: {self.options['http']}")
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        for service in self.services:
+            for index in range(service.workers):
+                self.workers.append(self._start(service, index))
+
+        exit_code = 0
+        while self.stop_signal is None:
+            time.sleep(0.5)
+            for position, worker in enumerate(self.workers):
+                if worker.process.is_alive() or self.stop_signal is not None:
+                    continue
+                if time.monotonic() - worker.started_at < MIN_WORKER_UPTIME:
+                    print(f"❌ {worker.service.name} worker {worker.index} exited during startup "
+                          f"(code {worker.process.exitcode}), stopping")
+                    self.stop_signal = signal.SIGINT
+                    exit_code = 1
+                    break
+                print(f"🔄 {worker.service.name} worker {worker.index} exited "
+                      f"(code {worker.process.exitcode}), restarting")
+                # Drop the dead worker's in-progress gauges from the aggregate
+                mark_process_dead(worker.process.pid, worker.service.env["PROMETHEUS_MULTIPROC_DIR"])
+                self.workers[position] = self._start(worker.service, worker.index)
+
+        self._stop()
+        return exit_code
+
+    def _prepare_metrics(self) -> None:
+        # Files left by a previous run would be added to this run's counters
+        configured = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        self.metrics_root = configured or tempfile.mkdtemp(prefix="serve-metrics-")
+        for service in self.services:
+            directory = os.path.join(self.metrics_root, service.name)
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(directory)
+            service.env["PROMETHEUS_MULTIPROC_DIR"] = directory
+        if configured:
+            # Kept after exit for inspection; only the temporary directory is removed
+            self.metrics_root = None
+
+    def _start(self, service: ServiceOptions, index: int) -> Worker:
+        process = spawn.Process(
+            target=run_worker,
+            args=(service, index, [self.sockets[service.name]], self.options),
+            name=f"{service.name}-{index}"
+        )
+        process.start()
+        return Worker(service, index, process, time.monotonic())
+
+    def _request_stop(self, sig, frame) -> None:
+        if self.stop_signal is not None:
+            # Second signal: do not wait for in-flight requests
+            for worker in self.workers:
+                if worker.process.is_alive():
+                    worker.process.kill()
+            return
+        self.stop_signal = sig
+
+    def _stop(self) -> None:
+        draining = self.stop_signal == signal.SIGTERM
+        print("\n🛑 Draining workers..." if draining else "\n🛑 Stopping workers...")
+        for worker in self.workers:
+            if worker.process.is_alive():
+                # SIGTERM drains, SIGINT stops without the drain delay
+                os.kill(worker.process.pid, self.stop_signal)
+
+        deadline = time.monotonic() + self.options["graceful_timeout"] + 5
+        if draining:
+            deadline += self.options["drain_delay"]
+        for worker in self.workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+        for sock in self.sockets.values():
+            sock.close()
+        if self.metrics_root is not None:
+            shutil.rmtree(self.metrics_root, ignore_errors=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Production launcher (pre-forked uvicorn workers)")
+    parser.add_argument("service", nargs="?", choices=["both", *SERVICES], default="both",
+                        help="Application(s) to start (default: both)")
+    parser.add_argument("--host", default=os.getenv("SERVER_HOST", "0.0.0.0"))
+    for name, (_, port) in SERVICES.items():
+        prefix = env_prefix(name)
+        parser.add_argument(f"--{name}-port", type=int, default=int(os.getenv(f"{prefix}_PORT", port)))
+        parser.add_argument(f"--{name}-workers", type=int, default=_env_int(f"{prefix}_WORKERS"),
+                            help=f"Worker processes (env {prefix}_WORKERS, default: one per allowed CPU)")
+        parser.add_argument(f"--{name}-cpus", type=parse_cpus, default=parse_cpus(os.getenv(f"{prefix}_CPUS", "")),
+                            help=f"CPUs the workers are pinned to, e.g. 0-3,6 (env {prefix}_CPUS, default: no pinning)")
+    parser.add_argument("--embedded", action="store_true",
+                        help="Loan simulator uses the in-process rate engine (INTEREST_RATE_TRANSPORT=embedded); "
+                             "'both' then starts the loan simulator only")
+    parser.add_argument("--drain-delay", type=float, default=float(os.getenv("DRAIN_DELAY", "5")),
+                        help="Seconds a worker reports not ready before it stops accepting connections (env DRAIN_DELAY)")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+                        help="Seconds given to in-flight requests once the worker stops (env GRACEFUL_TIMEOUT)")
+    parser.add_argument("--keep-alive", type=int, default=int(os.getenv("KEEP_ALIVE_TIMEOUT", "5")),
+                        help="Idle keep-alive connection timeout in seconds (env KEEP_ALIVE_TIMEOUT)")
+    parser.add_argument("--no-access-log", action="store_true", default=os.getenv("ACCESS_LOG", "1") == "0",
+                        help="Disable per-request access logs (env ACCESS_LOG=0)")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    return parser
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    names = list(SERVICES) if args.service == "both" else [args.service]
+    if args.embedded and args.service == "both":
+        # The loan simulator runs the rate engine in-process: the Interest Rate API is not needed
+        names.remove("interest-rate-api")
+
+    services = []
+    for name in names:
+        attribute = name.replace("-", "_")
+        cpus = getattr(args, f"{attribute}_cpus")
+        workers = getattr(args, f"{attribute}_workers") or default_workers(cpus)
+        env = {"INTEREST_RATE_TRANSPORT": "embedded"} if args.embedded and name == "loan-simulator" else {}
+        services.append(ServiceOptions(name, getattr(args, f"{attribute}_port"), workers, cpus, env))
+
+    if any(service.cpus for service in services) and not hasattr(os, "sched_setaffinity"):
+        print("⚠️  CPU pinning is not supported on this platform, workers are not pinned")
+
+    options = {
+        "host": args.host,
+        "loop": event_loop(),
+        "http": http_protocol(),
+        "access_log": not args.no_access_log,
+        "drain_delay": args.drain_delay,
+        "graceful_timeout": args.graceful_timeout,
+        "keep_alive": args.keep_alive,
+        "log_level": args.log_level,
+    }
+
+    # The loan simulator serves its static files relative to the repository root
+    os.chdir(ROOT)
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))
+    print("🚀 Starting in production mode...")
+    return Supervisor(services, options).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,10 +9,16 @@ import os
 import time
 from concurrent.futures import ThreadPoolExecutor
 
+EMBEDDED = "--embedded" in sys.argv[1:]
+
 def start_loan_simulator():
     """Start the loan simulator on port 8080"""
     print("🏠 Starting Loan Simulator...")
-    subprocess.run([sys.executable, "start-loan-simulator.py"])
+    env = dict(os.environ)
+    if EMBEDDED:
+        # Moteur de taux chargé dans le processus du simulateur, sans appel HTTP
+        env["INTEREST_RATE_TRANSPORT"] = "embedded"
+    subprocess.run([sys.executable, "start-loan-simulator.py"], env=env)
 
 def start_interest_rate_api():
     """Start the interest rate API on port 8081"""
@@ -22,18 +28,22 @@ def start_interest_rate_api():
 if __name__ == "__main__":
     print("🚀 Starting both Python applications...")
     print("📍 Loan Simulator: http://localhost:8080")
-    print("📍 Interest Rate API: http://localhost:8081")
-    print("📍 API Documentation: http://localhost:8081/swagger-ui.html")
+    if EMBEDDED:
+        # The loan simulator no longer calls the Interest Rate API: no need to run it
+        print("⚡ Loan Simulator uses the embedded rate engine, the Interest Rate API is not started")
+    else:
+        print("📍 Interest Rate API: http://localhost:8081")
+        print("📍 API Documentation: http://localhost:8081/swagger-ui.html")
     print()
+    print("🔧 Development mode (auto-reload). For production: python serve.py")
     print("Press Ctrl+C to stop both applications")
     print("=" * 50)
 
     try:
         with ThreadPoolExecutor(max_workers=2) as executor:
-            futures = [
-                executor.submit(start_loan_simulator),
-                executor.submit(start_interest_rate_api)
-            ]
+            futures = [executor.submit(start_loan_simulator)]
+            if not EMBEDDED:
+                futures.append(executor.submit(start_interest_rate_api))
 
             for future in futures:
                 future.result()
@@ -8,7 +8,11 @@ import uvicorn
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), 'interest-rate-api'))
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(ROOT, 'interest-rate-api'))
+# The shared common/ package is imported from the repository root, by the reload worker too
+sys.path.insert(0, ROOT)
+os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))
 
 if __name__ == "__main__":
     print("🚀 Starting Interest Rate API on http://localhost:8081")
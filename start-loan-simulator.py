@@ -8,9 +8,15 @@ import uvicorn
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), 'loan-simulator'))
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(ROOT, 'loan-simulator'))
+# The shared common/ package is imported from the repository root, by the reload worker too
+sys.path.insert(0, ROOT)
+os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))
 
 if __name__ == "__main__":
+    # Development mode: changed frontend files are rebuilt without a restart
+    os.environ.setdefault("STATIC_CHECK_INTERVAL", "2")
     print("🚀 Starting Loan Simulator on http://localhost:8080")
     print("📁 Serving static files from Java project")
     print("📋 Available endpoints:")